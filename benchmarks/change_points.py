@@ -0,0 +1,121 @@
+"""
+Checks that the two change point backends (rbf and l2, see ChangePointDetection) roughly agree on series
+short enough for both to run, and times them.
+
+The series are synthetic, with a monthly period: seasonal noise (no change), one and two level shifts
+(with and without seasonality), a linear trend, and a random walk. Both backends must find a number of
+change points within AGREEMENT_TOLERANCE of each other (or differing by at most MIN_DIFFERENCE), and the
+l2 backend must find the true level shifts (within a window of the true location). The script exits with
+an error if a series fails the check.
+
+Usage:
+    python benchmarks/change_points.py [--lengths 200 1000] [--seed 1]
+"""
+import argparse
+import sys
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+PERIOD = 12
+# fraction of the number of change points of the rbf backend by which the l2 backend can differ,
+# and minimum difference allowed (e.g. a strong trend is split into a few steps by both backends)
+AGREEMENT_TOLERANCE = 0.5
+MIN_DIFFERENCE = 2
+
+
+def make_series(n: int, rng: np.random.Generator) -> dict:
+    """
+    Builds the synthetic series of a given length.
+
+    Args:
+        n (int): Length of the series.
+        rng (np.random.Generator): Random number generator.
+
+    Returns:
+        dict: Series and the location of its true level shifts (None if unknown, e.g. a random walk), by name.
+    """
+
+    time_ = np.arange(n)
+    seasonality = 5 * np.sin(2 * np.pi * time_ / PERIOD)
+    noise = rng.normal(size=n)
+
+    one_shift = np.r_[np.zeros(n // 2), np.full(n - n // 2, 3.0)]
+    two_shifts = np.r_[np.zeros(n // 3), np.full(n // 3, -2.0), np.full(n - 2 * (n // 3), 1.5)]
+
+    return {
+        'seasonal': (2 * seasonality + noise, []),
+        'shift': (one_shift + noise, [n // 2]),
+        'seasonal_shift': (one_shift + seasonality + noise, [n // 2]),
+        'two_shifts': (two_shifts + noise, [n // 3, 2 * (n // 3)]),
+        'trend': (0.01 * time_ + seasonality + noise, None),
+        'random_walk': (np.cumsum(noise), None),
+    }
+
+
+def detect(values: np.ndarray, backend: str):
+    """
+    Detects the change points of a series with a given backend.
+
+    Returns:
+        Tuple[List[int], float]: Change points, and time taken (in seconds).
+    """
+
+    from cardtale.analytics.operations.tsa.change_points import ChangePointDetection
+
+    series = pd.Series(values, index=pd.date_range('2000-01-01', periods=len(values), freq='ME'))
+
+    start = time.perf_counter()
+
+    detection = ChangePointDetection(series, backend=backend, period=PERIOD)
+    detection.detect_changes()
+
+    return detection.change_points.get(ChangePointDetection.METHOD, []), time.perf_counter() - start
+
+
+def agree(cp_rbf: list, cp_l2: list, true_cp, window: float) -> bool:
+    """
+    Whether the change points of both backends roughly agree, and the l2 backend finds the true level shifts.
+    """
+
+    n_agree = abs(len(cp_l2) - len(cp_rbf)) <= max(MIN_DIFFERENCE, AGREEMENT_TOLERANCE * len(cp_rbf))
+    if true_cp is None:
+        return n_agree
+
+    found = all(any(abs(x - cp) <= window for x in cp_l2) for cp in true_cp)
+
+    return n_agree and found and len(cp_l2) <= len(true_cp) + 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--lengths', type=int, nargs='+', default=[200, 1000])
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    warnings.filterwarnings('ignore')
+
+    rng = np.random.default_rng(args.seed)
+
+    failed = []
+    for n in args.lengths:
+        for name, (values, true_cp) in make_series(n, rng).items():
+            cp_rbf, time_rbf = detect(values, 'rbf')
+            cp_l2, time_l2 = detect(values, 'l2')
+
+            ok = agree(cp_rbf, cp_l2, true_cp, window=np.sqrt(n))
+            if not ok:
+                failed.append(f'{name} (n={n})')
+
+            print(f'n={n:<6} {name:<15} rbf {len(cp_rbf):>3} ({time_rbf:.3f}s)  l2 {len(cp_l2):>3} ({time_l2:.3f}s)  '
+                  f'{"ok" if ok else "DISAGREE"}  rbf: {cp_rbf[:5]}  l2: {cp_l2[:5]}')
+
+    if len(failed) > 0:
+        print(f'The backends disagree on: {", ".join(failed)}')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
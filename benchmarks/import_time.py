@@ -0,0 +1,95 @@
+"""
+Measures the import time of cardtale, and checks that the heavy dependencies are not imported.
+
+The heavy dependencies (WeasyPrint, plotnine/matplotlib, statsforecast, mlforecast, lightgbm,
+ruptures, arch, statsmodels, scipy, sklearn) are imported by the functions that use them, so
+importing cardtale (e.g. for the data structures, or to configure a batch before spawning workers)
+should cost little more than importing pandas. Each module is imported in a fresh interpreter,
+and the best of a few runs is compared to its budget.
+
+Usage:
+    python benchmarks/import_time.py [--repeats 5]
+"""
+import argparse
+import json
+import subprocess
+import sys
+
+# budgets in seconds, for the best of the runs (pandas alone takes about 0.45s)
+IMPORT_BUDGETS = {
+    'pandas': None,
+    'cardtale': 0.1,
+    'cardtale.core.data': 1.0,
+    'cardtale.cards.builder': 1.0,
+}
+
+HEAVY_MODULES = [
+    'weasyprint',
+    'plotnine',
+    'matplotlib',
+    'statsforecast',
+    'mlforecast',
+    'lightgbm',
+    'ruptures',
+    'arch',
+    'statsmodels',
+    'scipy',
+    'sklearn',
+]
+
+IMPORT_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{'time': elapsed, 'heavy': [m for m in {heavy} if m in sys.modules]}}))
+"""
+
+
+def measure_import(module: str, repeats: int) -> dict:
+    """
+    Imports a module in fresh interpreters.
+
+    Args:
+        module (str): Module name.
+        repeats (int): Number of runs.
+
+    Returns:
+        dict: Best import time (in seconds) and the heavy modules loaded by the import.
+    """
+
+    script = IMPORT_SCRIPT.format(module=module, heavy=HEAVY_MODULES)
+
+    runs = []
+    for _ in range(repeats):
+        output = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True, check=True)
+        runs.append(json.loads(output.stdout.strip().splitlines()[-1]))
+
+    return {'time': min(run['time'] for run in runs), 'heavy': runs[-1]['heavy']}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeats', type=int, default=5)
+    args = parser.parse_args()
+
+    failed = False
+    for module, budget in IMPORT_BUDGETS.items():
+        result = measure_import(module, args.repeats)
+
+        over_budget = budget is not None and result['time'] > budget
+        status = 'FAIL' if over_budget or len(result['heavy']) > 0 else 'ok'
+        failed = failed or status == 'FAIL'
+
+        budget_str = '-' if budget is None else f'{budget:.2f}s'
+        line = f'{module:<28} {result["time"]:.3f}s (budget {budget_str}) {status}'
+        if len(result['heavy']) > 0:
+            line += f' - heavy modules: {result["heavy"]}'
+
+        print(line)
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,301 @@
+"""
+Benchmarks the report pipeline on the monthly series of the M3 dataset bundled with the repository.
+
+The data is read offline from assets/m3/datasets/M3C.xls (sheet M3Month, which requires xlrd). The report
+of each of the first N series is built end-to-end (analysis, HTML render, and PDF write), with a Tracer
+(see cardtale.core.tracing), from which the time of each stage is taken:
+
+    profile     setup of the series (summary statistics, auto-correlation, and STL decomposition)
+    tests       statistical tests and the other testing stages, excluding the landmark experiments
+    landmarks   landmark experiments (LightGBM cross-validation), one span per configuration
+    plotting    build and encoding of the plots
+    render      Jinja render of the HTML report, and creation of the WeasyPrint document
+    pdf         PDF write
+
+The results (series per second, p50/p95 latency end-to-end and by stage, and the peak RSS of the process)
+are written to a JSON file. With --baseline, they are compared to a stored results file, and the script
+exits with an error if a metric regressed by more than the tolerance. A series outside the measured ones is
+built before the measurements, so the (lazy) imports of the dependencies are not counted, and the shared caches
+(STL_CACHE and CALENDAR_CACHE) are then cleared, so the measured series do not reuse its results.
+
+Baselines are stored in benchmarks/baselines, named after the options and the number of CPUs they were run
+with (see their meta entry for the machine). They are only comparable on the same machine and with the same
+options (e.g. m3_monthly_n20_skip-pdf_cpu1.json says nothing about the PDF write or about parallel runs), so
+create a local baseline, with the default options, before comparing.
+
+Usage (from the root of the repository, as the data path is relative to it, with cardtale installed with
+pip install -e . or on the path):
+    PYTHONPATH=. python benchmarks/m3_pipeline.py [--n-series 20] [--output m3_results.json] [--skip-pdf]
+    PYTHONPATH=. python benchmarks/m3_pipeline.py --output benchmarks/baselines/m3_monthly_n20_cpu8.json
+    PYTHONPATH=. python benchmarks/m3_pipeline.py --baseline benchmarks/baselines/m3_monthly_n20_cpu8.json \
+        [--tolerance 0.2]
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+import warnings
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+DATA_PATH = os.path.join('assets', 'm3', 'datasets', 'M3C.xls')
+SHEET_NAME = 'M3Month'
+FREQ = 'ME'
+N_ID_COLUMNS = 6
+# start of the series whose starting year or month is missing in the file
+DEFAULT_START = (1970, 1)
+
+STAGES = ['profile', 'tests', 'landmarks', 'plotting', 'render', 'pdf']
+STAGE_SPANS = ['tsd_setup', 'tests', 'landmark_cv', 'plots', 'jinja_render', 'html_document', 'write_pdf']
+LATENCY_QUANTILES = {'p50': 0.5, 'p95': 0.95}
+
+DEFAULT_TOLERANCE = 0.2
+# latency changes below this (in seconds) are not flagged, as short stages are dominated by noise
+MIN_LATENCY_CHANGE = 0.05
+
+
+def load_m3_monthly(path: str = DATA_PATH) -> pd.DataFrame:
+    """
+    Reads the monthly series of M3 from the competition file, without downloading anything.
+
+    The series are named as in datasetsforecast (M1, M2, ...), by order in the file.
+
+    Args:
+        path (str, optional): Path of M3C.xls. Defaults to DATA_PATH.
+
+    Returns:
+        pd.DataFrame: Series with the columns unique_id, ds, and y.
+    """
+
+    raw_df = pd.read_excel(path, sheet_name=SHEET_NAME)
+
+    series = []
+    for i, row in enumerate(raw_df.itertuples(index=False)):
+        year, month = int(row[4]), int(row[5])
+        if year <= 0 or not 1 <= month <= 12:
+            year, month = DEFAULT_START
+
+        values = pd.Series(row[N_ID_COLUMNS:], dtype=float).dropna().values
+
+        series.append(pd.DataFrame({
+            'unique_id': f'M{i + 1}',
+            'ds': pd.date_range(f'{year}-{month:02d}-01', periods=len(values), freq=FREQ),
+            'y': values,
+        }))
+
+    return pd.concat(series, ignore_index=True)
+
+
+def run_series(series_df: pd.DataFrame, pdf_path: str, skip_pdf: bool) -> dict:
+    """
+    Builds the report of a series, with a tracer.
+
+    Args:
+        series_df (pd.DataFrame): Series following a Nixtla-based structure.
+        pdf_path (str): Path of the PDF file.
+        skip_pdf (bool): Whether to skip the PDF write (e.g. without the system libraries of WeasyPrint, in which
+        case the WeasyPrint document is not created either).
+
+    Returns:
+        dict: End-to-end time and time of each stage, in seconds.
+    """
+
+    from cardtale.cards.builder import CardsBuilder
+    from cardtale.core.tracing import Tracer
+
+    tracer = Tracer()
+
+    start = time.perf_counter()
+
+    builder = CardsBuilder(series_df, FREQ, tracer=tracer)
+    try:
+        builder.build_cards()
+    except (ImportError, OSError):
+        # WeasyPrint failed to load: the document is created after the Jinja render, so only it is not timed
+        if not skip_pdf:
+            raise
+    if not skip_pdf:
+        builder.get_pdf(path=pdf_path)
+
+    total = time.perf_counter() - start
+
+    durations = tracer.summary()['total'].reindex(STAGE_SPANS, fill_value=0.0).astype(float)
+
+    return {
+        'total': total,
+        'profile': durations['tsd_setup'],
+        'tests': durations['tests'] - durations['landmark_cv'],
+        'landmarks': durations['landmark_cv'],
+        'plotting': durations['plots'],
+        'render': durations['jinja_render'] + durations['html_document'],
+        'pdf': durations['write_pdf'],
+    }
+
+
+def latency_stats(times) -> dict:
+    """
+    Summarises the times of the series (mean and quantiles in LATENCY_QUANTILES), in seconds.
+    """
+
+    stats = {name: float(np.quantile(times, q)) for name, q in LATENCY_QUANTILES.items()}
+    stats['mean'] = float(np.mean(times))
+
+    return stats
+
+
+def peak_rss_mb() -> float:
+    """
+    Peak resident set size of the process, in megabytes.
+    """
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # bytes on macOS, kilobytes on Linux
+    return peak / 1024 ** 2 if sys.platform == 'darwin' else peak / 1024
+
+
+def run_benchmark(df: pd.DataFrame, n_series: int, skip_pdf: bool) -> dict:
+    """
+    Builds the reports of the first n_series series, after a warm-up series outside them.
+
+    Args:
+        df (pd.DataFrame): Series of M3 (see load_m3_monthly).
+        n_series (int): Number of series.
+        skip_pdf (bool): Whether to skip the PDF write.
+
+    Returns:
+        dict: Results, with the throughput, the latency end-to-end and by stage, and the peak RSS.
+    """
+
+    from cardtale.analytics.operations.tsa.decomposition import STL_CACHE
+    from cardtale.core.time import CALENDAR_CACHE
+
+    groups = [series_df.reset_index(drop=True) for _, series_df in df.groupby('unique_id', sort=False)]
+    warmup_df = groups[n_series] if n_series < len(groups) else groups[-1]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        pdf_path = os.path.join(tmp_dir, 'report.pdf')
+
+        run_series(warmup_df, pdf_path, skip_pdf)
+        STL_CACHE.clear()
+        CALENDAR_CACHE.clear()
+
+        runs = []
+        start = time.perf_counter()
+        for series_df in groups[:n_series]:
+            runs.append(run_series(series_df, pdf_path, skip_pdf))
+            print(f'{series_df["unique_id"].iloc[0]:<8} {runs[-1]["total"]:.2f}s', file=sys.stderr)
+
+        elapsed = time.perf_counter() - start
+
+    return {
+        'meta': {
+            'date': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'machine': platform.machine(),
+            'cpu_count': os.cpu_count(),
+            'n_series': len(runs),
+            'warmup_series': warmup_df['unique_id'].iloc[0],
+            'skip_pdf': skip_pdf,
+        },
+        'series_per_sec': len(runs) / elapsed,
+        'latency': latency_stats([run['total'] for run in runs]),
+        'stages': {stage: latency_stats([run[stage] for run in runs]) for stage in STAGES},
+        'peak_rss_mb': peak_rss_mb(),
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """
+    Compares results to a baseline. Latencies and peak RSS regress if they increase, and the throughput
+    regresses if it decreases, by more than the tolerance (as a fraction of the baseline). Latency changes
+    smaller than MIN_LATENCY_CHANGE seconds are not flagged.
+
+    Args:
+        results (dict): Results of the current run.
+        baseline (dict): Stored results.
+        tolerance (float): Relative change allowed.
+
+    Returns:
+        list: Rows with the metric, the baseline and current values, the relative change, and whether it regressed.
+    """
+
+    # metric, direction of a regression, and minimum absolute change
+    metrics = [('series_per_sec', -1, 0.0), ('peak_rss_mb', 1, 0.0)]
+    metrics += [(f'latency.{q}', 1, MIN_LATENCY_CHANGE) for q in LATENCY_QUANTILES]
+    metrics += [(f'stages.{stage}.{q}', 1, MIN_LATENCY_CHANGE) for stage in STAGES for q in LATENCY_QUANTILES]
+
+    rows = []
+    for metric, direction, min_change in metrics:
+        current, base = results, baseline
+        for key in metric.split('.'):
+            current, base = current[key], base[key]
+
+        change = (current - base) / base if base > 0 else 0.0
+
+        rows.append({
+            'metric': metric,
+            'baseline': base,
+            'current': current,
+            'change': change,
+            'regression': change * direction > tolerance and abs(current - base) > min_change,
+        })
+
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--n-series', type=int, default=20)
+    parser.add_argument('--data', default=DATA_PATH)
+    parser.add_argument('--output', default='m3_results.json')
+    parser.add_argument('--baseline', default=None)
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument('--skip-pdf', action='store_true')
+    args = parser.parse_args()
+
+    warnings.filterwarnings('ignore')
+
+    df = load_m3_monthly(args.data)
+
+    results = run_benchmark(df, args.n_series, args.skip_pdf)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+
+    print(f'series/sec: {results["series_per_sec"]:.3f}, '
+          f'p50: {results["latency"]["p50"]:.2f}s, p95: {results["latency"]["p95"]:.2f}s, '
+          f'peak RSS: {results["peak_rss_mb"]:.0f}MB')
+    for stage in STAGES:
+        stats = results['stages'][stage]
+        print(f'  {stage:<10} p50 {stats["p50"]:.3f}s, p95 {stats["p95"]:.3f}s')
+
+    if args.baseline is None:
+        return
+
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+
+    for key in ['n_series', 'skip_pdf', 'cpu_count']:
+        if baseline['meta'][key] != results['meta'][key]:
+            print(f'Warning: the baseline was run with {key}={baseline["meta"][key]} '
+                  f'(current run: {results["meta"][key]})')
+
+    rows = compare(results, baseline, args.tolerance)
+    for row in rows:
+        status = 'REGRESSION' if row['regression'] else 'ok'
+        print(f'{row["metric"]:<24} {row["baseline"]:>10.3f} -> {row["current"]:>10.3f} '
+              f'({row["change"]:+.1%}) {status}')
+
+    sys.exit(1 if any(row['regression'] for row in rows) else 0)
+
+
+if __name__ == '__main__':
+    main()
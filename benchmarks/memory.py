@@ -0,0 +1,80 @@
+"""
+Measures the peak memory used to build the report of a series.
+
+The series is held once by TimeSeriesData, as read-only arrays, and the stages of the analysis
+(tests, landmarks, plots) work on views of it. This benchmark builds the report of a few series
+of the M3 dataset, and reports the peak of the memory allocated by Python and numpy while building
+each one (with tracemalloc), next to the size of the input frame. A first report is built before
+the measurements, so the (lazy) imports of the dependencies are not counted.
+
+Usage:
+    python benchmarks/memory.py [--n-series 5] [--render]
+"""
+import argparse
+import tracemalloc
+import warnings
+
+# monthly series of the M3 dataset
+GROUP = 'Monthly'
+FREQ = 'ME'
+DATA_DIR = 'assets'
+MB = 1024 ** 2
+
+
+def measure_report(series_df, freq: str, render: bool) -> dict:
+    """
+    Builds the report of a series, tracking the memory allocations.
+
+    Args:
+        series_df (pd.DataFrame): Series following a Nixtla-based structure.
+        freq (str): Sampling frequency of the series.
+        render (bool): Whether to render the HTML report (plots included), or only run the analysis.
+
+    Returns:
+        dict: Size of the input frame, and peak of the allocated memory (both in MB).
+    """
+
+    from cardtale.cards.builder import CardsBuilder
+
+    tracemalloc.start()
+
+    builder = CardsBuilder(series_df, freq)
+    builder.build_cards(render_html=render)
+
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {'input': series_df.memory_usage(deep=True).sum() / MB, 'peak': peak / MB}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--n-series', type=int, default=5)
+    parser.add_argument('--render', action='store_true')
+    args = parser.parse_args()
+
+    from datasetsforecast.m3 import M3
+    from cardtale.cards.builder import CardsBuilder
+
+    warnings.filterwarnings('ignore')
+
+    df, *_ = M3.load(DATA_DIR, group=GROUP)
+
+    uids = df['unique_id'].unique()[:args.n_series]
+
+    CardsBuilder(df.query(f'unique_id=="{uids[0]}"').reset_index(drop=True), FREQ).build_cards(render_html=args.render)
+
+    peaks = []
+    for uid in uids:
+        series_df = df.query(f'unique_id=="{uid}"').reset_index(drop=True)
+
+        result = measure_report(series_df, FREQ, args.render)
+        peaks.append(result['peak'])
+
+        print(f'{uid:<10} n={series_df.shape[0]:<5} input {result["input"]:.3f}MB, peak {result["peak"]:.1f}MB')
+
+    print(f'mean peak per report: {sum(peaks) / len(peaks):.1f}MB, max: {max(peaks):.1f}MB')
+
+
+if __name__ == '__main__':
+    main()
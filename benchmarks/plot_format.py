@@ -0,0 +1,100 @@
+"""
+Compares the 'png' and 'svg' plot formats on a sample of the M3 monthly series.
+
+For each format, measures the time to build and encode the plots (render_doc_html), the size
+of the rendered HTML, and the time and size of the PDF written by WeasyPrint. If WeasyPrint cannot
+be loaded (e.g. without its system libraries), the PDF time and size are recorded as NaN, and the
+report is compared by its HTML only.
+
+Usage:
+    python benchmarks/plot_format.py [--n-series 5] [--output-dir benchmarks/output]
+"""
+import argparse
+import time
+from pathlib import Path
+
+import pandas as pd
+from datasetsforecast.m3 import M3
+
+from cardtale.cards.builder import CardsBuilder
+from cardtale.visuals.plot import PLOT_FORMATS
+
+ASSETS_DIR = Path(__file__).parent.parent / 'assets'
+GROUP = 'Monthly'
+FREQ = 'ME'
+
+
+def run_format(series_df: pd.DataFrame, plot_format: str, output_dir: Path) -> dict:
+    """
+    Builds the report of a series with the given plot format.
+
+    Args:
+        series_df (pd.DataFrame): Time series data.
+        plot_format (str): Image format of the plots.
+        output_dir (Path): Directory for the PDF files.
+
+    Returns:
+        dict: Render time, HTML size, PDF time, and PDF size.
+    """
+
+    uid = series_df['unique_id'].iloc[0]
+
+    tcard = CardsBuilder(series_df, FREQ, plot_format=plot_format)
+    tcard.build_cards(render_html=False)
+
+    # the HTML (plots included) is rendered before the WeasyPrint document is created, so render_doc_html
+    # only fails at its last step if WeasyPrint (or its system libraries) cannot be loaded
+    start = time.perf_counter()
+    try:
+        tcard.render_doc_html()
+        has_weasyprint = True
+    except (ImportError, OSError):
+        has_weasyprint = False
+    render_time = time.perf_counter() - start
+
+    pdf_time = pdf_kb = float('nan')
+    if has_weasyprint:
+        pdf_path = output_dir / f'{uid}_{plot_format}.pdf'
+
+        start = time.perf_counter()
+        tcard.get_pdf(path=str(pdf_path))
+        pdf_time = time.perf_counter() - start
+        pdf_kb = pdf_path.stat().st_size / 1024
+
+    return {
+        'unique_id': uid,
+        'format': plot_format,
+        'render_time': render_time,
+        'html_kb': len(tcard.cards_raw_html.encode()) / 1024,
+        'pdf_time': pdf_time,
+        'pdf_kb': pdf_kb,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--n-series', type=int, default=5)
+    parser.add_argument('--output-dir', type=str, default=str(Path(__file__).parent / 'output'))
+    args = parser.parse_args()
+
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    df, *_ = M3.load(str(ASSETS_DIR), group=GROUP)
+    uids = df['unique_id'].unique()[:args.n_series]
+
+    results = []
+    for uid in uids:
+        series_df = df.query(f'unique_id=="{uid}"').reset_index(drop=True)
+        for plot_format in PLOT_FORMATS:
+            results.append(run_format(series_df, plot_format, output_dir))
+
+    results_df = pd.DataFrame(results)
+
+    print(results_df.round(3).to_string(index=False))
+    print()
+    print(results_df.drop(columns='unique_id').groupby('format').mean().round(3))
+
+
+if __name__ == '__main__':
+    main()
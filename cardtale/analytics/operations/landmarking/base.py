@@ -1,11 +1,12 @@
+from typing import List, Optional
+
 import pandas as pd
-from mlforecast import MLForecast
-from datasetsforecast.losses import smape
-from datasetsforecast.evaluation import accuracy
 
 from cardtale.core.data import TimeSeriesData
+from cardtale.core.tracing import span
 from cardtale.core.config.freq import HORIZON_BY_FREQUENCY, LAGS_BY_FREQUENCY
-from cardtale.analytics.operations.landmarking.config import EXPERIMENT_MODES, MODEL, N_WINDOWS
+from cardtale.analytics.operations.landmarking.config import EXPERIMENT_MODES, N_WINDOWS, get_models
+from cardtale.analytics.operations.landmarking.cache import LandmarkCache
 
 UNKNOWN_TEST_ERROR = 'Unknown experiment type'
 
@@ -20,17 +21,21 @@ class Landmarks:
         mlf (MLForecast): Machine learning forecast object.
         results (dict): Dictionary to store the results of the experiments.
         importance (dict): Dictionary to store the feature importance.
+        cache (LandmarkCache): Cache of experiment results, possibly shared with other Landmarks objects.
+        lags (List[int]): Lags used as explanatory variables.
+        horizon (int): Forecasting horizon.
     """
 
     TEST_NAME = ''
 
-    def __init__(self, test_name: str, tsd: TimeSeriesData):
+    def __init__(self, test_name: str, tsd: TimeSeriesData, cache: Optional[LandmarkCache] = None):
         """
         Initializes the Landmarks class with the given test name and time series data.
 
         Args:
             test_name (str): Name of the test to run.
             tsd (TimeSeriesData): Time series data object.
+            cache (LandmarkCache, optional): Cache of experiment results. Defaults to None (no caching).
         """
 
         assert test_name in [*EXPERIMENT_MODES], UNKNOWN_TEST_ERROR
@@ -38,6 +43,10 @@ class Landmarks:
         self.test_name = test_name
         self.tsd = tsd
 
+        self.cache = cache
+        self.lags = list(range(1, LAGS_BY_FREQUENCY[self.tsd.dt.freq_short] + 1))
+        self.horizon = HORIZON_BY_FREQUENCY[self.tsd.dt.freq_short]
+
         self.mlf = None
         self.results = {}
         self.importance = {}
@@ -50,10 +59,38 @@ class Landmarks:
         """
 
         for conf in EXPERIMENT_MODES[self.test_name]:
-            cv_df = self.run_mlf_cv(conf)
-            error = self.score_cv(cv_df)
+            self.results[conf] = self.run_experiment(conf)
+
+    def run_experiment(self, config_name: str) -> float:
+        """
+        Runs the experiment of a configuration, unless an equivalent one is cached.
+        It is timed as a span of the active tracer, if any.
+
+        Args:
+            config_name (str): Name of the configuration to use.
+
+        Returns:
+            float: Mean SMAPE score.
+        """
+
+        with span('landmark_cv', test=self.test_name, config=config_name):
+            df, target_transforms, static_features = self.setup_cv(config_name)
+
+            if self.cache is None:
+                cv_df = self.cross_validation(df, target_transforms, static_features)
 
-            self.results[conf] = error
+                return self.score_cv(cv_df)
+
+            key = self.cache.get_key(df=df,
+                                     lags=self.lags,
+                                     horizon=self.horizon,
+                                     n_windows=N_WINDOWS,
+                                     target_transforms=target_transforms,
+                                     static_features=static_features,
+                                     models=get_models())
+
+            return self.cache.get_or_run(
+                key, lambda: self.score_cv(self.cross_validation(df, target_transforms, static_features)))
 
     def run_mlf_cv(self, config_name: str):
         """
@@ -66,21 +103,62 @@ class Landmarks:
             pd.DataFrame: DataFrame containing the cross-validation results.
         """
 
-        if config_name == "":
-            self.mlf = MLForecast(
-                models=MODEL,
-                freq=self.tsd.dt.freq_short,
-                # target_transforms=[Differences([1])],
-                # target_transforms=[GlobalSklearnTransformer(sk_log1p)],
-                lags=list(range(1, LAGS_BY_FREQUENCY[self.tsd.dt.freq] + 1)),
-                # date_features=['month', 'hour', 'dayofweek']
-            )
+        with span('landmark_cv', test=self.test_name, config=config_name):
+            df, target_transforms, static_features = self.setup_cv(config_name)
+
+            cv_df = self.cross_validation(df=df,
+                                          target_transforms=target_transforms,
+                                          static_features=static_features)
+
+        return cv_df
+
+    def setup_cv(self, config_name: str):
+        """
+        Prepares the inputs of the cross-validation for a given configuration.
+
+        Args:
+            config_name (str): Name of the configuration to use.
+
+        Returns:
+            Tuple[pd.DataFrame, Optional[List], Optional[List]]: Dataset (including extra features),
+            target transformations, and static features.
+        """
+        raise NotImplementedError
+
+    def cross_validation(self,
+                         df: pd.DataFrame,
+                         target_transforms: Optional[List] = None,
+                         static_features: Optional[List] = None):
+        """
+        Runs cross-validation using MLForecast on a dataset with one or more series.
+
+        Args:
+            df (pd.DataFrame): Dataset following a Nixtla-based structure.
+            target_transforms (List, optional): Target transformations. Defaults to None.
+            static_features (List, optional): Static features. Defaults to None.
+
+        Returns:
+            pd.DataFrame: DataFrame containing the cross-validation results.
+        """
+
+        from mlforecast import MLForecast
+
+        self.mlf = MLForecast(
+            models=get_models(),
+            freq=self.tsd.dt.freq_short,
+            target_transforms=target_transforms,
+            lags=self.lags,
+        )
 
         cv_df = self.mlf.cross_validation(
-            df=self.tsd.df,
-            h=HORIZON_BY_FREQUENCY[self.tsd.dt.freq_short],
+            df=df,
+            h=self.horizon,
             n_windows=N_WINDOWS,
             refit=False,
+            static_features=static_features,
+            id_col=self.tsd.id_col,
+            time_col=self.tsd.time_col,
+            target_col=self.tsd.target_col,
         )
 
         return cv_df
@@ -96,11 +174,31 @@ class Landmarks:
             float: Mean SMAPE score.
         """
 
+        score = self.score_cv_by_series(cv_df, id_col=self.tsd.id_col).mean()
+
+        return score
+
+    @staticmethod
+    def score_cv_by_series(cv_df: pd.DataFrame, id_col: str = 'unique_id') -> pd.Series:
+        """
+        Scores the cross-validation results of each series using SMAPE.
+
+        Args:
+            cv_df (pd.DataFrame): DataFrame containing the cross-validation results.
+            id_col (str, optional): Column name for the time series identifier. Defaults to 'unique_id'.
+
+        Returns:
+            pd.Series: SMAPE score of each series, indexed by identifier.
+        """
+
+        from datasetsforecast.losses import smape
+        from datasetsforecast.evaluation import accuracy
+
         evaluation_df = accuracy(cv_df.drop(columns=['cutoff']),
                                  metrics=[smape],
-                                 id_col=self.tsd.id_col,
-                                 agg_by=[self.tsd.id_col])
+                                 id_col=id_col,
+                                 agg_by=[id_col])
 
-        score = evaluation_df.drop(columns=['metric', self.tsd.id_col]).mean()[[*MODEL][0]]
+        scores = evaluation_df.set_index(id_col)[[*get_models()][0]]
 
-        return score
+        return scores
@@ -0,0 +1,155 @@
+import hashlib
+import threading
+from typing import Callable, Dict, List, Optional
+
+import pandas as pd
+
+
+class LandmarkCache:
+    """
+    Cache of landmark experiment results.
+
+    Experiments are identified by the content of the dataset (including extra features),
+    the lags, forecasting horizon, target transformations, static features and model. So, equivalent
+    experiments run by different Landmarks objects (e.g. the 'base' configuration of trend,
+    seasonality, variance, and change) are only run once.
+
+    The cache is thread-safe. When testers run concurrently, an experiment requested by several
+    of them is run by the first one, while the others wait for its result.
+
+    Attributes:
+        results (dict): Cached scores by experiment key.
+        hits (int): Number of lookups that found a cached result.
+        misses (int): Number of lookups that did not find a cached result.
+    """
+
+    def __init__(self):
+        self.results: Dict[str, float] = {}
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._key_locks: Dict[str, threading.Lock] = {}
+
+    def __getstate__(self):
+        # locks cannot be pickled (e.g. when plots are sent to worker processes)
+        state = self.__dict__.copy()
+        del state['_lock'], state['_key_locks']
+
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+
+        self._lock = threading.Lock()
+        self._key_locks = {}
+
+    def get(self, key: str) -> Optional[float]:
+        """
+        Gets the score of an experiment, if cached.
+
+        Args:
+            key (str): Experiment key (see get_key).
+
+        Returns:
+            float: Cached score, or None if the experiment was not run yet.
+        """
+
+        with self._lock:
+            if key in self.results:
+                self.hits += 1
+                return self.results[key]
+
+            self.misses += 1
+
+        return None
+
+    def set(self, key: str, score: float):
+        """
+        Stores the score of an experiment.
+
+        Args:
+            key (str): Experiment key (see get_key).
+            score (float): Score of the experiment.
+        """
+
+        with self._lock:
+            self.results[key] = score
+
+    def get_or_run(self, key: str, experiment: Callable[[], float]) -> float:
+        """
+        Gets the score of an experiment, running it if not cached.
+
+        Args:
+            key (str): Experiment key (see get_key).
+            experiment (Callable[[], float]): Function that runs the experiment and returns its score.
+
+        Returns:
+            float: Score of the experiment.
+        """
+
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            score = self.get(key)
+            if score is None:
+                score = experiment()
+                self.set(key, score)
+
+        return score
+
+    def info(self) -> Dict[str, int]:
+        """
+        Summarises the usage of the cache.
+
+        Returns:
+            dict: Number of hits, misses, and cached experiments.
+        """
+
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self.results)}
+
+    @classmethod
+    def get_key(cls,
+                df: pd.DataFrame,
+                lags: List[int],
+                horizon: int,
+                n_windows: int,
+                target_transforms: Optional[List] = None,
+                static_features: Optional[List] = None,
+                models: Optional[Dict] = None) -> str:
+        """
+        Computes the key of an experiment.
+
+        Args:
+            df (pd.DataFrame): Dataset used for cross-validation, including extra features.
+            lags (List[int]): Lags used as explanatory variables.
+            horizon (int): Forecasting horizon.
+            n_windows (int): Number of cross-validation windows.
+            target_transforms (List, optional): Target transformations. Defaults to None.
+            static_features (List, optional): Static features. Defaults to None.
+            models (Dict, optional): Models by name. Defaults to None.
+
+        Returns:
+            str: Experiment key.
+        """
+
+        key = hashlib.sha1()
+        key.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+        key.update(repr(df.columns.tolist()).encode())
+        key.update(repr((lags, horizon, n_windows, static_features)).encode())
+        key.update(repr([cls._describe(t) for t in target_transforms or []]).encode())
+        key.update(repr(models).encode())
+
+        return key.hexdigest()
+
+    @staticmethod
+    def _describe(obj) -> str:
+        """
+        Describes an object by its type and attributes, as some objects (e.g. mlforecast's
+        target transformations) do not have an informative representation.
+        """
+
+        attrs = ', '.join(f'{k}={v!r}' for k, v in sorted(vars(obj).items()))
+
+        return f'{type(obj).__module__}.{type(obj).__qualname__}({attrs})'
@@ -1,10 +1,9 @@
-from mlforecast import MLForecast
-from utilsforecast.feature_engineering import trend
+from typing import Optional
 
 from cardtale.core.data import TimeSeriesData
 from cardtale.analytics.operations.landmarking.base import Landmarks
-from cardtale.analytics.operations.landmarking.config import EXPERIMENT_MODES, MODEL, N_WINDOWS
-from cardtale.core.config.freq import HORIZON_BY_FREQUENCY, LAGS_BY_FREQUENCY
+from cardtale.analytics.operations.landmarking.cache import LandmarkCache
+from cardtale.analytics.operations.landmarking.config import EXPERIMENT_MODES
 
 
 class ChangeLandmarks(Landmarks):
@@ -17,32 +16,39 @@ class ChangeLandmarks(Landmarks):
 
     TEST_NAME = 'change'
 
-    def __init__(self, tsd: TimeSeriesData, change_point: int):
+    def __init__(self,
+                 tsd: TimeSeriesData,
+                 change_point: int,
+                 cache: Optional[LandmarkCache] = None):
         """
         Initializes the ChangeLandmarks with the given time series data.
 
         Args:
             tsd (TimeSeriesData): Time series data object.
+            cache (LandmarkCache, optional): Cache of experiment results. Defaults to None.
         """
 
-        super().__init__(tsd=tsd, test_name=self.TEST_NAME)
+        super().__init__(tsd=tsd, test_name=self.TEST_NAME, cache=cache)
 
         self.change_point = change_point
 
-    def run_mlf_cv(self, config_name: str):
+    def setup_cv(self, config_name: str):
         """
-        Runs cross-validation using MLForecast for variance experiments.
+        Prepares the cross-validation inputs for change experiments.
 
         Args:
             config_name (str): Name of the configuration to use.
 
         Returns:
-            pd.DataFrame: DataFrame containing the cross-validation results.
+            Tuple[pd.DataFrame, Optional[List], Optional[List]]: Dataset (including extra features),
+            target transformations, and static features.
         """
 
+        from utilsforecast.feature_engineering import trend
+
         conf = EXPERIMENT_MODES[self.test_name][config_name]
 
-        df = self.tsd.df.copy()
+        df = self.tsd.df
 
         if conf['step']:
             df, _ = trend(df=df,
@@ -57,21 +63,4 @@ class ChangeLandmarks(Landmarks):
         else:
             static_features = None
 
-        self.mlf = MLForecast(
-            models=MODEL,
-            freq=self.tsd.dt.freq_short,
-            lags=list(range(1, LAGS_BY_FREQUENCY[self.tsd.dt.freq_short] + 1)),
-        )
-
-        cv_df = self.mlf.cross_validation(
-            df=df,
-            h=HORIZON_BY_FREQUENCY[self.tsd.dt.freq_short],
-            n_windows=N_WINDOWS,
-            static_features=static_features,
-            refit=False,
-            id_col=self.tsd.id_col,
-            time_col=self.tsd.time_col,
-            target_col=self.tsd.target_col,
-        )
-
-        return cv_df
+        return df, None, static_features
@@ -1,9 +1,11 @@
-import lightgbm as lgb
+from typing import Dict
 
 N_TERMS = 3
 TEST_SIZE = 0.2
 N_WINDOWS = 1  # 5
-MODEL = {'lgb': lgb.LGBMRegressor(verbosity=-1, linear_tree=True)}
+MODEL_PARAMS = {'verbosity': -1, 'linear_tree': True}
+
+cached_models = {}
 
 EXPERIMENT_MODES = {
     'trend': {
@@ -29,3 +31,29 @@ EXPERIMENT_MODES = {
         'step': {'step': True},
     },
 }
+
+
+def get_models() -> Dict:
+    """
+    Gets the models used in the landmark experiments, created on the first call.
+
+    LightGBM is only imported when the experiments are run, not when cardtale is imported.
+
+    Returns:
+        dict: Models by name, as expected by MLForecast.
+    """
+
+    if len(cached_models) == 0:
+        import lightgbm as lgb
+
+        cached_models['lgb'] = lgb.LGBMRegressor(**MODEL_PARAMS)
+
+    return cached_models
+
+
+def __getattr__(name):
+    # MODEL is kept as a (lazy) module attribute for backwards compatibility
+    if name == 'MODEL':
+        return get_models()
+
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
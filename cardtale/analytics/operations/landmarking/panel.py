@@ -0,0 +1,185 @@
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from cardtale.core.data import TimeSeriesData
+from cardtale.core.config.freq import PLOTTING_SEAS_CONFIGS
+from cardtale.analytics.operations.landmarking.base import Landmarks
+from cardtale.analytics.operations.landmarking.trend import TrendLandmarks
+from cardtale.analytics.operations.landmarking.seasonality import SeasonalLandmarks
+from cardtale.analytics.operations.landmarking.variance import VarianceLandmarks
+from cardtale.analytics.operations.landmarking.change import ChangeLandmarks
+from cardtale.analytics.operations.landmarking.config import EXPERIMENT_MODES
+from cardtale.analytics.operations.tsa.change_points import ChangePointDetection
+
+MIXED_FREQUENCY_ERROR = 'All series in the panel must have the same sampling frequency'
+DUPLICATED_NAME_ERROR = 'Series names (identifiers) must be unique'
+
+
+class PanelLandmarks:
+    """
+    Class for running landmark experiments on a panel of time series.
+
+    Each experiment configuration is cross-validated once over all series, with a single
+    (global) MLForecast model. The SMAPE of each series is then split out from the
+    cross-validation results. So, the number of model fits depends on the number of
+    configurations, not on the number of series.
+
+    Note that the scores differ from those obtained in the univariate mode, as the model
+    is shared across series. Each series is standardised (after the other target transformations)
+    so that series with different scales can share a model. Sklearn-based target transformations
+    (log, Box-Cox) are fitted globally.
+
+    Attributes:
+        tsd_list (List[TimeSeriesData]): Time series data objects, one for each series.
+        change_points (dict): First change point of each series (if any), by series name.
+        results (dict): Results of the experiments of each series, by series name.
+    """
+
+    def __init__(self,
+                 tsd_list: List[TimeSeriesData],
+                 change_points: Optional[Dict[str, int]] = None):
+        """
+        Initializes the PanelLandmarks with the given time series data objects.
+
+        Args:
+            tsd_list (List[TimeSeriesData]): Time series data objects, one for each series.
+            change_points (Dict[str, int], optional): First change point of each series, by series name.
+            If None, change points are detected with ChangePointDetection. Defaults to None.
+        """
+
+        assert len({tsd.dt.freq_short for tsd in tsd_list}) == 1, MIXED_FREQUENCY_ERROR
+        assert len({tsd.name for tsd in tsd_list}) == len(tsd_list), DUPLICATED_NAME_ERROR
+
+        self.tsd_list = tsd_list
+
+        if change_points is None:
+            self.change_points = self.detect_change_points(tsd_list)
+        else:
+            self.change_points = change_points
+
+        self.results = {}
+
+    def run(self) -> Dict[str, Dict]:
+        """
+        Runs the landmark experiments of all components (trend, seasonality, variance, and change).
+
+        Returns:
+            dict: Results of each series, by series name. The results of each series are structured as
+            {'trend': {...}, 'variance': {...}, 'seasonality': {period_name: {...}}, 'change': {...}}.
+        """
+
+        self.results = {tsd.name: {'seasonality': {}} for tsd in self.tsd_list}
+
+        trend_lm = self.run_global([TrendLandmarks(tsd=tsd) for tsd in self.tsd_list])
+        variance_lm = self.run_global([VarianceLandmarks(tsd=tsd) for tsd in self.tsd_list])
+
+        for tsd, trend_lm_, variance_lm_ in zip(self.tsd_list, trend_lm, variance_lm):
+            self.results[tsd.name]['trend'] = trend_lm_.results
+            self.results[tsd.name]['variance'] = variance_lm_.results
+
+        period_data_l = PLOTTING_SEAS_CONFIGS[self.tsd_list[0].dt.freq_longly.lower()]
+        if period_data_l is not None:
+            for period_data in period_data_l:
+                if period_data['period'] is None:
+                    continue
+
+                seasonal_lm = self.run_global([SeasonalLandmarks(tsd=tsd, target_period=period_data['period'])
+                                               for tsd in self.tsd_list])
+
+                for tsd, seasonal_lm_ in zip(self.tsd_list, seasonal_lm):
+                    self.results[tsd.name]['seasonality'][period_data['name']] = seasonal_lm_.results
+
+        changed_tsd = [tsd for tsd in self.tsd_list if tsd.name in self.change_points]
+        if len(changed_tsd) > 0:
+            change_lm = self.run_global([ChangeLandmarks(tsd=tsd, change_point=self.change_points[tsd.name])
+                                         for tsd in changed_tsd])
+
+            for tsd, change_lm_ in zip(changed_tsd, change_lm):
+                self.results[tsd.name]['change'] = change_lm_.results
+
+        return self.results
+
+    @staticmethod
+    def run_global(landmarks: List[Landmarks]) -> List[Landmarks]:
+        """
+        Runs the experiments of a list of landmarks (one for each series) with a single cross-validation
+        for each configuration. The experiments of the series without a score in the global cross-validation
+        (e.g. too short for its windows) are run on their own, as in the univariate mode.
+
+        Args:
+            landmarks (List[Landmarks]): Landmarks objects of the same type, one for each series.
+
+        Returns:
+            List[Landmarks]: Input landmarks objects, with the results of each series.
+        """
+
+        from mlforecast.target_transforms import LocalStandardScaler
+
+        lead = landmarks[0]
+
+        for conf in EXPERIMENT_MODES[lead.test_name]:
+            cv_inputs = [lm.setup_cv(conf) for lm in landmarks]
+
+            df = pd.concat([inputs[0] for inputs in cv_inputs], ignore_index=True)
+            _, target_t, static_features = cv_inputs[0]
+            target_t = (target_t or []) + [LocalStandardScaler()]
+
+            cv_df = lead.cross_validation(df=df,
+                                          target_transforms=target_t,
+                                          static_features=static_features)
+
+            scores = lead.score_cv_by_series(cv_df, id_col=lead.tsd.id_col)
+
+            for lm in landmarks:
+                if lm.tsd.name in scores.index:
+                    lm.results[conf] = scores[lm.tsd.name]
+                else:
+                    # series dropped by the global cross-validation (e.g. too short to be scored)
+                    lm.results[conf] = lm.run_experiment(conf)
+
+        return landmarks
+
+    @staticmethod
+    def detect_change_points(tsd_list: List[TimeSeriesData]) -> Dict[str, int]:
+        """
+        Detects the first change point of each series.
+
+        Args:
+            tsd_list (List[TimeSeriesData]): Time series data objects.
+
+        Returns:
+            dict: First change point of each series with a detected change, by series name.
+        """
+
+        change_points = {}
+        for tsd in tsd_list:
+            series = tsd.get_target_series(df=tsd.df, target_col=tsd.target_col, time_col=tsd.time_col)
+
+            change_point = PanelLandmarks.detect_change_point(series, period=tsd.period)
+            if change_point is not None:
+                change_points[tsd.name] = change_point
+
+        return change_points
+
+    @staticmethod
+    def detect_change_point(series: pd.Series, period: Optional[int] = None) -> Optional[int]:
+        """
+        Detects the first change point of a series.
+
+        Args:
+            series (pd.Series): Target series, indexed by time.
+            period (Optional[int], optional): Main period of the series (see ChangePointDetection).
+            Defaults to None.
+
+        Returns:
+            Optional[int]: First change point, or None if no change is detected.
+        """
+
+        detection = ChangePointDetection(series, period=period)
+        detection.detect_changes()
+
+        if len(detection.change_points) == 0:
+            return None
+
+        return detection.change_points[ChangePointDetection.METHOD][0]
@@ -1,13 +1,10 @@
 from typing import Optional
 
-from mlforecast import MLForecast
-from mlforecast.target_transforms import Differences
-from utilsforecast.feature_engineering import fourier, time_features
-
 from cardtale.core.data import TimeSeriesData
 from cardtale.analytics.operations.landmarking.base import Landmarks
-from cardtale.core.config.freq import HORIZON_BY_FREQUENCY, LAGS_BY_FREQUENCY, TIME_FEATURES_FREQ
-from cardtale.analytics.operations.landmarking.config import EXPERIMENT_MODES, MODEL, N_WINDOWS, N_TERMS
+from cardtale.analytics.operations.landmarking.cache import LandmarkCache
+from cardtale.core.config.freq import TIME_FEATURES_FREQ
+from cardtale.analytics.operations.landmarking.config import EXPERIMENT_MODES, N_TERMS
 
 
 class SeasonalLandmarks(Landmarks):
@@ -21,13 +18,17 @@ class SeasonalLandmarks(Landmarks):
 
     TEST_NAME = 'seasonality'
 
-    def __init__(self, tsd: TimeSeriesData, target_period: Optional[int] = None):
+    def __init__(self,
+                 tsd: TimeSeriesData,
+                 target_period: Optional[int] = None,
+                 cache: Optional[LandmarkCache] = None):
         """
         Initializes the SeasonalLandmarks with the given time series data and target period.
 
         Args:
             tsd (TimeSeriesData): Time series data object.
             target_period (Optional[int]): Target period for seasonal decomposition. Defaults to None.
+            cache (LandmarkCache, optional): Cache of experiment results. Defaults to None.
         """
 
         if target_period is not None:
@@ -35,19 +36,23 @@ class SeasonalLandmarks(Landmarks):
         else:
             self.target_period = self.tsd.period
 
-        super().__init__(tsd=tsd, test_name=self.TEST_NAME)
+        super().__init__(tsd=tsd, test_name=self.TEST_NAME, cache=cache)
 
-    def run_mlf_cv(self, config_name: str):
+    def setup_cv(self, config_name: str):
         """
-        Runs cross-validation using MLForecast for seasonality experiments.
+        Prepares the cross-validation inputs for seasonality experiments.
 
         Args:
             config_name (str): Name of the configuration to use.
 
         Returns:
-            pd.DataFrame: DataFrame containing the cross-validation results.
+            Tuple[pd.DataFrame, Optional[List], Optional[List]]: Dataset (including extra features),
+            target transformations, and static features.
         """
 
+        from mlforecast.target_transforms import Differences
+        from utilsforecast.feature_engineering import fourier, time_features
+
         conf = EXPERIMENT_MODES[self.test_name][config_name]
 
         if conf['seasonal_differences']:
@@ -55,14 +60,16 @@ class SeasonalLandmarks(Landmarks):
         else:
             target_t = None
 
-        df_ = self.tsd.df.copy()
+        df_ = self.tsd.df
 
         if conf['fourier']:
             df, _ = fourier(df=df_,
                             freq=self.tsd.dt.freq_short,
                             season_length=self.target_period,
                             k=N_TERMS,
-                            h=0)
+                            h=0,
+                            id_col=self.tsd.id_col,
+                            time_col=self.tsd.time_col)
             static_features = []
         elif conf['time_features']:
             feats_ = TIME_FEATURES_FREQ[self.tsd.dt.freq_short][self.target_period]
@@ -70,25 +77,12 @@ class SeasonalLandmarks(Landmarks):
             df, _ = time_features(df=df_,
                                   freq=self.tsd.dt.freq_short,
                                   h=0,
-                                  features=feats_)
+                                  features=feats_,
+                                  id_col=self.tsd.id_col,
+                                  time_col=self.tsd.time_col)
             static_features = []
         else:
-            df = df_.copy()
+            df = df_
             static_features = None
 
-        self.mlf = MLForecast(
-            models=MODEL,
-            freq=self.tsd.dt.freq_short,
-            target_transforms=target_t,
-            lags=list(range(1, LAGS_BY_FREQUENCY[self.tsd.dt.freq_short] + 1)),
-        )
-
-        cv_df = self.mlf.cross_validation(
-            df=df,
-            h=HORIZON_BY_FREQUENCY[self.tsd.dt.freq_short],
-            n_windows=N_WINDOWS,
-            refit=False,
-            static_features=static_features
-        )
-
-        return cv_df
+        return df, target_t, static_features
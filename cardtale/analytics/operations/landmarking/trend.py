@@ -1,14 +1,10 @@
-from mlforecast import MLForecast
-from mlforecast.target_transforms import Differences
-from mlforecast.target_transforms import GlobalSklearnTransformer
-from utilsforecast.feature_engineering import trend
-from sklearn.preprocessing import FunctionTransformer
+from typing import Optional
 
 from cardtale.analytics.operations.tsa.log import LogTransformation
 from cardtale.core.data import TimeSeriesData
 from cardtale.analytics.operations.landmarking.base import Landmarks
-from cardtale.core.config.freq import HORIZON_BY_FREQUENCY, LAGS_BY_FREQUENCY
-from cardtale.analytics.operations.landmarking.config import EXPERIMENT_MODES, MODEL, N_WINDOWS
+from cardtale.analytics.operations.landmarking.cache import LandmarkCache
+from cardtale.analytics.operations.landmarking.config import EXPERIMENT_MODES
 
 
 class TrendLandmarks(Landmarks):
@@ -21,27 +17,33 @@ class TrendLandmarks(Landmarks):
 
     TEST_NAME = 'trend'
 
-    def __init__(self, tsd: TimeSeriesData):
+    def __init__(self, tsd: TimeSeriesData, cache: Optional[LandmarkCache] = None):
         """
         Initializes the TrendLandmarks with the given time series data.
 
         Args:
             tsd (TimeSeriesData): Time series data object.
+            cache (LandmarkCache, optional): Cache of experiment results. Defaults to None.
         """
 
-        super().__init__(tsd=tsd, test_name=self.TEST_NAME)
+        super().__init__(tsd=tsd, test_name=self.TEST_NAME, cache=cache)
 
-    def run_mlf_cv(self, config_name: str):
+    def setup_cv(self, config_name: str):
         """
-        Runs cross-validation using MLForecast for trend experiments.
+        Prepares the cross-validation inputs for trend experiments.
 
         Args:
             config_name (str): Name of the configuration to use.
 
         Returns:
-            pd.DataFrame: DataFrame containing the cross-validation results.
+            Tuple[pd.DataFrame, Optional[List], Optional[List]]: Dataset (including extra features),
+            target transformations, and static features.
         """
 
+        from mlforecast.target_transforms import Differences, GlobalSklearnTransformer
+        from sklearn.preprocessing import FunctionTransformer
+        from utilsforecast.feature_engineering import trend
+
         conf = EXPERIMENT_MODES[self.test_name][config_name]
 
         if conf['first_diff']:
@@ -54,7 +56,7 @@ class TrendLandmarks(Landmarks):
         else:
             target_t = None
 
-        df_ = self.tsd.df.copy()
+        df_ = self.tsd.df
 
         if conf['trend_feature']:
             df_, _ = trend(df=df_,
@@ -66,22 +68,4 @@ class TrendLandmarks(Landmarks):
         else:
             static_features = None
 
-        self.mlf = MLForecast(
-            models=MODEL,
-            freq=self.tsd.dt.freq_short,
-            target_transforms=target_t,
-            lags=list(range(1, LAGS_BY_FREQUENCY[self.tsd.dt.freq_short] + 1)),
-        )
-
-        cv_df = self.mlf.cross_validation(
-            df=df_,
-            h=HORIZON_BY_FREQUENCY[self.tsd.dt.freq_short],
-            n_windows=N_WINDOWS,
-            refit=False,
-            static_features=static_features,
-            id_col=self.tsd.id_col,
-            time_col=self.tsd.time_col,
-            target_col=self.tsd.target_col,
-        )
-
-        return cv_df
+        return df_, target_t, static_features
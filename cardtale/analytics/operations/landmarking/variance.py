@@ -1,12 +1,10 @@
-from sklearn.preprocessing import FunctionTransformer, PowerTransformer
-from mlforecast import MLForecast
-from mlforecast.target_transforms import GlobalSklearnTransformer
+from typing import Optional
 
 from cardtale.core.data import TimeSeriesData
 from cardtale.analytics.operations.landmarking.base import Landmarks
-from cardtale.analytics.operations.landmarking.config import EXPERIMENT_MODES, MODEL, N_WINDOWS
+from cardtale.analytics.operations.landmarking.cache import LandmarkCache
+from cardtale.analytics.operations.landmarking.config import EXPERIMENT_MODES
 from cardtale.analytics.operations.tsa.log import LogTransformation
-from cardtale.core.config.freq import HORIZON_BY_FREQUENCY, LAGS_BY_FREQUENCY
 
 
 class VarianceLandmarks(Landmarks):
@@ -19,27 +17,32 @@ class VarianceLandmarks(Landmarks):
 
     TEST_NAME = 'variance'
 
-    def __init__(self, tsd: TimeSeriesData):
+    def __init__(self, tsd: TimeSeriesData, cache: Optional[LandmarkCache] = None):
         """
         Initializes the VarianceLandmarks with the given time series data.
 
         Args:
             tsd (TimeSeriesData): Time series data object.
+            cache (LandmarkCache, optional): Cache of experiment results. Defaults to None.
         """
 
-        super().__init__(tsd=tsd, test_name=self.TEST_NAME)
+        super().__init__(tsd=tsd, test_name=self.TEST_NAME, cache=cache)
 
-    def run_mlf_cv(self, config_name: str):
+    def setup_cv(self, config_name: str):
         """
-        Runs cross-validation using MLForecast for variance experiments.
+        Prepares the cross-validation inputs for variance experiments.
 
         Args:
             config_name (str): Name of the configuration to use.
 
         Returns:
-            pd.DataFrame: DataFrame containing the cross-validation results.
+            Tuple[pd.DataFrame, Optional[List], Optional[List]]: Dataset, target transformations,
+            and static features.
         """
 
+        from sklearn.preprocessing import FunctionTransformer, PowerTransformer
+        from mlforecast.target_transforms import GlobalSklearnTransformer
+
         conf = EXPERIMENT_MODES[self.test_name][config_name]
 
         if conf['log']:
@@ -54,20 +57,6 @@ class VarianceLandmarks(Landmarks):
         else:
             target_t = None
 
-        df = self.tsd.df.copy()
-
-        self.mlf = MLForecast(
-            models=MODEL,
-            freq=self.tsd.dt.freq_short,
-            target_transforms=target_t,
-            lags=list(range(1, LAGS_BY_FREQUENCY[self.tsd.dt.freq_short] + 1)),
-        )
-
-        cv_df = self.mlf.cross_validation(
-            df=df,
-            h=HORIZON_BY_FREQUENCY[self.tsd.dt.freq_short],
-            n_windows=N_WINDOWS,
-            refit=False,
-        )
+        df = self.tsd.df
 
-        return cv_df
+        return df, target_t, None
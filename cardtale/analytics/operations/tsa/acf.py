@@ -1,8 +1,8 @@
+from statistics import NormalDist
 from typing import List
 
 import numpy as np
 import pandas as pd
-from statsmodels.tsa.stattools import acf, pacf
 
 from cardtale.core.utils.splits import DataSplit
 
@@ -52,6 +52,8 @@ class AutoCorrelation:
             data (pd.Series): Time series data.
         """
 
+        from statsmodels.tsa.stattools import acf
+
         self.significance_thr = 2 / np.sqrt(len(data))
 
         acf_x = acf(
@@ -61,16 +63,7 @@ class AutoCorrelation:
             **self.PARAMS
         )
 
-        self.acf, self.conf_int = acf_x[:2]
-
-        self.acf_df = pd.DataFrame({
-            'ACF': self.acf,
-            'ACF_low': self.conf_int[:, 0],
-            'ACF_high': self.conf_int[:, 1],
-        })
-
-        self.acf_df['Lag'] = ['t'] + [f't-{i}' for i in range(1, self.n_lags + 1)]
-        self.acf_df['Lag'] = DataSplit.df_var_to_categorical(self.acf_df, 'Lag')
+        self.set_values(*acf_x[:2])
 
     def calc_pacf(self, data: pd.Series):
         """
@@ -80,6 +73,8 @@ class AutoCorrelation:
             data (pd.Series): Time series data.
         """
 
+        from statsmodels.tsa.stattools import pacf
+
         self.significance_thr = 2 / np.sqrt(len(data))
 
         acf_x = pacf(
@@ -88,7 +83,55 @@ class AutoCorrelation:
             alpha=self.alpha
         )
 
-        self.acf, self.conf_int = acf_x[:2]
+        self.set_values(*acf_x[:2])
+
+    def set_acf(self, acf_values: np.ndarray, n: int):
+        """
+        Sets the ACF from precomputed values (e.g., from a ProfileAccumulator), with Bartlett's
+        confidence intervals, as statsmodels.
+
+        Args:
+            acf_values (np.ndarray): ACF for the lags 0..n_lags.
+            n (int): Number of observations.
+        """
+
+        self.significance_thr = 2 / np.sqrt(n)
+
+        var_acf = np.ones(self.n_lags + 1) / n
+        var_acf[0] = 0
+        var_acf[2:] *= 1 + 2 * np.cumsum(acf_values[1:-1] ** 2)
+
+        interval = NormalDist().inv_cdf(1 - self.alpha / 2) * np.sqrt(var_acf)
+
+        self.set_values(acf_values, np.column_stack([acf_values - interval, acf_values + interval]))
+
+    def set_pacf(self, pacf_values: np.ndarray, n: int):
+        """
+        Sets the PACF from precomputed values (e.g., from a ProfileAccumulator), with the
+        confidence intervals of statsmodels.
+
+        Args:
+            pacf_values (np.ndarray): PACF for the lags 0..n_lags.
+            n (int): Number of observations.
+        """
+
+        self.significance_thr = 2 / np.sqrt(n)
+
+        interval = np.full(self.n_lags + 1, NormalDist().inv_cdf(1 - self.alpha / 2) / np.sqrt(n))
+        interval[0] = 0
+
+        self.set_values(pacf_values, np.column_stack([pacf_values - interval, pacf_values + interval]))
+
+    def set_values(self, acf_values: np.ndarray, conf_int: np.ndarray):
+        """
+        Sets the (P)ACF values and their confidence intervals.
+
+        Args:
+            acf_values (np.ndarray): (P)ACF for the lags 0..n_lags.
+            conf_int (np.ndarray): Confidence intervals, with shape (n_lags + 1, 2).
+        """
+
+        self.acf, self.conf_int = acf_values, conf_int
 
         self.acf_df = pd.DataFrame({
             'ACF': self.acf,
@@ -1,39 +1,219 @@
+from typing import List, Optional
+
 import numpy as np
 import pandas as pd
 
-import ruptures as rpt
+from cardtale.analytics.operations.tsa.decomposition import DecompositionSTL
+
+UNKNOWN_BACKEND_ERROR = 'Unknown backend. Must be one of {}'
+
+
+class L2Pelt:
+    """
+    PELT change point detection with a (normal, fixed variance) L2 cost.
+
+    The cost of any segment is obtained in constant time from the cumulative sums of the signal,
+    so, with PELT pruning, detection is (close to) linear in the length of the series. The signal
+    is standardised, so the penalty is given in units of its variance (see ChangePointDetection,
+    which also removes the seasonal component of the series before fitting it).
+
+    The interface follows ruptures: fit(signal), then predict(pen), which returns the end of each
+    segment (including the length of the signal).
+
+    Attributes:
+        min_size (int): Minimum segment length.
+        jump (int): Subsample (one every jump points) for the candidate change points.
+    """
+
+    def __init__(self, min_size: int = 2, jump: int = 5):
+        """
+        Initializes the L2Pelt with the given segmentation constraints.
+
+        Args:
+            min_size (int, optional): Minimum segment length. Defaults to 2.
+            jump (int, optional): Subsample for the candidate change points. Defaults to 5.
+        """
+
+        self.min_size = min_size
+        self.jump = jump
+
+        self.n = 0
+        self._csum = None
+        self._csum_sq = None
+
+    def fit(self, signal: np.ndarray) -> 'L2Pelt':
+        """
+        Computes the cumulative sums of the (standardised) signal.
+
+        Args:
+            signal (np.ndarray): Univariate signal.
+
+        Returns:
+            L2Pelt: self
+        """
+
+        signal = np.asarray(signal, dtype=float).ravel()
+
+        scale = signal.std()
+
+        signal = (signal - signal.mean()) / (scale if scale > 0 else 1.0)
+
+        self.n = signal.shape[0]
+        self._csum = np.concatenate([[0.0], np.cumsum(signal)])
+        self._csum_sq = np.concatenate([[0.0], np.cumsum(signal ** 2)])
+
+        return self
+
+    def cost(self, start, end):
+        """
+        Sum of squared deviations from the mean of the segment(s) [start, end).
+        """
+
+        seg_sum = self._csum[end] - self._csum[start]
+        seg_sum_sq = self._csum_sq[end] - self._csum_sq[start]
+
+        return seg_sum_sq - seg_sum ** 2 / (end - start)
+
+    def predict(self, pen: float) -> List[int]:
+        """
+        Finds the optimal segmentation for a given penalty.
+
+        Args:
+            pen (float): Penalty added for each change point.
+
+        Returns:
+            List[int]: End of each segment, the last one being the length of the signal.
+        """
+
+        grid = [k for k in range(0, self.n, self.jump) if k >= self.min_size] + [self.n]
+
+        best_cost = np.full(self.n + 1, np.nan)
+        best_cost[0] = -pen
+        last_cp = np.zeros(self.n + 1, dtype=int)
+        admissible = np.array([0])
+
+        for end in grid:
+            eligible = end - admissible >= self.min_size
+            if not eligible.any():
+                admissible = np.append(admissible, end)
+                continue
+
+            candidates = admissible[eligible]
+            cand_costs = best_cost[candidates] + self.cost(candidates, end)
+
+            i_best = np.argmin(cand_costs)
+            best_cost[end] = cand_costs[i_best] + pen
+            last_cp[end] = candidates[i_best]
+
+            # pruning: candidates that cannot be optimal for any later end are dropped
+            keep = ~eligible
+            keep[eligible] = cand_costs <= best_cost[end]
+            admissible = np.append(admissible[keep], end)
+
+        bkps = [self.n]
+        while last_cp[bkps[-1]] > 0:
+            bkps.append(int(last_cp[bkps[-1]]))
+
+        return sorted(bkps)
 
 
 class ChangePointDetection:
     """
     Class for detecting change points in a time series.
 
+    The detector (backend) is chosen according to the length of the series:
+        - 'rbf': PELT with an rbf kernel cost (ruptures). Its cost grows quadratically with the length
+        of the series, so it is used for series up to RBF_MAX_LENGTH observations;
+        - 'l2': PELT with an L2 cost computed from cumulative sums (L2Pelt), for longer series.
+        The minimum segment length is the window size (square root of the length of the series).
+        A piecewise-constant mean would take seasonality for level shifts, so the l2 backend is fitted
+        to the series without its (STL) seasonal component, when the period is known. Its penalty grows
+        with the log of the length of the series (as in BIC), so the number of detected changes does not
+        grow with the length of a stationary series.
+
+    Other detectors can be added to BACKENDS, as functions that take a ChangePointDetection object and
+    return an object with the ruptures interface (fit and predict), with their penalty in PENALTIES.
+
     Attributes:
         series (pd.Series): Time series data.
+        period (Optional[int]): Main period of the series.
         n (int): Length of the time series.
         window_size (float): Window size for change point detection.
-        detector (rpt.Pelt): Change point detection object.
+        backend (str): Name of the detector used.
+        auto_backend (bool): Whether the detector is chosen based on the length of the series (again when
+        the series grows, see update).
+        detector (rpt.Pelt or L2Pelt): Change point detection object, created on the first detection.
         change_points (dict): Dictionary to store detected change points.
     """
 
     PENALTY = 10
+    # penalty of the l2 backend, per log of the length of the signal
+    L2_PENALTY = 3
     METHOD = 'PELT'
+    RBF_MAX_LENGTH = 2000
+
+    BACKENDS = {
+        'rbf': lambda cpd: ChangePointDetection.rbf_pelt(),
+        'l2': lambda cpd: L2Pelt(min_size=max(2, int(cpd.window_size))),
+    }
 
-    def __init__(self, series: pd.Series):
+    PENALTIES = {
+        'rbf': lambda n: ChangePointDetection.PENALTY,
+        'l2': lambda n: ChangePointDetection.L2_PENALTY * np.log(n),
+    }
+
+    def __init__(self, series: pd.Series, backend: str = 'auto', period: Optional[int] = None):
         """
         Initializes the ChangePointDetection with the given time series data.
 
         Args:
             series (pd.Series): Time series data.
+            backend (str, optional): Change point detector, one of BACKENDS or 'auto' (chosen based on
+            the length of the series). Defaults to 'auto'.
+            period (Optional[int], optional): Main period of the series, used to remove its seasonal
+            component before fitting the l2 backend. Defaults to None (the series is fitted as it is).
         """
 
         self.series = series
-        self.n = series.__len__()
+        self.period = period
+        self.n = len(series)
         self.window_size = np.sqrt(self.n)
 
-        self.detector = rpt.Pelt(model="rbf")
+        self.auto_backend = backend == 'auto'
+        if self.auto_backend:
+            backend = self.select_backend(self.n)
+
+        assert backend in self.BACKENDS, UNKNOWN_BACKEND_ERROR.format([*self.BACKENDS, 'auto'])
+
+        self.backend = backend
+        self.detector = None
         self.change_points = {}
 
+    def __getstate__(self):
+        # the fitted detector is not needed after detection (and rpt.Pelt keeps the whole signal)
+        state = self.__dict__.copy()
+        state['detector'] = None
+
+        return state
+
+    @classmethod
+    def select_backend(cls, n: int) -> str:
+        """
+        Chooses the detector for a series of length n (rbf up to RBF_MAX_LENGTH observations, l2 otherwise).
+        """
+
+        return 'rbf' if n <= cls.RBF_MAX_LENGTH else 'l2'
+
+    @staticmethod
+    def rbf_pelt():
+        """
+        PELT with an rbf kernel cost, from ruptures (imported on first use).
+        """
+
+        import ruptures as rpt
+
+        return rpt.Pelt(model="rbf")
+
     def detect_changes(self):
         """
         Detects change points in the time series data using the PELT method.
@@ -41,10 +221,73 @@ class ChangePointDetection:
         The detected change points are stored in the change_points attribute.
         """
 
-        self.detector.fit(self.series.values)
-
-        cp = self.detector.predict(pen=self.PENALTY)
-        cp = [x for x in cp if x != self.n]
+        cp = self._search(self.get_signal())
 
         if len(cp) > 0:
             self.change_points[self.METHOD] = cp
+
+    def update(self, series: pd.Series):
+        """
+        Updates the change points after new observations were appended to the series.
+
+        The segmentation up to the last detected change point is kept, and only the tail of the series
+        (from that change point) is searched. So, the cost depends on the length of the last segment,
+        rather than on the length of the series: only the tail is deseasonalised (see get_signal). Without
+        previous change points, the whole series is searched. If the backend was chosen automatically, it is
+        chosen again for the new length of the series (e.g. a series growing past RBF_MAX_LENGTH is searched
+        with the l2 backend).
+
+        Args:
+            series (pd.Series): Time series data, with the new observations.
+        """
+
+        cp = self.change_points.get(self.METHOD, [])
+        start = cp[-1] if len(cp) > 0 else 0
+
+        self.series = series
+        self.n = len(series)
+        self.window_size = np.sqrt(self.n)
+        if self.auto_backend:
+            self.backend = self.select_backend(self.n)
+        self.detector = None
+
+        cp = cp + [start + x for x in self._search(self.get_signal(start))]
+
+        self.change_points = {self.METHOD: cp} if len(cp) > 0 else {}
+
+    def get_signal(self, start: int = 0) -> np.ndarray:
+        """
+        Gets the signal searched by the detector: the values of the series from start, without their seasonal
+        component for the l2 backend (if the period is known, and that part of the series spans at least two
+        periods).
+
+        Args:
+            start (int, optional): First observation of the signal. Defaults to 0 (the whole series).
+
+        Returns:
+            np.ndarray: Signal.
+        """
+
+        series = self.series.iloc[start:]
+
+        if self.backend != 'l2' or self.period is None or not 1 < self.period <= len(series) // 2:
+            return series.values
+
+        seasonal = DecompositionSTL.fit(series, period=self.period).seasonal
+
+        return series.values - np.asarray(seasonal)
+
+    def _search(self, signal: np.ndarray) -> List[int]:
+        """
+        Runs the detector on a signal, and returns the change points (excluding the end of the signal).
+        """
+
+        if self.detector is None:
+            self.detector = self.BACKENDS[self.backend](self)
+
+        self.detector.fit(signal)
+
+        cp = self.detector.predict(pen=self.PENALTIES[self.backend](len(signal)))
+        cp = [x for x in cp if x != len(signal)]
+
+        return cp
@@ -0,0 +1,173 @@
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+UNKNOWN_ENGINE_ERROR = 'Unknown residual engine. Must be one of {}'
+
+FULL_ID = 'full'
+BEFORE_ID = 'before_{}'
+AFTER_ID = 'after_{}'
+
+
+class ChowTest:
+    """
+    Chow test on the residuals of a time series model, for one or more change points.
+
+    The restricted model is fitted to the full series, and the unrestricted model to the data
+    before and after each change point. Residuals are computed by one of two engines:
+        - 'arima': ARIMA (statsforecast). All samples (full, and before/after each change point) are
+        fitted in a single StatsForecast call;
+        - 'ar': AR(p) model (with d differences, from the ARIMA order) fitted by least squares with NumPy.
+        A cheap approximation of the ARIMA engine.
+
+    The full-sample fit is shared by all change points.
+
+    Attributes:
+        order (Tuple[int, int, int]): ARIMA order (p, d, q). The 'ar' engine uses p and d.
+        engine (str): Residual engine.
+        freq (str): Sampling frequency of the data.
+        season_length (int): Main period of the data.
+        n_params (int): Number of parameters of the model.
+    """
+
+    ENGINES = ['arima', 'ar']
+
+    def __init__(self,
+                 order: Tuple[int, int, int],
+                 freq: str,
+                 season_length: int,
+                 engine: str = 'arima'):
+        """
+        Initializes the ChowTest.
+
+        Args:
+            order (Tuple[int, int, int]): ARIMA order (p, d, q).
+            freq (str): Sampling frequency of the data.
+            season_length (int): Main period of the data.
+            engine (str, optional): Residual engine, 'arima' or 'ar'. Defaults to 'arima'.
+        """
+
+        assert engine in self.ENGINES, UNKNOWN_ENGINE_ERROR.format(self.ENGINES)
+
+        self.order = order
+        self.engine = engine
+        self.freq = freq
+        self.season_length = season_length
+
+        if engine == 'arima':
+            self.n_params = 5  # ARIMA(2,0,2)
+        else:
+            self.n_params = order[0] + 1
+
+    def run(self, df: pd.DataFrame, change_points: List[int]) -> Tuple[List[float], Dict[str, np.ndarray]]:
+        """
+        Runs the Chow test for each change point.
+
+        Args:
+            df (pd.DataFrame): Time series data following a Nixtla-based structure (unique_id, ds, y).
+            change_points (List[int]): Indices of the change points.
+
+        Returns:
+            Tuple[List[float], Dict[str, np.ndarray]]: p-value of the test for each change point, and the
+            residuals of each sample, by sample name (see FULL_ID, BEFORE_ID and AFTER_ID).
+        """
+
+        samples = {FULL_ID: df}
+        for cp in change_points:
+            samples[BEFORE_ID.format(cp)] = df.iloc[:cp]
+            samples[AFTER_ID.format(cp)] = df.iloc[cp:]
+
+        if self.engine == 'arima':
+            residuals = self.get_arima_residuals(samples)
+        else:
+            residuals = {k: self.get_ar_residuals(sample['y'].values) for k, sample in samples.items()}
+
+        p_values = [self.test(residuals[BEFORE_ID.format(cp)],
+                              residuals[AFTER_ID.format(cp)],
+                              residuals[FULL_ID],
+                              n_params=self.n_params)
+                    for cp in change_points]
+
+        return p_values, residuals
+
+    def get_arima_residuals(self, samples: Dict[str, pd.DataFrame]) -> Dict[str, np.ndarray]:
+        """
+        Fits an ARIMA model to each sample, in a single StatsForecast call.
+
+        Args:
+            samples (Dict[str, pd.DataFrame]): Samples by name.
+
+        Returns:
+            dict: In-sample residuals (fitted minus actual values) of each sample.
+        """
+
+        from statsforecast import StatsForecast
+        from statsforecast.models import ARIMA
+
+        data = pd.concat([sample.assign(unique_id=name) for name, sample in samples.items()])
+
+        sf = StatsForecast(models=[ARIMA(self.order, season_length=self.season_length)], freq=self.freq)
+
+        sf.fit(data)
+        sf.forecast(fitted=True, h=1)
+        insample = sf.forecast_fitted_values().reset_index()
+
+        resid = insample['ARIMA'] - insample['y']
+
+        return {name: resid.values[insample['unique_id'].values == name] for name in samples}
+
+    def get_ar_residuals(self, y: np.ndarray) -> np.ndarray:
+        """
+        Fits an AR(p) model with intercept, on the series differenced d times, by least squares.
+
+        Args:
+            y (np.ndarray): Time series.
+
+        Returns:
+            np.ndarray: In-sample residuals (fitted minus actual values).
+        """
+
+        p, d, _ = self.order
+
+        y = np.diff(np.asarray(y, dtype=float), n=d)
+
+        exog = np.column_stack([np.ones(len(y) - p)] + [y[p - i - 1:len(y) - i - 1] for i in range(p)])
+        target = y[p:]
+
+        coefs, *_ = np.linalg.lstsq(exog, target, rcond=None)
+
+        return exog @ coefs - target
+
+    @staticmethod
+    def test(resid1: np.ndarray, resid2: np.ndarray, resid_all: np.ndarray, n_params: int) -> float:
+        """
+        Chow test (F test) comparing the residuals of the separate models with those of the full model.
+
+        Args:
+            resid1 (np.ndarray): Residuals of the model fitted before the change point.
+            resid2 (np.ndarray): Residuals of the model fitted after the change point.
+            resid_all (np.ndarray): Residuals of the model fitted to the full series.
+            n_params (int): Number of parameters of the model.
+
+        Returns:
+            float: p-value of the test.
+        """
+
+        from scipy import stats
+
+        rss1 = np.sum(resid1 ** 2)
+        rss2 = np.sum(resid2 ** 2)
+        rss_r = rss1 + rss2  # Restricted RSS (separate models)
+        rss_ur = np.sum(resid_all ** 2)
+
+        # Calculate degrees of freedom
+        n1, n2 = len(resid1), len(resid2)
+
+        # Calculate F-statistic
+        f_stat = ((rss_ur - rss_r) / n_params) / (rss_r / (n1 + n2 - 2 * n_params))
+
+        # Calculate p-value
+        p_value = 1 - stats.f.cdf(f_stat, n_params, n1 + n2 - 2 * n_params)
+
+        return p_value
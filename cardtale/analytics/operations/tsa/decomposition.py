@@ -1,11 +1,148 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, TYPE_CHECKING
+
 import numpy as np
 import pandas as pd
-from statsmodels.tsa.seasonal import STL
-from statsmodels.stats.diagnostic import acorr_ljungbox#, acorr_breusch_godfrey
+
+if TYPE_CHECKING:
+    from statsmodels.tsa.seasonal import DecomposeResult
+
+STL_CACHE_SIZE = 64
+# number of periods before the previous end of a series whose STL components are fitted again when new
+# observations are appended (beyond the span of the seasonal smoother of STL, 7 cycles by default)
+STL_UPDATE_MARGIN = 8
+
+
+class STLCache:
+    """
+    LRU cache of fitted STL decompositions.
+
+    Decompositions are keyed by the content of the series (values and index), the period,
+    and the STL parameters. So, a decomposition is fitted once, regardless of the caller
+    (e.g. TimeSeriesData setup, or the Wang-Smith-Hyndman test on the main period).
+
+    The cache is thread-safe. When stages run concurrently, a decomposition requested by several
+    of them is fitted by the first one, while the others wait for its result.
+
+    Attributes:
+        maxsize (int): Maximum number of decompositions kept. The least recently used is evicted first.
+        results (OrderedDict): Fitted decompositions by key, from least to most recently used.
+        hits (int): Number of lookups that found a cached decomposition.
+        misses (int): Number of lookups that required fitting a decomposition.
+    """
+
+    def __init__(self, maxsize: int = STL_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.results = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._key_locks: Dict[str, threading.Lock] = {}
+
+    def fit(self, series: pd.Series, period: int, **stl_params) -> 'DecomposeResult':
+        """
+        Gets the STL decomposition of a series, fitting it if not cached.
+
+        Args:
+            series (pd.Series): Time series data.
+            period (int): Period for seasonal decomposition.
+            **stl_params: Additional parameters of statsmodels' STL.
+
+        Returns:
+            DecomposeResult: Fitted decomposition. It is shared with other callers, so it should not be modified.
+        """
+
+        key = self.get_key(series, period, stl_params)
+
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            with self._lock:
+                if key in self.results:
+                    self.hits += 1
+                    self.results.move_to_end(key)
+                    return self.results[key]
+
+                self.misses += 1
+
+            from statsmodels.tsa.seasonal import STL
+
+            ts_decomp = STL(series, period=period, **stl_params).fit()
+
+            with self._lock:
+                self.results[key] = ts_decomp
+                if len(self.results) > self.maxsize:
+                    self.results.popitem(last=False)
+
+                # callers waiting on the key lock find the result in the cache, and later ones need no lock
+                self._key_locks.pop(key, None)
+
+        return ts_decomp
+
+    def info(self) -> Dict[str, int]:
+        """
+        Summarises the usage of the cache.
+
+        Returns:
+            dict: Number of hits, misses, and cached decompositions.
+        """
+
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self.results)}
+
+    def clear(self):
+        """
+        Removes all cached decompositions.
+        """
+
+        with self._lock:
+            self.results.clear()
+
+    @staticmethod
+    def get_key(series: pd.Series, period: int, stl_params: Dict) -> str:
+        """
+        Computes the key of a decomposition.
+
+        Args:
+            series (pd.Series): Time series data.
+            period (int): Period for seasonal decomposition.
+            stl_params (Dict): Additional parameters of statsmodels' STL.
+
+        Returns:
+            str: Decomposition key.
+        """
+
+        key = hashlib.sha1()
+        key.update(pd.util.hash_pandas_object(series, index=True).values.tobytes())
+        key.update(repr((series.dtype.str, series.name, int(period), sorted(stl_params.items()))).encode())
+
+        return key.hexdigest()
+
+
+STL_CACHE = STLCache()
 
 
 class DecompositionSTL:
 
+    @staticmethod
+    def fit(series: pd.Series, period: int, **stl_params) -> 'DecomposeResult':
+        """
+        Fits an STL decomposition, or gets it from the shared cache (STL_CACHE).
+
+        Args:
+            series (pd.Series): Time series data.
+            period (int): Period for seasonal decomposition.
+            **stl_params: Additional parameters of statsmodels' STL.
+
+        Returns:
+            DecomposeResult: Fitted decomposition.
+        """
+
+        return STL_CACHE.fit(series, period, **stl_params)
+
     @staticmethod
     def get_stl_components(series: pd.Series,
                            period: int,
@@ -22,7 +159,7 @@ class DecompositionSTL:
             pd.DataFrame: DataFrame containing the decomposed components.
         """
 
-        ts_decomp = STL(series, period=period).fit()
+        ts_decomp = DecompositionSTL.fit(series, period=period)
 
         components = {
             'Trend': ts_decomp.trend,
@@ -36,6 +173,44 @@ class DecompositionSTL:
 
         return components_df
 
+    @staticmethod
+    def update_stl_components(stl_df: pd.DataFrame,
+                              series: pd.Series,
+                              period: int,
+                              n_new: int) -> pd.DataFrame:
+        """
+        Updates the STL components of a series after new observations were appended to it.
+
+        STL is local (the components at a time step depend on the observations a few periods around it),
+        so only a window at the end of the series is decomposed again: the new observations and the
+        STL_UPDATE_MARGIN periods before and after the previous end. The components before the window (and
+        its first margin, affected by the start of the window) are kept. The window starts a whole number of
+        periods after the start of the series, so its cycle-subseries are those of the series. The cost of
+        the update depends on the number of new observations, not on the length of the series.
+
+        Args:
+            stl_df (pd.DataFrame): STL components of the series before the new observations (see
+            get_stl_components).
+            series (pd.Series): Time series data, with the new observations at the end.
+            period (int): Period for seasonal decomposition.
+            n_new (int): Number of new observations.
+
+        Returns:
+            pd.DataFrame: DataFrame containing the decomposed components of the whole series.
+        """
+
+        margin = STL_UPDATE_MARGIN * period
+        start = (len(series) - n_new - 2 * margin) // period * period
+
+        if stl_df is None or start <= 0:
+            return DecompositionSTL.get_stl_components(series=series, period=period)
+
+        window_df = DecompositionSTL.get_stl_components(series=series.iloc[start:], period=period)
+
+        n_kept = len(series) - n_new - margin
+
+        return pd.concat([stl_df.iloc[:n_kept], window_df.iloc[n_kept - start:]], ignore_index=True)
+
     @staticmethod
     def seasonal_strength(seasonal: pd.Series, residuals: pd.Series):
         assert seasonal.index.equals(residuals.index)
@@ -70,6 +245,8 @@ class DecompositionSTL:
 
     @staticmethod
     def residuals_ljung_box(residuals: pd.Series, n_lags: int):
+        from statsmodels.stats.diagnostic import acorr_ljungbox
+
         lb_test = acorr_ljungbox(residuals, lags=n_lags)
 
         auto_corr_exists = lb_test['lb_pvalue'] < 0.01
@@ -1,8 +1,5 @@
 from typing import List, Union
 
-from scipy.stats import f_oneway, kruskal
-from scipy.stats import levene, bartlett
-
 from cardtale.core.config.analysis import ALPHA
 
 
@@ -26,6 +23,8 @@ class GroupBasedTesting:
     @staticmethod
     def anova_test(group_list: List[Union[float, int]]):
         """Equal means"""
+        from scipy.stats import f_oneway
+
         _, p_value = f_oneway(*group_list)
 
         means_are_eq = p_value > ALPHA
@@ -35,6 +34,8 @@ class GroupBasedTesting:
     @staticmethod
     def kruskal_test(group_list: List[Union[float, int]]):
         """Equal medians, non-parametric"""
+        from scipy.stats import kruskal
+
         _, p_value = kruskal(*group_list)
 
         medians_are_eq = p_value > ALPHA
@@ -44,6 +45,8 @@ class GroupBasedTesting:
     @staticmethod
     def levene_test(group_list: List[Union[float, int]]):
         """Equal vars -> Not Normal, more robust"""
+        from scipy.stats import levene
+
         _, p_value = levene(*group_list)
 
         var_is_eq = p_value > ALPHA
@@ -53,6 +56,8 @@ class GroupBasedTesting:
     @staticmethod
     def bartlett_test(group_list: List[Union[float, int]]):
         """Equal vars -> Normal"""
+        from scipy.stats import bartlett
+
         _, p_value = bartlett(*group_list)
 
         varn_is_eq = p_value > ALPHA
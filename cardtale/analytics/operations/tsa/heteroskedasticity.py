@@ -1,21 +1,26 @@
+from typing import Dict, Tuple
+
+import numpy as np
 import pandas as pd
-import statsmodels.stats.api as sms
-from statsmodels.formula.api import ols
 
 
 class Heteroskedasticity:
     """
     Class for performing heteroskedasticity tests on time series data.
 
+    The time regression (value ~ time) is fitted once, in closed form, and the three tests are
+    derived from its residuals. Series can be tested in batch, as a 2-D array with one
+    (equal-length) series per row, as all of them share the same design matrix.
+
     Methods:
         het_tests(series: pd.Series, test: str) -> float:
             Tests for heteroskedasticity using specified test.
         get_ols_residuals(series: pd.Series) -> pd.Series:
             Gets the residuals from OLS regression.
-        get_ols_model(series: pd.Series) -> ols:
-            Fits an OLS model to the series.
         run_all_tests(series: pd.Series) -> dict:
             Runs all heteroskedasticity tests and returns a dictionary of p-values.
+        run_batch_tests(values: np.ndarray) -> Tuple[pd.DataFrame, np.ndarray]:
+            Runs all heteroskedasticity tests on a batch of series.
     """
 
     TESTS = {
@@ -33,23 +38,14 @@ class Heteroskedasticity:
 
         Args:
             series (pd.Series): Univariate time series.
-            test (str): String denoting the test. One of 'white', 'goldfeldquandt', or 'breuschpagan'.
+            test (str): String denoting the test. One of 'White', 'Goldfeld-Quandt', or 'Breusch-Pagan'.
 
         Returns:
             float: p-value of the test.
         """
         assert test in cls.TEST_NAMES, 'Unknown test'
 
-        mod = cls.get_ols_model(series)
-
-        if test == 'White':
-            _, p_value, _, _ = sms.het_white(mod.resid, mod.model.exog)
-        elif test == 'Goldfeld-Quandt':
-            _, p_value, _ = sms.het_goldfeldquandt(mod.resid, mod.model.exog, alternative='two-sided')
-        else:
-            _, p_value, _, _ = sms.het_breuschpagan(mod.resid, mod.model.exog)
-
-        return p_value
+        return cls.run_all_tests(series)[test]
 
     @classmethod
     def get_ols_residuals(cls, series: pd.Series):
@@ -60,43 +56,153 @@ class Heteroskedasticity:
             series (pd.Series): Univariate time series.
 
         Returns:
-            pd.Series: Residuals from OLS regression.
+            pd.Series: Residuals from OLS regression (of the observed time steps).
         """
 
-        return cls.get_ols_model(series).resid
+        _, resid = cls.run_batch_tests(np.atleast_2d(series.values))
+
+        return pd.Series(resid[0]).dropna()
 
     @classmethod
-    def get_ols_model(cls, series: pd.Series):
+    def run_all_tests(cls, series: pd.Series):
         """
-        Fits an OLS model to the series.
+        Runs all heteroskedasticity tests and returns a dictionary of p-values.
 
         Args:
             series (pd.Series): Univariate time series.
 
         Returns:
-            ols: Fitted OLS model.
+            dict: Dictionary containing p-values of all tests.
         """
 
-        series = series.reset_index(drop=True).reset_index()
-        series.columns = ['time', 'value']
-        series['time'] += 1
+        test_results, _ = cls.run_batch_tests(np.atleast_2d(series.values))
 
-        olsr = ols('value ~ time', series).fit()
+        return test_results.iloc[0].to_dict()
 
-        return olsr
+    @classmethod
+    def run_batch_tests(cls, values: np.ndarray) -> Tuple[pd.DataFrame, np.ndarray]:
+        """
+        Runs all heteroskedasticity tests on a batch of series, with a single time regression fit.
+
+        As in statsmodels, missing values are dropped: a series with missing values is fitted and
+        tested on its observed time steps (keeping their time), on its own.
+
+        Args:
+            values (np.ndarray): Array of shape (n_series, n_obs), with one series per row.
+
+        Returns:
+            Tuple[pd.DataFrame, np.ndarray]: p-values of each test (one row per series), and
+            the residuals of the time regression (same shape as values, missing where values are).
+        """
+
+        values = np.asarray(values, dtype=float)
+
+        exog, resid = cls.fit_time_ols(values)
+
+        test_results = pd.DataFrame(cls.het_tests_on_residuals(resid, exog))
+
+        for i in np.flatnonzero(np.isnan(values).any(axis=1)):
+            observed = ~np.isnan(values[i])
+
+            resid_obs = cls._ols_resid(values[i:i + 1, observed], exog[observed])
+
+            p_values = cls.het_tests_on_residuals(resid_obs, exog[observed])
+            test_results.iloc[i] = [p_values[test][0] for test in test_results.columns]
+            resid[i] = np.nan
+            resid[i, observed] = resid_obs[0]
+
+        return test_results, resid
+
+    @staticmethod
+    def fit_time_ols(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Fits the regression value ~ time (with an intercept, and time starting at 1) to each series.
+
+        Args:
+            values (np.ndarray): Array of shape (n_series, n_obs), with one series per row.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Design matrix of shape (n_obs, 2), and the residuals
+            of each series, with shape (n_series, n_obs).
+        """
+
+        values = np.asarray(values, dtype=float)
+
+        time = np.arange(1, values.shape[1] + 1, dtype=float)
+        exog = np.column_stack([np.ones_like(time), time])
+
+        resid = Heteroskedasticity._ols_resid(values, exog)
+
+        return exog, resid
 
     @classmethod
-    def run_all_tests(cls, series: pd.Series):
+    def het_tests_on_residuals(cls, resid: np.ndarray, exog: np.ndarray) -> Dict[str, np.ndarray]:
         """
-        Runs all heteroskedasticity tests and returns a dictionary of p-values.
+        Computes the p-values of the White, Breusch-Pagan, and (two-sided) Goldfeld-Quandt tests,
+        following statsmodels' het_white, het_breuschpagan and het_goldfeldquandt.
 
         Args:
-            series (pd.Series): Univariate time series.
+            resid (np.ndarray): Residuals of shape (n_series, n_obs).
+            exog (np.ndarray): Design matrix of shape (n_obs, n_vars), including a constant.
 
         Returns:
-            dict: Dictionary containing p-values of all tests.
+            dict: p-values of each test (one value per series), by test name.
+        """
+
+        from scipy import stats
+
+        n_obs, n_vars = exog.shape
+
+        white_lm, white_df, bp_lm = cls._auxiliary_lm_stats(resid, exog)
+
+        split = n_obs // 2
+        df1, df2 = split - n_vars, (n_obs - split) - n_vars
+        mse1 = (cls._ols_resid(resid[:, :split], exog[:split]) ** 2).sum(axis=1) / df1
+        mse2 = (cls._ols_resid(resid[:, split:], exog[split:]) ** 2).sum(axis=1) / df2
+        gq_f = mse2 / mse1
+        gq_pval = 2 * np.minimum(stats.f.cdf(gq_f, df2, df1), stats.f.sf(gq_f, df2, df1))
+
+        p_values = {
+            'White': stats.chi2.sf(white_lm, white_df),
+            'Breusch-Pagan': stats.chi2.sf(bp_lm, n_vars - 1),
+            'Goldfeld-Quandt': gq_pval,
+        }
+
+        return p_values
+
+    @classmethod
+    def _auxiliary_lm_stats(cls, resid: np.ndarray, exog: np.ndarray) -> Tuple[np.ndarray, int, np.ndarray]:
+        """
+        Lagrange multiplier statistics of the White and Breusch-Pagan tests, from the auxiliary regressions
+        of the squared residuals on the cross-products of the regressors (White) and on the regressors (BP).
+
+        Returns:
+            Tuple[np.ndarray, int, np.ndarray]: White statistic of each series, its degrees of freedom,
+            and Breusch-Pagan statistic of each series.
         """
 
-        test_results = {k: cls.het_tests(series, k) for k in cls.TEST_NAMES}
+        n_obs, n_vars = exog.shape
+        resid_sq = resid ** 2
+
+        i0, i1 = np.triu_indices(n_vars)
+        white_exog = exog[:, i0] * exog[:, i1]
+
+        white_lm = n_obs * cls._rsquared(resid_sq, white_exog)
+        white_df = np.linalg.matrix_rank(white_exog) - 1
+
+        bp_lm = n_obs * cls._rsquared(resid_sq, exog)
+
+        return white_lm, white_df, bp_lm
+
+    @staticmethod
+    def _ols_resid(values: np.ndarray, exog: np.ndarray) -> np.ndarray:
+        coefs = np.linalg.pinv(exog) @ values.T
+
+        return values - (exog @ coefs).T
+
+    @staticmethod
+    def _rsquared(values: np.ndarray, exog: np.ndarray) -> np.ndarray:
+        ssr = (Heteroskedasticity._ols_resid(values, exog) ** 2).sum(axis=1)
+        centered_tss = ((values - values.mean(axis=1, keepdims=True)) ** 2).sum(axis=1)
 
-        return test_results
+        return 1 - ssr / centered_tss
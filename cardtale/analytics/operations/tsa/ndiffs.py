@@ -1,12 +1,11 @@
 import warnings
+from typing import Dict, List, Optional
 
+import numpy as np
 import pandas as pd
-from statsmodels.tsa.stattools import kpss, adfuller
-from statsmodels.tsa.api import STL
-from statsmodels.tools.sm_exceptions import InterpolationWarning
-from arch.unitroot import PhillipsPerron
 
-warnings.simplefilter('ignore', InterpolationWarning)
+from cardtale.analytics.operations.tsa.decomposition import DecompositionSTL
+from cardtale.analytics.operations.tsa.unit_root import UnitRootTests
 
 
 class DifferencingTests:
@@ -22,6 +21,8 @@ class DifferencingTests:
             Estimate number of seasonal differences required for seasonal stationarity.
         ndiffs(series: pd.Series, test: str = 'kpss', test_type: str = 'trend') -> int:
             Estimate number of differences required for non-seasonal stationarity.
+        ndiffs_batch(series_list: List[pd.Series], tests: List[str], test_types: List[str]) -> List[Dict]:
+            Estimate number of differences of many series, for several tests and test types.
         _check_stationarity(series: pd.Series, test: str, test_type: str) -> bool:
             Check if series is stationary using specified test.
         _wang_smith_hyndman_test(series: pd.Series, period: int) -> int:
@@ -97,41 +98,104 @@ class DifferencingTests:
         if test_type not in DifferencingTests.TEST_TYPES:
             raise ValueError(f"Unknown test_type. Must be one of {DifferencingTests.TEST_TYPES}")
 
-        max_d = min(2, int(len(series) / 3))  # Maximum number of differences
+        return DifferencingTests._ndiffs(DifferencingTests._DiffCache(series), test, test_type)
+
+    @staticmethod
+    def ndiffs_batch(series_list: List[pd.Series],
+                     tests: Optional[List[str]] = None,
+                     test_types: Optional[List[str]] = None) -> List[Dict]:
+        """
+        Estimate number of differences required for non-seasonal stationarity of many series
+        (e.g. the subgroups of a seasonal period), for several tests and test types.
+
+        The differenced arrays of each series are computed once (and only if needed), and shared
+        across all tests and test types.
+
+        Parameters:
+        -----------
+        series_list : List[pd.Series]
+            Time series data.
+        tests : List[str]
+            Tests to use ('kpss', 'adf', or 'pp'). Defaults to all tests.
+        test_types : List[str]
+            Types of test ('trend' or 'level'). Defaults to both.
+
+        Returns:
+        --------
+        List[Dict] : For each series, the recommended number of differences structured as
+        {test_type: {test_name: ndiffs}}. If a test fails on a series (ValueError, e.g. the series is too
+        short or constant), that test is skipped for the remaining test types of that series.
+        """
+
+        tests = [*DifferencingTests.NDIFF_TESTS] if tests is None else tests
+        test_types = DifferencingTests.TEST_TYPES if test_types is None else test_types
+
+        results = []
+        for series in series_list:
+            diffs = DifferencingTests._DiffCache(series)
+
+            series_results = {test_type: {} for test_type in test_types}
+            for test in tests:
+                try:
+                    for test_type in test_types:
+                        series_results[test_type][DifferencingTests.NDIFF_TESTS[test]] = \
+                            DifferencingTests._ndiffs(diffs, test, test_type)
+                except ValueError:
+                    continue
+
+            results.append(series_results)
+
+        return results
+
+    @staticmethod
+    def _ndiffs(diffs: '_DiffCache', test: str, test_type: str) -> int:
+        max_d = min(2, int(len(diffs) / 3))  # Maximum number of differences
         d = 0
         while d <= max_d:
-            is_stationary = DifferencingTests._check_stationarity(series, test, test_type)
+            is_stationary = DifferencingTests._check_stationarity(diffs[d], test, test_type)
             if is_stationary:
                 return d
 
-            series = series.diff().dropna()
             d += 1
 
         return d
 
+    class _DiffCache:
+        """
+        Differenced arrays of a series, computed on demand (d-th item is the series differenced d times).
+        """
+
+        def __init__(self, series):
+            self.diffs = [np.asarray(series, dtype=float)]
+
+        def __len__(self):
+            return len(self.diffs[0])
+
+        def __getitem__(self, d: int) -> np.ndarray:
+            while len(self.diffs) <= d:
+                self.diffs.append(np.diff(self.diffs[-1]))
+
+            return self.diffs[d]
+
     @staticmethod
-    def _check_stationarity(series: pd.Series, test: str, test_type: str) -> bool:
+    def _check_stationarity(series: np.ndarray, test: str, test_type: str) -> bool:
         """Check if series is stationary using specified test"""
 
+        regression = 'ct' if test_type == 'trend' else 'c'
+
         if test == 'kpss':
-            regression = 'ct' if test_type == 'trend' else 'c'
-            _, p_value, *_ = kpss(series, regression=regression)
-            return p_value > 0.05
+            return UnitRootTests.kpss(series, regression=regression) > 0.05
 
         if test == 'adf':
-            regression = 'ct' if test_type == 'trend' else 'c'
-            _, p_value, *_ = adfuller(series, regression=regression)
-            return p_value < 0.05
+            return UnitRootTests.adf(series, regression=regression) < 0.05
 
-        regression = 'ct' if test_type == 'trend' else 'c'
-        test = PhillipsPerron(y=series, trend=regression)
-        return test.pvalue < 0.05
+        return UnitRootTests.pp(series, regression=regression) < 0.05
 
     @staticmethod
     def _wang_smith_hyndman_test(series: pd.Series, period: int) -> int:
         """Implementation of Wang-Smith-Hyndman seasonal strength test"""
 
-        series_decomp = STL(series, period=period).fit()
+        series_decomp = DecompositionSTL.fit(series, period=period)
 
         # variance of residuals + seasonality
         resid_seas_var = (series_decomp.resid + series_decomp.seasonal).var()
@@ -151,6 +215,11 @@ class DifferencingTests:
         """
         Simplified OCSB test
         """
+        from statsmodels.tsa.stattools import adfuller
+        from statsmodels.tools.sm_exceptions import InterpolationWarning
+
+        warnings.simplefilter('ignore', InterpolationWarning)
+
         # seasonal differences
         seasonal_diff = series.diff(period).dropna()
 
@@ -1,5 +1,4 @@
 import pandas as pd
-from scipy.stats import linregress
 
 from cardtale.core.config.analysis import CORRELATION_TESTS
 
@@ -33,6 +32,8 @@ class TimeLinearModel:
             self: Fitted class object.
         """
 
+        from scipy.stats import linregress
+
         aux_df = pd.DataFrame({'Series': series,
                                'Time': range(len(series))})
 
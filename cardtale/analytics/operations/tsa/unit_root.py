@@ -0,0 +1,262 @@
+import numpy as np
+
+CONSTANT_SERIES_ERROR = 'Invalid input, x is constant'
+SHORT_SERIES_ERROR = 'Sample size is too short to use selected regression component'
+
+KPSS_CRITICAL_VALUES = {
+    'c': [0.347, 0.463, 0.574, 0.739],
+    'ct': [0.119, 0.146, 0.176, 0.216],
+}
+KPSS_P_VALUES = [0.10, 0.05, 0.025, 0.01]
+
+
+class UnitRootTests:
+    """
+    NumPy implementation of the KPSS, Augmented Dickey-Fuller and Phillips-Perron tests.
+
+    The tests follow statsmodels' kpss (nlags='auto') and adfuller (autolag='AIC'), and arch's
+    PhillipsPerron (tau statistic), and return the same p-values. The regressions are solved directly
+    with NumPy, without building model objects, so the tests are cheap enough to run on many
+    (short) series, such as seasonal subgroups.
+
+    Methods:
+        kpss(x: np.ndarray, regression: str) -> float:
+            p-value of the KPSS test (null hypothesis: stationarity).
+        adf(x: np.ndarray, regression: str) -> float:
+            p-value of the ADF test (null hypothesis: unit root).
+        pp(x: np.ndarray, regression: str) -> float:
+            p-value of the Phillips-Perron test (null hypothesis: unit root).
+    """
+
+    @staticmethod
+    def kpss(x: np.ndarray, regression: str = 'c') -> float:
+        """
+        KPSS test, with the number of lags selected with the method of Hobijn et al. (1998).
+
+        Args:
+            x (np.ndarray): Univariate time series.
+            regression (str, optional): 'c' (level stationarity) or 'ct' (trend stationarity). Defaults to 'c'.
+
+        Returns:
+            float: p-value, interpolated from the table of Kwiatkowski et al. (1992).
+        """
+
+        x = np.asarray(x, dtype=float)
+        nobs = x.shape[0]
+
+        if regression == 'ct':
+            _, resids, _ = UnitRootTests._ols(x, UnitRootTests._add_trend(np.arange(1, nobs + 1)[:, None], 'c'))
+        else:
+            resids = x - x.mean()
+
+        covlags = int(np.power(nobs, 2.0 / 9.0))
+        autocov = UnitRootTests._autocov(resids, covlags)
+        s0 = autocov[0] / nobs + np.sum(autocov[1:] / (nobs / 2.0))
+        s1 = np.sum(np.arange(1, covlags + 1) * autocov[1:] / (nobs / 2.0))
+        nlags = int(1.1447 * np.power((s1 / s0) ** 2, 1.0 / 3.0) * np.power(nobs, 1.0 / 3.0))
+        nlags = min(nlags, nobs - 1)
+
+        eta = np.sum(resids.cumsum() ** 2) / (nobs ** 2)
+        s_hat = UnitRootTests._bartlett_lrv(resids, nlags) / nobs
+
+        p_value = np.interp(eta / s_hat, KPSS_CRITICAL_VALUES[regression], KPSS_P_VALUES)
+
+        return p_value
+
+    @staticmethod
+    def adf(x: np.ndarray, regression: str = 'c') -> float:
+        """
+        Augmented Dickey-Fuller test, with the number of lags selected by AIC.
+
+        Args:
+            x (np.ndarray): Univariate time series.
+            regression (str, optional): 'c' (constant) or 'ct' (constant and trend). Defaults to 'c'.
+
+        Returns:
+            float: MacKinnon's approximate p-value.
+        """
+
+        x = np.asarray(x, dtype=float)
+        if x.max() == x.min():
+            raise ValueError(CONSTANT_SERIES_ERROR)
+
+        nobs = x.shape[0]
+        ntrend = len(regression)
+
+        maxlag = int(np.ceil(12.0 * np.power(nobs / 100.0, 1 / 4.0)))
+        maxlag = min(nobs // 2 - ntrend - 1, maxlag)
+        if maxlag < 0:
+            raise ValueError(SHORT_SERIES_ERROR)
+
+        xdiff = np.diff(x)
+
+        xdall, xdshort = UnitRootTests._adf_design(x, xdiff, maxlag)
+        full_rhs = UnitRootTests._add_trend(xdall, regression, prepend=True)
+        startlag = full_rhs.shape[1] - xdall.shape[1] + 1
+
+        bestlag = UnitRootTests._adf_aic_lag(xdshort, full_rhs, startlag, maxlag) - startlag
+
+        xdall, xdshort = UnitRootTests._adf_design(x, xdiff, bestlag)
+        exog = UnitRootTests._add_trend(xdall[:, :bestlag + 1], regression)
+
+        params, _, bse = UnitRootTests._ols(xdshort, exog)
+
+        from statsmodels.tsa.adfvalues import mackinnonp
+
+        adf_stat = params[0] / bse[0]
+
+        return mackinnonp(adf_stat, regression=regression, N=1)
+
+    @staticmethod
+    def pp(x: np.ndarray, regression: str = 'c') -> float:
+        """
+        Phillips-Perron test (tau statistic), with a Newey-West long-run variance.
+
+        Args:
+            x (np.ndarray): Univariate time series.
+            regression (str, optional): 'c' (constant) or 'ct' (constant and trend). Defaults to 'c'.
+
+        Returns:
+            float: MacKinnon's approximate p-value.
+        """
+
+        y = np.asarray(x, dtype=float)
+        nobs = y.shape[0]
+
+        if nobs < 3 + len(regression):
+            raise ValueError(SHORT_SERIES_ERROR)
+
+        lags = int(np.ceil(12.0 * np.power(nobs / 100.0, 1 / 4.0)))
+
+        exog = UnitRootTests._add_trend(y[:-1, None], regression)
+        params, u, bse = UnitRootTests._ols(y[1:], exog)
+
+        n, k = u.shape[0], exog.shape[1]
+        if n < lags:
+            raise ValueError(SHORT_SERIES_ERROR)
+
+        lam2 = UnitRootTests._bartlett_lrv(u, lags) / n
+        lam = np.sqrt(lam2)
+
+        s2 = u @ u / (n - k)
+        s = np.sqrt(s2)
+        gamma0 = s2 * (n - k) / n
+        sigma = bse[0]
+        if sigma <= 0:
+            raise ValueError(CONSTANT_SERIES_ERROR)
+
+        rho = params[0]
+        pp_stat = np.sqrt(gamma0 / lam2) * ((rho - 1) / sigma) - 0.5 * ((lam2 - gamma0) / lam) * (n * sigma / s)
+
+        from arch.unitroot.unitroot import mackinnonp as arch_mackinnonp
+
+        return arch_mackinnonp(pp_stat, regression=regression, dist_type='adf-t')
+
+    @staticmethod
+    def _adf_design(x: np.ndarray, xdiff: np.ndarray, n_lags: int):
+        """
+        Lagged level and lagged differences (as statsmodels' lagmat with trim='both'), and the
+        differences on the left-hand side.
+        """
+
+        nobs = xdiff.shape[0] - n_lags
+
+        xdall = np.column_stack([xdiff[n_lags - i:xdiff.shape[0] - i] for i in range(n_lags + 1)])
+        xdall[:, 0] = x[-nobs - 1:-1]
+
+        return xdall, xdiff[-nobs:]
+
+    @staticmethod
+    def _add_trend(x: np.ndarray, regression: str, prepend: bool = False) -> np.ndarray:
+        """
+        Adds a constant ('c') and a linear trend ('ct') to x. As in statsmodels' add_trend,
+        the constant is skipped if x already has one.
+        """
+
+        trend = np.vander(np.arange(1, x.shape[0] + 1, dtype=float), len(regression))[:, ::-1]
+
+        has_constant = np.any((np.ptp(x, axis=0) == 0) & (x[0] != 0))
+        if has_constant:
+            trend = trend[:, 1:]
+
+        return np.column_stack([trend, x] if prepend else [x, trend])
+
+    @staticmethod
+    def _adf_aic_lag(y: np.ndarray, exog: np.ndarray, startlag: int, maxlag: int) -> int:
+        """
+        Number of columns of exog (from startlag to startlag + maxlag) that minimises the AIC.
+
+        All candidate regressions share the same observations and nested regressors. So, if exog has
+        full rank, the residual sum of squares of every candidate is obtained from a single QR
+        decomposition. Otherwise, each candidate is fitted separately.
+        """
+
+        nobs = y.shape[0]
+        lags = np.arange(startlag, startlag + maxlag + 1)
+
+        if np.linalg.matrix_rank(exog) == exog.shape[1]:
+            q, _ = np.linalg.qr(exog)
+            ssr = y @ y - np.cumsum((q.T @ y) ** 2)[lags - 1]
+            ranks = lags
+        else:
+            fits = [UnitRootTests._ols(y, exog[:, :lag], return_rank=True) for lag in lags]
+            ssr = np.array([resid @ resid for _, resid, rank in fits])
+            ranks = np.array([rank for _, _, rank in fits])
+
+        llf = -nobs / 2 * (np.log(2 * np.pi) + np.log(ssr / nobs) + 1)
+        aic = -2 * llf + 2 * ranks
+
+        return min(zip(aic, lags))[1]
+
+    @staticmethod
+    def _ols(y: np.ndarray, exog: np.ndarray, return_rank: bool = False):
+        """
+        Least squares fit, computed as in statsmodels' OLS (pseudo-inverse), from a single SVD.
+
+        Returns:
+            Tuple: Coefficients, residuals, and either the standard errors of the coefficients
+            or the rank of exog (if return_rank).
+        """
+
+        u, s, vt = np.linalg.svd(exog, full_matrices=False)
+
+        rank = int(np.sum(s > s.max() * max(exog.shape) * np.finfo(s.dtype).eps))
+
+        params = UnitRootTests._pinv_solve(u, s, vt, y)
+        resid = y - exog @ params
+
+        if return_rank:
+            return params, resid, rank
+
+        s_inv = UnitRootTests._inv_singular_values(s)
+        scale = resid @ resid / (exog.shape[0] - rank)
+        bse = np.sqrt(scale * np.sum((vt.T * s_inv) ** 2, axis=1))
+
+        return params, resid, bse
+
+    @staticmethod
+    def _pinv_solve(u, s, vt, y):
+        return vt.T @ (UnitRootTests._inv_singular_values(s) * (u.T @ y))
+
+    @staticmethod
+    def _inv_singular_values(s):
+        large = s > 1e-15 * s.max()
+
+        return np.divide(1, s, where=large, out=np.zeros_like(s))
+
+    @staticmethod
+    def _autocov(resids: np.ndarray, n_lags: int) -> np.ndarray:
+        nobs = resids.shape[0]
+
+        return np.array([resids[i:] @ resids[:nobs - i] for i in range(n_lags + 1)])
+
+    @staticmethod
+    def _bartlett_lrv(resids: np.ndarray, n_lags: int) -> float:
+        """
+        Sum of the autocovariances (not scaled by the number of observations) with Bartlett weights.
+        """
+
+        autocov = UnitRootTests._autocov(resids, n_lags)
+        weights = 1.0 - np.arange(1, n_lags + 1) / (n_lags + 1.0)
+
+        return autocov[0] + 2 * np.sum(weights * autocov[1:])
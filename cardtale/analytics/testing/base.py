@@ -1,51 +1,170 @@
+from typing import Dict, List, Optional
+
 from cardtale.analytics.testing.card.trend import UnivariateTrendTesting
 from cardtale.analytics.testing.card.seasonality import SeasonalityTestingMulti
 from cardtale.analytics.testing.card.variance import VarianceTesting
 from cardtale.analytics.testing.card.change import ChangeTesting
+from cardtale.analytics.testing.scheduler import StageScheduler
+from cardtale.analytics.testing.refresh import RefreshPolicy, CHANGE_STAGES
 from cardtale.core.data import TimeSeriesData
+from cardtale.analytics.operations.landmarking.cache import LandmarkCache
 
+# stages run on every update (see TestingComponents.update); the others are controlled by a RefreshPolicy
+CHEAP_STAGES = [
+    'trend_misc',
+    'seasonality_misc',
+    'seasonality_group_tests',
+    'variance_statistical_tests',
+    'variance_misc',
+    'change_misc',
+]
 
 class TestingComponents:
     """
     This is a class which combines all the tests and experiments.
 
     Attributes:
+        tsd (TimeSeriesData): Time series data object.
         trend (TrendTesting): Trend tests.
         variance (VarianceTesting): Variance tests.
         change (ChangeTesting): Change tests.
         seasonality (SeasonalityTestingMulti): Seasonality tests.
+        landmarks (dict): Precomputed landmark results.
+        landmark_cache (LandmarkCache): Cache of landmark experiment results, shared by all testers.
+        stage_sizes (dict): Length of the series at the last run of each stage.
     """
 
-    def __init__(self, tsd: TimeSeriesData):
+    def __init__(self, tsd: TimeSeriesData, landmarks: Optional[Dict] = None, residual_engine: str = 'arima'):
         """
         Initializes the TestingComponents with the given time series data.
 
         Args:
             tsd (TimeSeriesData): Time series data object.
+            landmarks (Dict, optional): Precomputed landmark results of the series, as structured by
+            PanelLandmarks. If given, the landmark experiments are not run. Defaults to None.
+            residual_engine (str, optional): Engine used to compute the residuals for the Chow test
+            (see ChangeTesting). Defaults to 'arima'.
         """
 
-        self.trend = UnivariateTrendTesting(tsd)
-        self.variance = VarianceTesting(tsd)
-        self.change = ChangeTesting(tsd)
-        self.seasonality = SeasonalityTestingMulti(tsd=tsd)
+        self.tsd = tsd
+        self.landmark_cache = LandmarkCache()
+
+        self.trend = UnivariateTrendTesting(tsd, landmark_cache=self.landmark_cache)
+        self.variance = VarianceTesting(tsd, landmark_cache=self.landmark_cache)
+        self.change = ChangeTesting(tsd, landmark_cache=self.landmark_cache, residual_engine=residual_engine)
+        self.seasonality = SeasonalityTestingMulti(tsd=tsd, landmark_cache=self.landmark_cache)
 
-    def run(self):
+        self.landmarks = {} if landmarks is None else landmarks
+        self.stage_sizes: Dict[str, int] = {}
+
+    def run(self, max_workers: Optional[int] = 1, stages: Optional[List[str]] = None, incremental: bool = False):
         """
         Run all tests
+
+        The tests are organised as stages (statistical tests, landmarks, and misc) of each tester.
+        Stages are independent, except for the change tests: the statistical tests use the
+        trend strength (trend misc), and all change stages need the detected change points (change misc).
+        So, with max_workers > 1, the run time tends to that of the slowest branch.
+
+        Args:
+            max_workers (int, optional): Maximum number of stages run at the same time.
+            If None, the ThreadPoolExecutor default is used. Defaults to 1 (sequential).
+            stages (List[str], optional): Names of the stages to run. The results of the other stages are kept.
+            Defaults to None (all stages).
+            incremental (bool, optional): Whether the stages update the results of a previous run, after new
+            observations were appended (see update). Defaults to False.
+        """
+
+        scheduler = self.get_scheduler(max_workers=max_workers, incremental=incremental)
+        if stages is not None:
+            scheduler = scheduler.select(stages)
+
+        scheduler.run()
+
+        for name in scheduler.stages:
+            self.stage_sizes[name] = self.tsd.df.shape[0]
+
+    def update(self, policy: RefreshPolicy, max_workers: Optional[int] = 1) -> List[str]:
+        """
+        Updates the results after new observations were appended to the series (see TimeSeriesData.append).
+
+        The cheap stages are run (with the change points searched on the tail of the series only, and the
+        group-based tests of seasonality run again). Then, the expensive stages are run if the policy
+        considers them stale. The other results are kept.
+
+        Args:
+            policy (RefreshPolicy): Policy for the expensive stages.
+            max_workers (int, optional): Maximum number of stages run at the same time. Defaults to 1.
+
+        Returns:
+            List[str]: Names of the expensive stages that were run again.
         """
-        self.trend.run_statistical_tests()
-        self.trend.run_landmarks()
-        self.trend.run_misc()
 
-        self.seasonality.run_tests()
-        self.seasonality.run_misc()
+        n = self.tsd.df.shape[0]
+
+        for tester in [self.trend, self.variance, self.change]:
+            tester.update_series()
+
+        stale = policy.stale_stages(self.stage_sizes, n)
+
+        change_points = self.change.get_change_points()[0]
+        if any(stage in stale for stage in CHANGE_STAGES):
+            # the change stages are run again, so the change points are searched on the whole series
+            self.change.detection.change_points = {}
+
+        # the group-based tests are also run by the seasonality tests
+        cheap_stages = [name for name in CHEAP_STAGES if name not in policy.stages
+                        and not (name == 'seasonality_group_tests' and 'seasonality_tests' in stale)]
+        self.run(max_workers=max_workers, stages=cheap_stages, incremental=True)
+
+        change_points_changed = self.change.get_change_points()[0] != change_points
+        stale = policy.stale_stages(self.stage_sizes, n, change_points_changed=change_points_changed)
+
+        if len(stale) > 0:
+            # precomputed landmarks refer to the series before the new observations
+            self.landmarks = {}
+            self.run(max_workers=max_workers, stages=stale, incremental=True)
+
+        return stale
+
+    def get_scheduler(self, max_workers: Optional[int] = 1, incremental: bool = False) -> StageScheduler:
+        """
+        Gets the testing stages and their dependencies.
+
+        Args:
+            max_workers (int, optional): Maximum number of stages run at the same time. Defaults to 1.
+            incremental (bool, optional): Whether the stages update the results of a previous run. If True,
+            the change points are only searched on the tail of the series, and the group-based tests of
+            seasonality are a separate stage. Defaults to False.
+
+        Returns:
+            StageScheduler: Scheduler with all the stages.
+        """
+
+        scheduler = StageScheduler(max_workers=max_workers)
+
+        scheduler.add('trend_statistical_tests', self.trend.run_statistical_tests)
+        scheduler.add('trend_landmarks',
+                      lambda: self.trend.run_landmarks(results=self.landmarks.get('trend')))
+        scheduler.add('trend_misc', self.trend.run_misc)
+
+        scheduler.add('seasonality_tests',
+                      lambda: self.seasonality.run_tests(landmarks=self.landmarks.get('seasonality')))
+        scheduler.add('seasonality_misc', self.seasonality.run_misc)
+        if incremental:
+            scheduler.add('seasonality_group_tests', self.seasonality.run_group_tests)
 
-        self.variance.run_statistical_tests()
-        self.variance.run_landmarks()
-        self.variance.run_misc()
+        scheduler.add('variance_statistical_tests', self.variance.run_statistical_tests)
+        scheduler.add('variance_landmarks',
+                      lambda: self.variance.run_landmarks(results=self.landmarks.get('variance')))
+        scheduler.add('variance_misc', self.variance.run_misc)
 
-        diff_arima = self.trend.trend_strength > 0.3
+        scheduler.add('change_misc', lambda: self.change.run_misc(incremental=incremental))
+        scheduler.add('change_statistical_tests',
+                      lambda: self.change.run_statistical_tests(difference=self.trend.trend_strength > 0.3),
+                      depends_on=['trend_misc', 'change_misc'])
+        scheduler.add('change_landmarks',
+                      lambda: self.change.run_landmarks(results=self.landmarks.get('change')),
+                      depends_on=['change_misc'])
 
-        self.change.run_misc()
-        self.change.run_statistical_tests(difference=diff_arima)
-        self.change.run_landmarks()
+        return scheduler
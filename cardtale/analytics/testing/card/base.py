@@ -1,4 +1,7 @@
+from typing import Optional
+
 from cardtale.core.data import TimeSeriesData
+from cardtale.analytics.operations.landmarking.cache import LandmarkCache
 
 
 class Tester:
@@ -9,12 +12,14 @@ class Tester:
         tsd (TimeSeriesData): Time series data object.
         tests (dict): Test results.
         performance (dict): Performance results.
+        landmark_cache (LandmarkCache): Cache of landmark experiment results.
     """
 
-    def __init__(self, tsd: TimeSeriesData):
+    def __init__(self, tsd: TimeSeriesData, landmark_cache: Optional[LandmarkCache] = None):
         self.tsd = tsd
         self.tests = {}
         self.performance = {}
+        self.landmark_cache = landmark_cache
 
     def run_statistical_tests(self):
         """
@@ -22,7 +27,7 @@ class Tester:
         """
         raise NotImplementedError
 
-    def run_landmarks(self):
+    def run_landmarks(self, **kwargs):
         """
         Running landmark experiments
         """
@@ -44,24 +49,33 @@ class UnivariateTester(Tester):
         series (pd.Series): Target series extracted from the time series data.
     """
 
-    def __init__(self, tsd: TimeSeriesData):
+    def __init__(self, tsd: TimeSeriesData, landmark_cache: Optional[LandmarkCache] = None):
         """
         Initializes the UnivariateTester with the given time series data.
 
         Args:
             tsd (TimeSeriesData): Time series data object.
+            landmark_cache (LandmarkCache, optional): Cache of landmark experiment results. Defaults to None.
         """
 
-        super().__init__(tsd)
+        super().__init__(tsd, landmark_cache=landmark_cache)
+
+        self.series = None
+        self.update_series()
+
+    def update_series(self):
+        """
+        Gets the target series from the time series data (e.g. again, after new observations were appended).
+        """
 
-        self.series = tsd.get_target_series(df=self.tsd.df,
-                                            time_col=self.tsd.time_col,
-                                            target_col=self.tsd.target_col)
+        self.series = self.tsd.get_target_series(df=self.tsd.df,
+                                                 time_col=self.tsd.time_col,
+                                                 target_col=self.tsd.target_col)
 
     def run_statistical_tests(self):
         pass
 
-    def run_landmarks(self):
+    def run_landmarks(self, **kwargs):
         pass
 
     def run_misc(self, **kwargs):
@@ -1,14 +1,13 @@
-import numpy as np
+from typing import Dict, Optional
+
 import pandas as pd
-from scipy import stats
-from statsforecast import StatsForecast
-from statsforecast.models import ARIMA
 
 from cardtale.analytics.operations.tsa.change_points import ChangePointDetection
+from cardtale.analytics.operations.tsa.chow import ChowTest, FULL_ID, BEFORE_ID, AFTER_ID
 from cardtale.analytics.testing.card.base import UnivariateTester
 from cardtale.analytics.operations.landmarking.change import ChangeLandmarks
+from cardtale.analytics.operations.landmarking.cache import LandmarkCache
 from cardtale.core.data import TimeSeriesData
-from cardtale.core.utils.splits import DataSplit
 
 NO_CHANGE_ERROR = 'No change point has been detected'
 
@@ -22,47 +21,93 @@ class ChangeTesting(UnivariateTester):
         detected_change (bool): Flag indicating if a change point was detected.
         method (str): Method used for change point detection.
         detection (ChangePointDetection): Change point detection object.
-        level_increased (bool): Flag indicating if the level increased after the change point.
+        level_increased (bool): Flag indicating if the level increased after the first change point (mean of the
+        series after it, compared with the mean before it).
+        level_increases (list): Flags indicating if the level increased at each change point (mean of the segment
+        that starts at it, compared with the mean of the previous segment).
+        residual_engine (str): Engine used to compute the residuals for the Chow test ('arima' or 'ar').
+        model_order (tuple): Order of the model fitted for the Chow test: (p, d, q) for the ARIMA engine,
+        and (p, d) for the AR engine.
+        chow_p_value (float): p-value of the Chow test for the first change point.
+        chow_p_values (list): p-values of the Chow test for each change point.
     """
 
-    def __init__(self, tsd: TimeSeriesData):
+    def __init__(self,
+                 tsd: TimeSeriesData,
+                 landmark_cache: Optional[LandmarkCache] = None,
+                 residual_engine: str = 'arima'):
         """
         Initializes the ChangeTesting with the given time series data.
 
         Args:
             tsd (TimeSeriesData): Time series data object.
+            landmark_cache (LandmarkCache, optional): Cache of landmark experiment results. Defaults to None.
+            residual_engine (str, optional): Engine used to compute the residuals for the Chow test:
+            'arima' (statsforecast) or 'ar' (least squares AR approximation). Defaults to 'arima'.
         """
 
-        super().__init__(tsd)
+        super().__init__(tsd, landmark_cache=landmark_cache)
 
         self.detected_change = False
         self.method = ChangePointDetection.METHOD
-        self.detection = ChangePointDetection(self.series)
+        self.detection = ChangePointDetection(self.series, period=self.tsd.period)
         self.level_increased = False
+        self.level_increases = []
+        self.residual_engine = residual_engine
         self.chow_p_value = -1
-        self.arima_ord = None
+        self.chow_p_values = []
+        self.model_order = None
         self.resid_df = None
 
-    def run_misc(self, *args, **kwargs):
+    def run_misc(self, incremental: bool = False, **kwargs):
         """
         Detects change points in the time series data.
+
+        Args:
+            incremental (bool, optional): Whether to only search the tail of the series, after new
+            observations were appended (see ChangePointDetection.update). Defaults to False.
         """
 
-        self.detection.detect_changes()
-        if len(self.detection.change_points) > 0:
-            self.detected_change = True
+        if incremental:
+            self.detection.update(self.series)
+        else:
+            self.detection.detect_changes()
+
+        self.detected_change = len(self.detection.change_points) > 0
+        self.level_increased = False
+        self.level_increases = []
+
+        if self.detected_change:
             self.change_significance(self.series)
 
     def run_statistical_tests(self, difference: bool = False):
         if len(self.detection.change_points) > 0:
             self.chow_p_value = self.chow_test_on_resid(difference)
+        else:
+            self.chow_p_value, self.chow_p_values = -1, []
+
+    def run_landmarks(self, results: Optional[Dict] = None, **kwargs):
+        """
+        Runs landmark experiments for change points.
+
+        Args:
+            results (Dict, optional): Precomputed landmark results (e.g. from PanelLandmarks).
+            If given, the experiments are not run. Defaults to None.
+        """
+
+        if results is not None:
+            self.performance = results
+            return
 
-    def run_landmarks(self):
         if len(self.detection.change_points) > 0:
-            change_lm = ChangeLandmarks(self.tsd, self.detection.change_points[self.method][0])
+            change_lm = ChangeLandmarks(self.tsd,
+                                        self.detection.change_points[self.method][0],
+                                        cache=self.landmark_cache)
             change_lm.run()
 
             self.performance = change_lm.results
+        else:
+            self.performance = {}
 
     def get_change_points(self):
         """
@@ -83,88 +128,67 @@ class ChangeTesting(UnivariateTester):
 
     def change_significance(self, series: pd.Series):
         """
-        Determines the significance of the change in the series.
+        Determines the direction of the change in level at the first change point, comparing the mean of the
+        series before and after it, and at each change point, comparing the mean of the segments (between
+        consecutive change points) before and after it.
 
         Args:
             series (pd.Series): Series to analyze for change significance.
-
-        Returns:
-            bool: Flag indicating if there is a significant change in distribution.
         """
 
         cp, _ = self.get_change_points()
 
-        before = series.values[:cp[0]]
-        after = series.values[cp[0]:]
+        bounds = [0] + cp + [len(series)]
 
-        # print(before)
-        # print(after)
+        segments = [series.values[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
 
-        if after.mean() > before.mean():
-            self.level_increased = True
+        self.level_increases = [bool(after.mean() > before.mean()) for before, after in zip(segments[:-1], segments[1:])]
+
+        self.level_increased = bool(series.values[cp[0]:].mean() > series.values[:cp[0]].mean())
 
         # _, change_p_value = stats.ks_2samp(before, after)
         # change_in_dist = change_p_value < ALPHA
 
-    @staticmethod
-    def get_arima_residuals(data: pd.DataFrame,
-                            freq: str,
-                            freq_int: int,
-                            order=(2, 0, 2)):
-        sf = StatsForecast(
-            models=[ARIMA(order, season_length=freq_int)],
-            freq=freq
-        )
-
-        sf.fit(data)
-        sf.forecast(fitted=True, h=1)
-        insample = sf.forecast_fitted_values().set_index('ds')
+    def chow_test_on_resid(self, difference: bool):
+        """
+        Runs the Chow test on the residuals of an ARIMA model (or of its AR approximation, see residual_engine),
+        for every detected change point.
 
-        resid = insample['ARIMA'] - insample['y']
+        Args:
+            difference (bool): Whether the model includes a (non-seasonal) difference.
 
-        return resid.values
+        Returns:
+            float: p-value of the test for the first change point. The p-values of all change points
+            are stored in the chow_p_values attribute.
+        """
 
-    def chow_test_on_resid(self, difference: bool):
         cp, _ = self.get_change_points()
 
         assert len(cp) > 0, NO_CHANGE_ERROR
 
-        before, after = DataSplit.change_partition(self.tsd.df, cp[0], return_data=True)
+        arima_order = (2, 1, 2) if difference else (2, 0, 2)
+
+        # the AR engine fits an AR(p) model to the series differenced d times (see ChowTest)
+        self.model_order = arima_order if self.residual_engine == 'arima' else arima_order[:2]
 
-        self.arima_ord = (2, 1, 2) if difference else (2, 0, 2)
+        chow = ChowTest(order=arima_order,
+                        freq=self.tsd.dt.freq_short,
+                        season_length=self.tsd.period,
+                        engine=self.residual_engine)
 
-        resid_before = self.get_arima_residuals(before, self.tsd.dt.freq_short, self.tsd.period, order=self.arima_ord)
-        resid_after = self.get_arima_residuals(after, self.tsd.dt.freq_short, self.tsd.period, order=self.arima_ord)
-        resid_all = self.get_arima_residuals(self.tsd.df, self.tsd.dt.freq_short, self.tsd.period, order=self.arima_ord)
-        n_params = 5  # ARIMA(2,0,2)
+        df = pd.DataFrame({'unique_id': self.tsd.name,
+                           'ds': self.tsd.df[self.tsd.time_col],
+                           'y': self.tsd.df[self.tsd.target_col]})
 
-        p_val = self._chow_test(resid_before, resid_after, resid_all, n_params=n_params)
+        self.chow_p_values, residuals = chow.run(df, change_points=cp)
 
         resid_d = {
-            'Residuals Before': resid_before,
-            'Residuals After': resid_after,
-            'Full Residuals': resid_all
+            'Residuals Before': residuals[BEFORE_ID.format(cp[0])],
+            'Residuals After': residuals[AFTER_ID.format(cp[0])],
+            'Full Residuals': residuals[FULL_ID]
         }
 
         self.resid_df = pd.DataFrame({k: pd.Series(v) for k, v in resid_d.items()})
         self.resid_df = self.resid_df.melt().rename(columns={'variable': 'Part', 'value': 'Residuals'})
 
-        return p_val
-
-    @staticmethod
-    def _chow_test(resid1: np.ndarray, resid2: np.ndarray, resid_all: np.ndarray, n_params: int):
-        rss1 = np.sum(resid1 ** 2)
-        rss2 = np.sum(resid2 ** 2)
-        rss_r = rss1 + rss2  # Restricted RSS (separate models)
-        rss_ur = np.sum(resid_all ** 2)
-
-        # Calculate degrees of freedom
-        n1, n2 = len(resid1), len(resid2)
-
-        # Calculate F-statistic
-        f_stat = ((rss_ur - rss_r) / n_params) / (rss_r / (n1 + n2 - 2 * n_params))
-
-        # Calculate p-value
-        p_value = 1 - stats.f.cdf(f_stat, n_params, n1 + n2 - 2 * n_params)
-
-        return p_value
+        return self.chow_p_values[0]
@@ -1,4 +1,4 @@
-from typing import Dict
+from typing import Dict, Optional
 
 import numpy as np
 import pandas as pd
@@ -6,6 +6,7 @@ import pandas as pd
 from cardtale.analytics.operations.tsa.ndiffs import DifferencingTests
 from cardtale.analytics.operations.tsa.group_tests import GroupBasedTesting
 from cardtale.analytics.operations.landmarking.seasonality import SeasonalLandmarks
+from cardtale.analytics.operations.landmarking.cache import LandmarkCache
 from cardtale.analytics.testing.card.base import UnivariateTester
 from cardtale.analytics.testing.card.trend import UnivariateTrendTesting
 from cardtale.analytics.operations.tsa.decomposition import DecompositionSTL
@@ -27,16 +28,18 @@ class SeasonalityTesting(UnivariateTester):
 
     def __init__(self,
                  tsd: TimeSeriesData,
-                 period_data: Dict):
+                 period_data: Dict,
+                 landmark_cache: Optional[LandmarkCache] = None):
         """
         Initializes the SeasonalityTesting with the given time series data and period data.
 
         Args:
             tsd (TimeSeriesData): Time series data object.
             period_data (Dict): Dictionary containing period data for seasonality analysis.
+            landmark_cache (LandmarkCache, optional): Cache of landmark experiment results. Defaults to None.
         """
 
-        super().__init__(tsd)
+        super().__init__(tsd, landmark_cache=landmark_cache)
 
         self.period_data = period_data
         self.prob_seasonality = -1
@@ -63,18 +66,28 @@ class SeasonalityTesting(UnivariateTester):
 
         self.prob_seasonality = self.tests.mean()
 
-    def run_landmarks(self):
+    def run_landmarks(self, results: Optional[Dict] = None, **kwargs):
         """
         Runs landmark experiments for seasonality.
 
         Uses the SeasonalLandmarks class to perform landmark analysis.
+
+        Args:
+            results (Dict, optional): Precomputed landmark results (e.g. from PanelLandmarks).
+            If given, the experiments are not run. Defaults to None.
         """
 
+        if results is not None:
+            self.performance = results
+            return
+
         if self.period_data['period'] is None:
             self.performance = {}
             return
 
-        seasonal_lm = SeasonalLandmarks(tsd=self.tsd, target_period=self.period_data['period'])
+        seasonal_lm = SeasonalLandmarks(tsd=self.tsd,
+                                       target_period=self.period_data['period'],
+                                       cache=self.landmark_cache)
         seasonal_lm.run()
 
         self.performance = seasonal_lm.results
@@ -128,17 +141,20 @@ class SeasonalityTestingMulti:
         group_trends (dict): Dictionary of group trends.
         show_plots (dict): Dictionary indicating which plots to show.
         failed_periods (dict): Dictionary of failed periods.
+        landmark_cache (LandmarkCache): Cache of landmark experiment results.
     """
 
-    def __init__(self, tsd: TimeSeriesData):
+    def __init__(self, tsd: TimeSeriesData, landmark_cache: Optional[LandmarkCache] = None):
         """
         Initializes the SeasonalityTestingMulti with the given time series data.
 
         Args:
             tsd (TimeSeriesData): Time series data object.
+            landmark_cache (LandmarkCache, optional): Cache of landmark experiment results. Defaults to None.
         """
 
         self.tsd = tsd
+        self.landmark_cache = landmark_cache
 
         self.period_data_l = PLOTTING_SEAS_CONFIGS[self.tsd.dt.freq_longly.lower()]
 
@@ -154,11 +170,29 @@ class SeasonalityTestingMulti:
 
         self.seasonal_strength = -1
 
-    def run_tests(self):
+    def run_tests(self, landmarks: Optional[Dict] = None):
+        """
+        Runs the seasonality tests for each period.
+
+        Args:
+            landmarks (Dict, optional): Precomputed landmark results by period name (e.g. from PanelLandmarks).
+            Defaults to None.
+        """
+
+        if landmarks is None:
+            landmarks = {}
+
+        self.failed_periods = {
+            'seas_subseries': [],
+            'seas_summary': [],
+        }
+
         for period_data in self.period_data_l:
-            seas_tests = SeasonalityTesting(tsd=self.tsd, period_data=period_data)
+            seas_tests = SeasonalityTesting(tsd=self.tsd,
+                                            period_data=period_data,
+                                            landmark_cache=self.landmark_cache)
             seas_tests.run_statistical_tests()
-            seas_tests.run_landmarks()
+            seas_tests.run_landmarks(results=landmarks.get(period_data['name']))
             seas_tests.run_misc()
             seas_tests.set_show_subseries_plot()
 
@@ -178,6 +212,23 @@ class SeasonalityTestingMulti:
             if not self.tests[period_data['name']].metadata['show_subseries_plot']:
                 self.failed_periods['seas_subseries'].append(period_data['name'])
 
+    def run_group_tests(self):
+        """
+        Runs the group-based tests of each period again (e.g. after new observations were appended),
+        keeping the results of the other tests.
+        """
+
+        self.failed_periods['seas_summary'] = []
+
+        for name, seas_tests in self.tests.items():
+            seas_tests.run_misc()
+
+            if seas_tests.metadata['group_tests']:
+                self.group_vars[name] = seas_tests.group_tests['var_is_eq']
+
+            if not seas_tests.metadata['show_summary_plot']:
+                self.failed_periods['seas_summary'].append(name)
+
     def run_misc(self):
         self.seasonal_strength = DecompositionSTL.seasonal_strength(self.tsd.stl_df['Seasonal'],
                                                                     self.tsd.stl_df['Residuals'])
@@ -195,16 +246,17 @@ class SeasonalityTestingMulti:
 
         data_groups = self.tsd.get_period_groups(grouping_period=period_name)
 
-        within_group_analysis = {}
-        for k, sub_series in data_groups.items():
-            # todo fix hardcoded value
-            if len(sub_series) < 30:
-                prob_level = 0
-            else:
-                _, prob_level = UnivariateTrendTesting.run_tests_on_series(pd.Series(sub_series))
+        # todo fix hardcoded value
+        within_group_analysis = {k: 0 for k, sub_series in data_groups.items() if len(sub_series) < 30}
 
+        tested_groups = {k: pd.Series(sub_series) for k, sub_series in data_groups.items()
+                         if k not in within_group_analysis}
+        probs = UnivariateTrendTesting.run_tests_on_series_batch([*tested_groups.values()])
+        for k, (_, prob_level) in zip(tested_groups, probs):
             within_group_analysis[k] = prob_level
 
+        within_group_analysis = {k: within_group_analysis[k] for k in data_groups}
+
         within_group_analysis_s = pd.Series(within_group_analysis)
 
         return within_group_analysis_s
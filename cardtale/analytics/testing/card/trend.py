@@ -1,8 +1,9 @@
-from typing import Tuple, Dict
+from typing import Tuple, Dict, List, Optional
 
 import pandas as pd
 
 from cardtale.analytics.operations.landmarking.trend import TrendLandmarks
+from cardtale.analytics.operations.landmarking.cache import LandmarkCache
 from cardtale.analytics.testing.card.base import UnivariateTester
 from cardtale.analytics.operations.tsa.ndiffs import DifferencingTests
 from cardtale.analytics.operations.tsa.time_model import TimeLinearModel
@@ -25,14 +26,15 @@ class UnivariateTrendTesting(UnivariateTester):
         time_model (TimeLinearModel): Time linear model for trend analysis.
     """
 
-    def __init__(self, tsd: TimeSeriesData):
+    def __init__(self, tsd: TimeSeriesData, landmark_cache: Optional[LandmarkCache] = None):
         """
         Initializes the UnivariateTrendTesting with the given time series data.
 
         Args:
             tsd (TimeSeriesData): Time series data object.
+            landmark_cache (LandmarkCache, optional): Cache of landmark experiment results. Defaults to None.
         """
-        super().__init__(tsd=tsd)
+        super().__init__(tsd=tsd, landmark_cache=landmark_cache)
 
         self.tests = {TREND_T: pd.Series(dtype=int), LEVEL_T: pd.Series(dtype=int)}
         self.prob_trend = -1
@@ -48,27 +50,30 @@ class UnivariateTrendTesting(UnivariateTester):
         Uses the DifferencingTests class to perform differencing tests.
         """
 
-        for k, name in DifferencingTests.NDIFF_TESTS.items():
-            try:
-                for test_type in [TREND_T, LEVEL_T]:
-                    self.tests[test_type][name] = \
-                        DifferencingTests.ndiffs(series=self.series,
-                                                 test=k,
-                                                 test_type=test_type)
-            except ValueError:
-                continue
+        ndiffs, = DifferencingTests.ndiffs_batch([self.series], test_types=[TREND_T, LEVEL_T])
+
+        for test_type in [TREND_T, LEVEL_T]:
+            self.tests[test_type] = pd.Series(ndiffs[test_type], dtype=int)
 
         self.prob_trend = self.tests[TREND_T].mean()
         self.prob_level = self.tests[LEVEL_T].mean()
 
-    def run_landmarks(self):
+    def run_landmarks(self, results: Optional[Dict] = None, **kwargs):
         """
         Runs landmark experiments for trend.
 
         Uses the TrendLandmarks class to perform landmark analysis.
+
+        Args:
+            results (Dict, optional): Precomputed landmark results (e.g. from PanelLandmarks).
+            If given, the experiments are not run. Defaults to None.
         """
 
-        trend_lm = TrendLandmarks(tsd=self.tsd)
+        if results is not None:
+            self.performance = results
+            return
+
+        trend_lm = TrendLandmarks(tsd=self.tsd, cache=self.landmark_cache)
         trend_lm.run()
 
         self.performance = trend_lm.results
@@ -108,18 +113,26 @@ class UnivariateTrendTesting(UnivariateTester):
             Tuple[float, float]: Probability of trend and probability of level.
         """
 
-        # series = pd.Series([2640,5640, 2160,3600,2640,4680])
+        return UnivariateTrendTesting.run_tests_on_series_batch([series])[0]
 
-        tests = {TREND_T: pd.Series(dtype=int), LEVEL_T: pd.Series(dtype=int)}
+    @staticmethod
+    def run_tests_on_series_batch(series_list: List[pd.Series]) -> List[Tuple[float, float]]:
+        """
+        Runs trend and level tests on many series (e.g. seasonal subgroups) at once.
+
+        Args:
+            series_list (List[pd.Series]): Series to analyze.
+
+        Returns:
+            List[Tuple[float, float]]: Probability of trend and probability of level of each series.
+        """
 
-        for k, name in DifferencingTests.NDIFF_TESTS.items():
-            for test_type in [TREND_T, LEVEL_T]:
-                tests[test_type][name] = DifferencingTests.ndiffs(series=series, test=k, test_type=test_type)
+        ndiffs = DifferencingTests.ndiffs_batch(series_list, test_types=[TREND_T, LEVEL_T])
 
-        prob_trend = tests[TREND_T].mean()
-        prob_level = tests[LEVEL_T].mean()
+        probs = [(pd.Series(tests[TREND_T], dtype=int).mean(), pd.Series(tests[LEVEL_T], dtype=int).mean())
+                 for tests in ndiffs]
 
-        return prob_trend, prob_level
+        return probs
 
 
 class TrendTestsParser:
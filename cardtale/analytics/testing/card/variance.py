@@ -1,8 +1,10 @@
-from typing import Dict, Tuple
+from typing import Dict, Tuple, Optional
 
+import numpy as np
 import pandas as pd
 
 from cardtale.analytics.operations.landmarking.variance import VarianceLandmarks
+from cardtale.analytics.operations.landmarking.cache import LandmarkCache
 from cardtale.analytics.testing.card.base import UnivariateTester
 from cardtale.analytics.operations.tsa.heteroskedasticity import Heteroskedasticity
 from cardtale.core.config.analysis import ALPHA
@@ -20,15 +22,16 @@ class VarianceTesting(UnivariateTester):
         residuals (pd.Series): Residuals from OLS regression.
     """
 
-    def __init__(self, tsd: TimeSeriesData):
+    def __init__(self, tsd: TimeSeriesData, landmark_cache: Optional[LandmarkCache] = None):
         """
         Initializes the VarianceTesting with the given time series data.
 
         Args:
             tsd (TimeSeriesData): Time series data object.
+            landmark_cache (LandmarkCache, optional): Cache of landmark experiment results. Defaults to None.
         """
 
-        super().__init__(tsd)
+        super().__init__(tsd, landmark_cache=landmark_cache)
 
         self.prob_heteroskedastic: float = -1
         self.groups_with_diff_var = []
@@ -38,21 +41,34 @@ class VarianceTesting(UnivariateTester):
         # self.distr_logt = None
 
     def run_statistical_tests(self):
-        self.tests = Heteroskedasticity.run_all_tests(self.series)
-        self.residuals = Heteroskedasticity.get_ols_residuals(self.series)
+        test_results, residuals = Heteroskedasticity.run_batch_tests(np.atleast_2d(self.series.values))
 
-        self.tests = pd.Series(self.tests)
+        self.residuals = pd.Series(residuals[0]).dropna()
+
+        self.tests = test_results.iloc[0]
         self.tests = (self.tests < ALPHA).astype(int)
 
         self.prob_heteroskedastic = self.tests.mean()
 
-    def run_landmarks(self):
-        var_lm = VarianceLandmarks(tsd=self.tsd)
+    def run_landmarks(self, results: Optional[Dict] = None, **kwargs):
+        """
+        Runs landmark experiments for variance.
+
+        Args:
+            results (Dict, optional): Precomputed landmark results (e.g. from PanelLandmarks).
+            If given, the experiments are not run. Defaults to None.
+        """
+
+        if results is not None:
+            self.performance = results
+            return
+
+        var_lm = VarianceLandmarks(tsd=self.tsd, cache=self.landmark_cache)
         var_lm.run()
 
         self.performance = var_lm.results
 
-    def run_misc(self):
+    def run_misc(self, **kwargs):
         """
         Runs miscellaneous experiments for variance.
         """
@@ -0,0 +1,98 @@
+from typing import List, Optional
+
+EXPENSIVE_STAGES = [
+    'trend_statistical_tests',
+    'trend_landmarks',
+    'seasonality_tests',
+    'variance_landmarks',
+    'change_statistical_tests',
+    'change_landmarks',
+]
+
+CHANGE_STAGES = ['change_statistical_tests', 'change_landmarks']
+
+
+class RefreshPolicy:
+    """
+    Policy that controls which testing stages are run again when new observations are appended
+    to a series (see CardsBuilder.append).
+
+    Cheap stages (e.g. time regression, strength metrics, group-based tests, and the change point
+    search on the tail of the series) are always updated. Expensive stages (statistical tests fitting
+    many models, landmark experiments, and the Chow test on ARIMA residuals) keep their results until
+    they are stale: when the observations appended since their last run exceed a fraction of
+    the series length at that time, or a maximum number of points. The change stages are also run again
+    when the detected change points are different.
+
+    Attributes:
+        max_new_fraction (float): Maximum ratio between the new observations and the series length at the
+        last run of a stage.
+        max_new_points (Optional[int]): Maximum number of new observations since the last run of a stage.
+        refresh_on_change (bool): Whether the change stages are run again when the change points are different.
+        stages (List[str]): Names of the expensive stages controlled by the policy.
+    """
+
+    def __init__(self,
+                 max_new_fraction: float = 0.1,
+                 max_new_points: Optional[int] = None,
+                 refresh_on_change: bool = True,
+                 stages: Optional[List[str]] = None):
+        """
+        Initializes the RefreshPolicy.
+
+        Args:
+            max_new_fraction (float, optional): Maximum ratio between the new observations and the
+            series length at the last run of a stage. Defaults to 0.1. 0 runs the stages on every update.
+            max_new_points (Optional[int], optional): Maximum number of new observations since the
+            last run of a stage. Defaults to None (no limit).
+            refresh_on_change (bool, optional): Whether the change stages are run again when the change points
+            are different. Defaults to True.
+            stages (Optional[List[str]], optional): Names of the expensive stages (see TestingComponents.run).
+            Defaults to EXPENSIVE_STAGES.
+        """
+
+        self.max_new_fraction = max_new_fraction
+        self.max_new_points = max_new_points
+        self.refresh_on_change = refresh_on_change
+        self.stages = EXPENSIVE_STAGES if stages is None else stages
+
+    def is_stale(self, n_new: int, n_last: int) -> bool:
+        """
+        Checks if the results of a stage are stale.
+
+        Args:
+            n_new (int): Number of observations appended since the last run of the stage.
+            n_last (int): Length of the series at the last run of the stage.
+
+        Returns:
+            bool: True if the stage should be run again.
+        """
+
+        if n_new == 0:
+            return False
+
+        if self.max_new_points is not None and n_new > self.max_new_points:
+            return True
+
+        return n_new > self.max_new_fraction * n_last
+
+    def stale_stages(self, stage_sizes: dict, n: int, change_points_changed: bool = False) -> List[str]:
+        """
+        Gets the expensive stages that should be run again.
+
+        Args:
+            stage_sizes (dict): Length of the series at the last run of each stage.
+            n (int): Current length of the series.
+            change_points_changed (bool, optional): Whether the detected change points are different
+            from the ones of the last run. Defaults to False.
+
+        Returns:
+            List[str]: Names of the stale stages.
+        """
+
+        stale = [stage for stage in self.stages if self.is_stale(n - stage_sizes[stage], stage_sizes[stage])]
+
+        if change_points_changed and self.refresh_on_change:
+            stale += [stage for stage in CHANGE_STAGES if stage in self.stages and stage not in stale]
+
+        return stale
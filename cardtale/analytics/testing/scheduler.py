@@ -0,0 +1,132 @@
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Callable, Dict, List, Optional
+
+from cardtale.core.tracing import span
+
+UNKNOWN_DEPENDENCY_ERROR = 'Stage {} depends on an unknown stage: {}'
+CYCLIC_DEPENDENCY_ERROR = 'The dependencies between stages are cyclic'
+
+
+class StageScheduler:
+    """
+    Class for running a set of stages (callables) that depend on each other.
+
+    Each stage is run once all of its dependencies are done. Independent stages are run
+    concurrently on a pool of threads. Threads are used (instead of processes) because
+    stages update the state of shared objects (testers), while most of the heavy work (model fitting,
+    statistical tests) is done by compiled code that releases the GIL.
+
+    Each stage is timed as a span of the active tracer, if any (see cardtale.core.tracing). The context
+    of the caller is copied to the threads, so the spans of concurrent stages are nested in the same parent.
+
+    Attributes:
+        max_workers (int): Maximum number of stages run at the same time.
+        If 1, stages are run sequentially in the order they were added.
+        stages (dict): Function of each stage, by stage name.
+        dependencies (dict): Names of the stages each stage depends on, by stage name.
+    """
+
+    def __init__(self, max_workers: Optional[int] = 1):
+        """
+        Initializes the StageScheduler.
+
+        Args:
+            max_workers (int, optional): Maximum number of stages run at the same time.
+            If None, the ThreadPoolExecutor default is used. Defaults to 1 (sequential).
+        """
+
+        self.max_workers = max_workers
+
+        self.stages: Dict[str, Callable] = {}
+        self.dependencies: Dict[str, List[str]] = {}
+
+    def add(self, name: str, func: Callable, depends_on: Optional[List[str]] = None):
+        """
+        Adds a stage.
+
+        Args:
+            name (str): Name of the stage.
+            func (Callable): Function run by the stage (with no arguments).
+            depends_on (List[str], optional): Names of the stages that must be done before this one.
+            Defaults to None.
+        """
+
+        self.stages[name] = func
+        self.dependencies[name] = [] if depends_on is None else depends_on
+
+    def select(self, names: List[str]) -> 'StageScheduler':
+        """
+        Gets a scheduler with a subset of the stages. Dependencies on the other stages are dropped,
+        as their results are assumed to be available (e.g. from a previous run).
+
+        Args:
+            names (List[str]): Names of the stages to keep.
+
+        Returns:
+            StageScheduler: Scheduler with the selected stages, in insertion order.
+        """
+
+        scheduler = StageScheduler(max_workers=self.max_workers)
+        for name, stage in self.stages.items():
+            if name in names:
+                scheduler.add(name, stage, [dep for dep in self.dependencies[name] if dep in names])
+
+        return scheduler
+
+    def run(self):
+        """
+        Runs all stages, respecting their dependencies.
+
+        Exceptions raised by a stage are propagated after running stages are done.
+        """
+
+        for name, deps in self.dependencies.items():
+            for dep in deps:
+                assert dep in self.stages, UNKNOWN_DEPENDENCY_ERROR.format(name, dep)
+
+        if self.max_workers == 1:
+            for name in self.topological_order():
+                self._run_stage(name)
+            return
+
+        done, running = set(), {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while len(done) < len(self.stages):
+                for name in self._ready(done, running.values()):
+                    running[executor.submit(contextvars.copy_context().run, self._run_stage, name)] = name
+
+                assert len(running) > 0, CYCLIC_DEPENDENCY_ERROR
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    future.result()
+                    done.add(running.pop(future))
+
+    def topological_order(self) -> List[str]:
+        """
+        Gets an order in which the stages can be run sequentially.
+
+        Returns:
+            List[str]: Names of the stages, with ties broken by insertion order.
+        """
+
+        order = []
+        while len(order) < len(self.stages):
+            ready = self._ready(set(order), [])
+
+            assert len(ready) > 0, CYCLIC_DEPENDENCY_ERROR
+
+            order.append(ready[0])
+
+        return order
+
+    def _run_stage(self, name: str):
+        with span(name, kind='stage'):
+            self.stages[name]()
+
+    def _ready(self, done, running) -> List[str]:
+        running = set(running)
+
+        return [name for name, deps in self.dependencies.items()
+                if name not in done and name not in running and all(d in done for d in deps)]
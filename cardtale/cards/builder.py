@@ -1,22 +1,42 @@
 import logging
+import pickle
 from datetime import datetime
+from typing import Any, Dict, List, Optional, Union
 
 import pandas as pd
-from jinja2 import Environment, FileSystemLoader
-from weasyprint import HTML
 
 from cardtale.core.data import TimeSeriesData
+from cardtale.core.series import SeriesCore
+from cardtale.core.tracing import Tracer, span, tracing
 from cardtale.cards.cardset.change import ChangePointCard
 from cardtale.cards.cardset.seasonality import SeasonalityCard
 from cardtale.cards.cardset.structural import StructuralCard
 from cardtale.cards.cardset.trend import TrendCard
 from cardtale.cards.cardset.variance import VarianceCard
-from cardtale.cards.config import TEMPLATE_DIR, STRUCTURE_TEMPLATE
+from cardtale.cards.config import STRUCTURE_TEMPLATE
+from cardtale.cards.templating import get_template
+from cardtale.cards.pdf import MatplotlibPdfWriter
+from cardtale.cards.export import ResultsExporter
+from cardtale.cards.fonts import font_face_css, get_font_config, get_font_dir, offline_url_fetcher
 from cardtale.core.config.typing import Period
 from cardtale.analytics.testing.base import TestingComponents
+from cardtale.analytics.testing.refresh import RefreshPolicy
+from cardtale.visuals.plot import PLOT_FORMATS, UNKNOWN_FORMAT_ERROR
+from cardtale.visuals.render import PlotRenderer
+from cardtale.visuals.cache import RenderCache
+from cardtale.visuals.fonts import register_fonts
 
 logging.getLogger('fontTools').setLevel(logging.ERROR)
 
+PDF_BACKENDS = ['weasyprint', 'matplotlib']
+UNKNOWN_PDF_BACKEND_ERROR = f'Unknown PDF backend. Must be one of {PDF_BACKENDS}'
+
+# version of the saved analysis state, bumped when the attributes of the analysis objects change
+STATE_VERSION = 7
+STATE_VERSION_ERROR = 'The state was saved with version {} of the format, expected version {}'
+NOT_ANALYSED_ERROR = 'The cards have not been analysed. Call build_cards first.'
+NO_TRACER_ERROR = 'Tracing is disabled. Pass a Tracer to the CardsBuilder to enable it.'
+
 
 class CardsBuilder:
     """
@@ -26,6 +46,7 @@ class CardsBuilder:
         tsd (TimeSeriesData): Time series data object.
         tests (TestingComponents): Testing components for the time series data.
         cards (dict): Dictionary of card objects for different analyses.
+        tests_were_run (bool): Flag indicating if the tests were run.
         cards_were_analysed (bool): Flag indicating if the cards were analysed.
         cards_to_omit (list): List of cards to omit from the report.
         cards_included (list): List of cards to include in the report.
@@ -33,44 +54,80 @@ class CardsBuilder:
         cards_raw_html (str): Rendered HTML string of the cards.
         cards_html (HTML): HTML object for the cards.
         plot_id (int): ID for the plots.
+        max_workers (int): Maximum number of testing stages run at the same time.
+        n_jobs (int): Number of worker processes used to build and encode the plots.
+        plot_format (str): Image format of the plots ('png' or 'svg').
+        render_cache (Optional[RenderCache]): Disk cache of encoded plot images.
+        offline_fonts (bool): Whether the report is rendered without remote resources (e.g. Google Fonts).
+        font_css (str): Inlined @font-face rules of the bundled fonts (offline mode).
+        tracer (Optional[Tracer]): Tracer of the timing spans of the report pipeline (None if disabled).
     """
 
     def __init__(self,
-                 df: pd.DataFrame,
+                 df: Union[pd.DataFrame, SeriesCore],
                  freq: str,
                  id_col: str = 'unique_id',
                  time_col: str = 'ds',
                  target_col: str = 'y',
-                 period: Period = None):
+                 period: Period = None,
+                 landmarks: Optional[Dict] = None,
+                 max_workers: Optional[int] = 1,
+                 n_jobs: int = 1,
+                 plot_format: str = 'png',
+                 render_cache: Optional[RenderCache] = None,
+                 offline_fonts: bool = False,
+                 font_dir: Optional[str] = None,
+                 tracer: Optional[Tracer] = None,
+                 residual_engine: str = 'arima'):
         """
         Initializes the CardsBuilder with the given data and parameters.
 
         Args:
-            df (pd.DataFrame): DataFrame containing the time series data.
+            df (Union[pd.DataFrame, SeriesCore]): DataFrame containing the time series data, or its
+            compact representation (see SeriesCore).
             freq (str): Frequency of the time series data.
             id_col (str, optional): Column name for unique identifier. Defaults to 'unique_id'.
             time_col (str, optional): Column name for time. Defaults to 'ds'.
             target_col (str, optional): Column name for target variable. Defaults to 'y'.
             period (Period, optional): Period for the time series data. Defaults to None.
+            landmarks (Dict, optional): Precomputed landmark results (e.g. from PanelLandmarks).
+            Defaults to None.
+            max_workers (int, optional): Maximum number of testing stages (e.g. trend landmarks, change point
+            detection) run at the same time by a pool of threads. Defaults to 1 (sequential).
+            n_jobs (int, optional): Number of worker processes used to build and encode the plots.
+            -1 uses all available cores. Defaults to 1 (no pool).
+            plot_format (str, optional): Image format of the plots: 'png' (raster) or 'svg' (vector, sharper,
+            but the report can be larger than with png, e.g. for long series). Defaults to 'png'.
+            render_cache (Optional[RenderCache], optional): Disk cache of encoded plot images, which can be
+            shared by several reports. Plots whose inputs did not change are not built again. Defaults to None.
+            offline_fonts (bool, optional): Whether to render the report without touching the network. The fonts
+            are loaded from font_dir (or the installed fonts), and remote URLs are not fetched. Defaults to False.
+            font_dir (Optional[str], optional): Directory with the font files used in offline mode. Defaults to
+            None, in which case the CARDTALE_FONTS_DIR environment variable is used, if set.
+            tracer (Optional[Tracer], optional): Tracer that times the steps of the pipeline (setup of the series,
+            testing stages, landmark configurations, plots, Jinja render, and PDF write). Defaults to None
+            (no tracing).
+            residual_engine (str, optional): Engine used to compute the residuals for the Chow test at the change
+            points: 'arima' (statsforecast) or 'ar' (least squares AR approximation, faster). Defaults to 'arima'.
         """
 
-        self.tsd = TimeSeriesData(df=df.copy(),
-                                  freq=freq,
-                                  id_col=id_col,
-                                  time_col=time_col,
-                                  target_col=target_col,
-                                  period=period)
+        assert plot_format in PLOT_FORMATS, UNKNOWN_FORMAT_ERROR
 
-        self.tests = TestingComponents(self.tsd)
+        self.tracer = tracer
 
-        self.cards = {
-            'structural': StructuralCard(tsd=self.tsd, tests=self.tests),
-            'trend': TrendCard(tsd=self.tsd, tests=self.tests),
-            'seasonality': SeasonalityCard(tsd=self.tsd, tests=self.tests),
-            'variance': VarianceCard(tsd=self.tsd, tests=self.tests),
-            'change': ChangePointCard(tsd=self.tsd, tests=self.tests),
-        }
+        with tracing(self.tracer):
+            self.tsd = TimeSeriesData(df=df,
+                                      freq=freq,
+                                      id_col=id_col,
+                                      time_col=time_col,
+                                      target_col=target_col,
+                                      period=period)
+
+        self.tests = TestingComponents(self.tsd, landmarks=landmarks, residual_engine=residual_engine)
 
+        self.cards = self.create_cards()
+
+        self.tests_were_run = False
         self.cards_were_analysed = False
         self.cards_to_omit = []
         self.cards_included = []
@@ -79,6 +136,17 @@ class CardsBuilder:
         self.cards_html = None
 
         self.plot_id = -1
+        self.max_workers = max_workers
+        self.n_jobs = n_jobs
+        self.plot_format = plot_format
+        self.render_cache = render_cache
+        self.offline_fonts = offline_fonts
+        self.font_css = ''
+
+        if offline_fonts:
+            self.font_css = font_face_css(font_dir)
+            if get_font_dir(font_dir) is not None:
+                register_fonts(get_font_dir(font_dir))
 
     def build_cards(self, render_html: bool = True):
         """
@@ -88,22 +156,83 @@ class CardsBuilder:
             render_html (bool, optional): Flag to render the cards to HTML. Defaults to True.
         """
 
-        self.tests.run()
+        with tracing(self.tracer), span('build_cards'):
+            if not self.tests_were_run:
+                with span('tests'):
+                    self.tests.run(max_workers=self.max_workers)
+                self.tests_were_run = True
 
-        if not self.cards_were_analysed:
+            if not self.cards_were_analysed:
 
-            for _, card in self.cards.items():
-                card.analyse()
+                for name, card in self.cards.items():
+                    with span('analyse_card', card=name):
+                        card.analyse()
 
-                if not card.show_content:
-                    self.cards_to_omit.append(card.toc_content)
-                else:
-                    self.cards_included.append(card.toc_content)
+                    if not card.show_content:
+                        self.cards_to_omit.append(card.toc_content)
+                    else:
+                        self.cards_included.append(card.toc_content)
+
+                self.cards_were_analysed = True
+
+            if render_html:
+                self.render_doc_html()
+
+    def create_cards(self) -> Dict:
+        """
+        Creates the cards of the report, from the time series data and the testing components.
+
+        Returns:
+            dict: Card objects by analysis.
+        """
+
+        return {
+            'structural': StructuralCard(tsd=self.tsd, tests=self.tests),
+            'trend': TrendCard(tsd=self.tsd, tests=self.tests),
+            'seasonality': SeasonalityCard(tsd=self.tsd, tests=self.tests),
+            'variance': VarianceCard(tsd=self.tsd, tests=self.tests),
+            'change': ChangePointCard(tsd=self.tsd, tests=self.tests),
+        }
+
+    def append(self,
+               df: pd.DataFrame,
+               policy: Optional[RefreshPolicy] = None,
+               render_html: bool = True) -> List[str]:
+        """
+        Appends new observations to the series, and updates the analysis.
 
-            self.cards_were_analysed = True
+        The time features are extended with the new time steps, and the cheap stages (e.g. strength
+        metrics, group-based tests, and the change point search on the tail of the series) are run
+        again. The expensive stages (statistical tests, landmark experiments, and the Chow test) keep
+        their results until the policy considers them stale. Then, the cards are analysed again.
+
+        Args:
+            df (pd.DataFrame): New observations, with the same columns as the series, after its last time step.
+            policy (Optional[RefreshPolicy], optional): Policy for the expensive stages. Defaults to None
+            (RefreshPolicy with the default parameters).
+            render_html (bool, optional): Flag to render the cards to HTML. Defaults to True.
+
+        Returns:
+            List[str]: Names of the expensive stages that were run again.
+        """
 
-        if render_html:
-            self.render_doc_html()
+        if not self.tests_were_run:
+            self.build_cards(render_html=False)
+
+        with tracing(self.tracer), span('append', n_new=df.shape[0]):
+            self.tsd.append(df)
+
+            with span('tests_update'):
+                stale = self.tests.update(policy=RefreshPolicy() if policy is None else policy,
+                                          max_workers=self.max_workers)
+
+            self.cards = self.create_cards()
+            self.cards_were_analysed = False
+            self.cards_to_omit, self.cards_included = [], []
+
+            self.build_cards(render_html=render_html)
+
+        return stale
 
     def render_doc_html(self):
         """
@@ -113,43 +242,162 @@ class CardsBuilder:
             HTML: HTML object for the rendered document.
         """
 
-        self.plot_id = 1
+        with tracing(self.tracer), span('render_html'):
+            self.plot_id = 1
 
-        self.cards_raw_str = ''
-        for _, card in self.cards.items():
-            card.build_plots()
-            for plt in card.plots:
-                card.plots[plt].format_caption(self.plot_id)
-                self.plot_id += 1
+            plots = [plot for card in self.cards.values() for plot in card.get_plots_to_build()]
+            with span('plots', n_plots=len(plots), n_jobs=self.n_jobs):
+                PlotRenderer.render(plots,
+                                    n_jobs=self.n_jobs,
+                                    plot_format=self.plot_format,
+                                    cache=self.render_cache)
 
-            card.build_report_section()
+            self.cards_raw_str = ''
+            for _, card in self.cards.items():
+                for plt in card.plots:
+                    card.plots[plt].format_caption(self.plot_id)
+                    self.plot_id += 1
+
+                card.build_report_section()
 
-            self.cards_raw_str += card.content_html
+                self.cards_raw_str += card.content_html
 
-        self._render_html_jinja()
+            with span('jinja_render'):
+                self._render_html_jinja()
 
-        self.cards_html = HTML(string=self.cards_raw_html)
+            from weasyprint import HTML
+
+            with span('html_document'):
+                if self.offline_fonts:
+                    self.cards_html = HTML(string=self.cards_raw_html, url_fetcher=offline_url_fetcher)
+                else:
+                    self.cards_html = HTML(string=self.cards_raw_html)
 
         return self.cards_html
 
-    def get_pdf(self, path: str = 'EXAMPLE_OUTPUT.pdf'):
+    def get_pdf(self, path: str = 'EXAMPLE_OUTPUT.pdf', backend: str = 'weasyprint'):
         """
-        Generates a PDF from the rendered HTML.
+        Generates a PDF of the report.
 
         Args:
             path (str, optional): Path to save the PDF. Defaults to 'EXAMPLE_OUTPUT.pdf'.
+            backend (str, optional): 'weasyprint' lays out the rendered HTML (render_doc_html must be called
+            first). 'matplotlib' writes the card sections and the plots (as vector graphics) directly with
+            PdfPages, skipping the HTML layout. Defaults to 'weasyprint'.
         """
 
-        self.cards_html.write_pdf(path)
+        assert backend in PDF_BACKENDS, UNKNOWN_PDF_BACKEND_ERROR
+
+        with tracing(self.tracer), span('write_pdf', backend=backend):
+            if backend == 'matplotlib':
+                MatplotlibPdfWriter(self).write(path)
+            else:
+                self.cards_html.write_pdf(path, font_config=get_font_config())
+
+    def timing_report(self) -> pd.DataFrame:
+        """
+        Gets the timing of the steps of the report pipeline, recorded by the tracer.
+
+        The spans themselves (with their nesting, attributes, and optional cProfile statistics) are given
+        by tracer.records().
+
+        Returns:
+            pd.DataFrame: Number of spans, and their total, mean, and maximum duration (in seconds), by name
+            (see Tracer.summary).
+        """
+
+        assert self.tracer is not None, NO_TRACER_ERROR
+
+        return self.tracer.summary()
+
+    def __getstate__(self):
+        # the rendered report (HTML and WeasyPrint document) is created again by render_doc_html,
+        # and the render cache is specific to the machine (see load)
+        state = self.__dict__.copy()
+        state['cards_raw_str'] = ''
+        state['cards_raw_html'] = None
+        state['cards_html'] = None
+        state['render_cache'] = None
+
+        return state
+
+    def save(self, path: str):
+        """
+        Saves the analysed state (data, test results, landmark scores, and analysed cards) to a file,
+        so that the report can be rendered later (e.g. on another machine, or after changing the
+        templates) without running the tests again.
+
+        The state is pickled, with the numpy and pandas data stored as binary arrays. The plots are
+        stored unbuilt and without their images (see Plot.__getstate__), and the fitted change
+        point detector is not stored.
+
+        Args:
+            path (str): Path of the state file.
+        """
+
+        assert self.cards_were_analysed, NOT_ANALYSED_ERROR
+
+        with open(path, 'wb') as f:
+            pickle.dump({'version': STATE_VERSION, 'builder': self}, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path: str, render_cache: Optional[RenderCache] = None) -> 'CardsBuilder':
+        """
+        Loads an analysed state saved with save. The report can then be rendered with render_doc_html
+        and get_pdf, without running the tests.
+
+        Only load files from trusted sources, as unpickling can run arbitrary code.
+
+        Args:
+            path (str): Path of the state file.
+            render_cache (Optional[RenderCache], optional): Disk cache of encoded plot images used by the
+            loaded builder. Defaults to None.
+
+        Returns:
+            CardsBuilder: Builder with the analysed cards.
+        """
+
+        with open(path, 'rb') as f:
+            state = pickle.load(f)
+
+        assert state['version'] == STATE_VERSION, STATE_VERSION_ERROR.format(state['version'], STATE_VERSION)
+
+        builder = state['builder']
+        builder.render_cache = render_cache
+
+        return builder
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Gets the results of the analysis (tests, strength metrics, landmark scores, change points, and
+        summary statistics) as a JSON-serializable dict. The cards are analysed if needed, but no plot is built.
+
+        Returns:
+            Dict[str, Any]: Results by section (see ResultsExporter).
+        """
+
+        if not self.cards_were_analysed:
+            self.build_cards(render_html=False)
+
+        return ResultsExporter.to_dict(self)
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """
+        Gets the results of the analysis as long-format records, with the columns
+        unique_id, section, metric, value, and text (see ResultsExporter.to_records).
+
+        Returns:
+            List[Dict[str, Any]]: One record per result.
+        """
+
+        return ResultsExporter.to_records(self.to_dict())
 
     def _render_html_jinja(self):
         """
         Renders the HTML content using Jinja2 templates.
         """
 
-        env = Environment(loader=FileSystemLoader(str(TEMPLATE_DIR)))
-
-        template = env.get_template(STRUCTURE_TEMPLATE)
+        template = get_template(STRUCTURE_TEMPLATE)
 
         current_time = datetime.now().strftime("%Y-%m-%d %H:%M")
 
@@ -160,4 +408,6 @@ class CardsBuilder:
                                               show_omitted=show_omitted,
                                               card_content=self.cards_raw_str,
                                               generation_date=current_time,
-                                              series_name=self.tsd.name)
+                                              series_name=self.tsd.name,
+                                              offline_fonts=self.offline_fonts,
+                                              font_css=self.font_css)
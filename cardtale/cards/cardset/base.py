@@ -1,9 +1,11 @@
-from jinja2 import Environment, FileSystemLoader
+from typing import List
 
 from cardtale.core.data import TimeSeriesData
+from cardtale.visuals.plot import Plot
 from cardtale.analytics.testing.base import TestingComponents
 from cardtale.cards.strings import gettext
-from cardtale.cards.config import TEMPLATE_DIR, CARD_HTML
+from cardtale.cards.config import CARD_HTML
+from cardtale.cards.templating import get_template
 
 
 class Card:
@@ -41,6 +43,13 @@ class Card:
         self.content_html = None
         self.content_pdf = None
 
+    def __getstate__(self):
+        # the rendered section (with the encoded images) is created again by build_report_section
+        state = self.__dict__.copy()
+        state['content_html'] = None
+
+        return state
+
     def analyse(self):
         """
         Analyse the Plot objects of the component.
@@ -74,27 +83,27 @@ class Card:
                 'message': gettext(self.metadata['section_toc_failure'])
             }
 
-    def build_plots(self):
+    def get_plots_to_build(self) -> List[Plot]:
         """
-        Builds the plots of the component.
+        Gets the plots of the component that need to be built (after the analysis).
+
+        Returns:
+            List[Plot]: Plots to build and save.
         """
 
-        if self.show_content:
-            assert len(self.plots) > 0, 'No plots to create'
+        if not self.show_content:
+            return []
+
+        assert len(self.plots) > 0, 'No plots to create'
 
-            for k in self.plots:
-                if self.plots[k].show_me:
-                    self.plots[k].build()
-                    self.plots[k].save()
+        return [self.plots[k] for k in self.plots if self.plots[k].show_me]
 
     def build_report_section(self):
         """
         Builds the report section for the card.
         """
 
-        env = Environment(loader=FileSystemLoader(TEMPLATE_DIR))
-
-        template_html = env.get_template(CARD_HTML)
+        template_html = get_template(CARD_HTML)
 
         img_data = [self.plots[k].img_data for k in self.plots]
 
@@ -1,4 +1,7 @@
+from typing import List
+
 from cardtale.cards.cardset.base import Card
+from cardtale.visuals.plot import Plot
 from cardtale.core.data import TimeSeriesData
 from cardtale.analytics.testing.base import TestingComponents
 from cardtale.visuals.plots.seas_meta import SeasonalMetaPlots
@@ -50,13 +53,22 @@ class SeasonalityCard(Card):
         if self.tsd.dt.freq_longly == 'Yearly':
             self.show_content = False
 
-    def build_plots(self):
+    def get_plots_to_build(self) -> List[Plot]:
         """
-        Builds the plots for seasonality analysis.
+        Gets the plots for seasonality analysis.
+
+        Creates a SeasonalMetaPlots object, which selects the plots for the frequency of the data
+        and analyses them.
 
-        Creates a SeasonalMetaPlots object and generates the plots.
+        Returns:
+            List[Plot]: Plots to build and save.
         """
 
+        if not self.show_content:
+            return []
+
         self.meta_plot = SeasonalMetaPlots(tsd=self.tsd, tests=self.tests)
 
-        self.plots = self.meta_plot.make_plots()
+        self.plots = self.meta_plot.make_plots(build=False)
+
+        return [*self.plots.values()]
@@ -0,0 +1,235 @@
+import math
+from datetime import datetime
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+
+# version of the layout of the exported results, bumped when keys are renamed or removed
+SCHEMA_VERSION = 1
+
+RECORD_COLUMNS = ['unique_id', 'section', 'metric', 'value', 'text']
+SECTIONS = ['summary', 'trend', 'seasonality', 'variance', 'change', 'cards']
+
+NOT_ANALYSED_ERROR = 'The tests have not been run. Call build_cards first.'
+
+
+class ResultsExporter:
+    """
+    Exports the results of the analysis of a series (tests, strength metrics, landmark scores,
+    change points, and summary statistics) as plain Python objects, without building any plot.
+
+    to_dict gives a nested dict (JSON-serializable), with a fixed layout by section
+    (see SECTIONS). to_records flattens it into long-format records with the columns in
+    RECORD_COLUMNS, which stay the same for every series and frequency, so the records of many
+    series can be stacked in a single table (e.g. a Parquet file, see PanelCardsBuilder.export_results).
+    """
+
+    @classmethod
+    def to_dict(cls, builder) -> Dict[str, Any]:
+        """
+        Collects the results of an analysed series.
+
+        Args:
+            builder (CardsBuilder): Builder whose cards were analysed (see CardsBuilder.build_cards).
+
+        Returns:
+            Dict[str, Any]: Results by section, with native Python values.
+        """
+
+        assert builder.cards_were_analysed, NOT_ANALYSED_ERROR
+
+        tsd, tests = builder.tsd, builder.tests
+
+        results = {
+            'schema_version': SCHEMA_VERSION,
+            'unique_id': tsd.name,
+            'freq': tsd.dt.freq_short,
+            'period': tsd.period,
+            'summary': cls.summary(tsd),
+            'trend': cls.trend(tests.trend),
+            'seasonality': cls.seasonality(tests.seasonality),
+            'variance': cls.variance(tests.variance),
+            'change': cls.change(tests.change),
+            'cards': {name: card.show_content for name, card in builder.cards.items()},
+        }
+
+        return cls._to_native(results)
+
+    @classmethod
+    def to_records(cls, results: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Flattens the results of a series into long-format records.
+
+        Each record has the series identifier, the section (e.g. 'trend'), the metric as a dotted
+        path within the section (e.g. 'landmarks.first_differences' or 'periods.Yearly.prob_seasonality'),
+        and the value: numbers and booleans go in 'value' (as float), and strings and dates go in 'text'.
+
+        Args:
+            results (Dict[str, Any]): Results of a series, as given by to_dict.
+
+        Returns:
+            List[Dict[str, Any]]: Records with the columns in RECORD_COLUMNS.
+        """
+
+        records = []
+        for section in SECTIONS:
+            for metric, value in cls._flatten(results[section]):
+                is_number = isinstance(value, (bool, int, float)) or value is None
+
+                records.append({
+                    'unique_id': results['unique_id'],
+                    'section': section,
+                    'metric': metric,
+                    'value': float('nan') if value is None or not is_number else float(value),
+                    'text': None if is_number else str(value),
+                })
+
+        return records
+
+    @staticmethod
+    def summary(tsd) -> Dict[str, Any]:
+        """
+        Summary statistics, growth analysis, and auto-correlation of a series.
+        """
+
+        profile = tsd.summary
+        time_index = tsd.df[tsd.time_col]
+
+        acf_analysis = profile.acf.acf_analysis
+
+        return {
+            'n': profile.n,
+            'start': time_index.iloc[0],
+            'end': time_index.iloc[-1],
+            'is_integer_valued': tsd.is_integer_valued,
+            'stats': profile.stats,
+            'kurtosis_like_normal': profile.kurtosis_like_normal,
+            'skewness_like_normal': profile.skewness_like_normal,
+            'growth': profile.growth,
+            'acf': {
+                'significance_thr': profile.acf.significance_thr,
+                'n_significant_lags': len(acf_analysis.get('significant_ids', [])),
+                'seasonal_lags': acf_analysis.get('seasonal_lags', pd.Series(dtype=float)).to_dict(),
+            },
+            'residuals': {k: v for k, v in tsd.stl_resid_str.items() if k != 'auto_corr_exists'},
+        }
+
+    @staticmethod
+    def trend(tester) -> Dict[str, Any]:
+        """
+        Unit root tests, trend strength, time regression, and landmark scores.
+        """
+
+        time_model = tester.time_model
+
+        return {
+            'tests': {test_type: tests.to_dict() for test_type, tests in tester.tests.items()},
+            'prob_trend': tester.prob_trend,
+            'prob_level': tester.prob_level,
+            'strength': tester.trend_strength,
+            'time_model': {
+                'slope': time_model.model.slope,
+                'intercept': time_model.model.intercept,
+                'r_value': time_model.model.rvalue,
+                'p_value': time_model.model.pvalue,
+                'correlation': time_model.time_corr,
+                'correlation_avg': time_model.time_corr_avg,
+                'side': time_model.side,
+            },
+            'landmarks': tester.performance,
+        }
+
+    @staticmethod
+    def seasonality(tester) -> Dict[str, Any]:
+        """
+        Seasonal strength, and the tests and landmark scores of each seasonal period.
+        """
+
+        periods = {}
+        for name, period_tests in tester.tests.items():
+            periods[name] = {
+                'period': period_tests.period_data['period'],
+                'tests': period_tests.tests.to_dict(),
+                'prob_seasonality': period_tests.prob_seasonality,
+                'group_tests': period_tests.group_tests,
+                'landmarks': period_tests.performance,
+            }
+
+            if name in tester.group_trends:
+                periods[name]['group_trends'] = tester.group_trends[name].to_dict()
+
+        return {
+            'strength': tester.seasonal_strength,
+            'periods': periods,
+        }
+
+    @staticmethod
+    def variance(tester) -> Dict[str, Any]:
+        """
+        Heteroskedasticity tests and landmark scores.
+        """
+
+        return {
+            'tests': tester.tests.to_dict(),
+            'prob_heteroskedastic': tester.prob_heteroskedastic,
+            'landmarks': tester.performance,
+        }
+
+    @staticmethod
+    def change(tester) -> Dict[str, Any]:
+        """
+        Detected change points, with the p-value of the Chow test and the direction of the change in level
+        at each one, and landmark scores.
+        """
+
+        cp, cp_timestep = tester.get_change_points()
+
+        p_values = tester.chow_p_values if len(tester.chow_p_values) == len(cp) else [None] * len(cp)
+        increases = tester.level_increases if len(tester.level_increases) == len(cp) else [None] * len(cp)
+
+        return {
+            'method': tester.method,
+            'detected': tester.detected_change,
+            'n_change_points': len(cp),
+            'change_points': [{'index': index, 'ds': timestep, 'chow_p_value': p_value, 'level_increased': increased}
+                              for index, timestep, p_value, increased in zip(cp, cp_timestep, p_values, increases)],
+            'level_increased': tester.level_increased,
+            'landmarks': tester.performance,
+        }
+
+    @classmethod
+    def _flatten(cls, obj: Any, prefix: str = ''):
+        """
+        Yields the (dotted path, value) pairs of the leaves of nested dicts and lists.
+        """
+
+        if isinstance(obj, dict):
+            items = obj.items()
+        elif isinstance(obj, list):
+            items = enumerate(obj)
+        else:
+            yield prefix, obj
+            return
+
+        for key, value in items:
+            yield from cls._flatten(value, f'{prefix}.{key}' if prefix else str(key))
+
+    @classmethod
+    def _to_native(cls, obj: Any) -> Any:
+        """
+        Converts numpy and pandas values to native Python types (dates to ISO strings, missing values to None).
+        """
+
+        if isinstance(obj, dict):
+            return {str(k): cls._to_native(v) for k, v in obj.items()}
+        if isinstance(obj, (list, tuple, np.ndarray, pd.Series)):
+            return [cls._to_native(v) for v in list(obj)]
+        if isinstance(obj, (pd.Timestamp, datetime)):
+            return obj.isoformat()
+        if isinstance(obj, np.generic):
+            obj = obj.item()
+        if isinstance(obj, float) and math.isnan(obj):
+            return None
+
+        return obj
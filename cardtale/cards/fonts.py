@@ -0,0 +1,120 @@
+import functools
+import os
+from pathlib import Path
+from typing import Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from weasyprint.text.fonts import FontConfiguration
+
+REPORT_FONT_FAMILY = 'Droid Serif'
+FONTS_DIR_ENV = 'CARDTALE_FONTS_DIR'
+
+FONT_FORMATS = {
+    '.ttf': 'truetype',
+    '.otf': 'opentype',
+    '.woff': 'woff',
+    '.woff2': 'woff2',
+}
+FONT_WEIGHTS = {
+    'light': 300,
+    'regular': 400,
+    'medium': 500,
+    'semibold': 600,
+    'bold': 700,
+}
+LOCAL_SCHEMES = ('data:', 'file:')
+
+REMOTE_URL_ERROR = 'Remote resources are disabled when rendering with offline fonts: {}'
+
+FONT_FACE_CSS = """@font-face {{
+    font-family: '{family}';
+    src: url('{url}') format('{fmt}');
+    font-weight: {weight};
+    font-style: {style};
+}}"""
+
+
+def get_font_dir(font_dir: Optional[str] = None) -> Optional[str]:
+    """
+    Gets the directory of the bundled fonts.
+
+    Args:
+        font_dir (Optional[str], optional): Directory with the font files. Defaults to None, in which
+        case the CARDTALE_FONTS_DIR environment variable is used, if set.
+
+    Returns:
+        Optional[str]: Directory with the font files, or None.
+    """
+
+    return font_dir if font_dir is not None else os.environ.get(FONTS_DIR_ENV)
+
+
+def font_face_css(font_dir: Optional[str] = None) -> str:
+    """
+    Creates the @font-face rules of the report font from local font files, with no remote URLs.
+
+    Every file in the directory is taken as a face of the report font (REPORT_FONT_FAMILY). The weight
+    and style are parsed from the file name, e.g. DroidSerif-Bold.ttf or DroidSerif-BoldItalic.ttf.
+    Without a font directory, no rule is created and the installed fonts are used.
+
+    Args:
+        font_dir (Optional[str], optional): Directory with the font files (see get_font_dir).
+
+    Returns:
+        str: CSS rules, to be inlined in the report.
+    """
+
+    font_dir = get_font_dir(font_dir)
+    if font_dir is None:
+        return ''
+
+    rules = []
+    for path in sorted(Path(font_dir).iterdir()):
+        fmt = FONT_FORMATS.get(path.suffix.lower())
+        if fmt is None:
+            continue
+
+        variant = path.stem.split('-')[-1].lower()
+        style = 'italic' if 'italic' in variant else 'normal'
+        weight = next((w for name, w in FONT_WEIGHTS.items() if name in variant), FONT_WEIGHTS['regular'])
+
+        rules.append(FONT_FACE_CSS.format(family=REPORT_FONT_FAMILY,
+                                          url=path.resolve().as_uri(),
+                                          fmt=fmt,
+                                          weight=weight,
+                                          style=style))
+
+    return '\n'.join(rules)
+
+
+@functools.lru_cache(maxsize=None)
+def get_font_config() -> 'FontConfiguration':
+    """
+    Gets the font configuration of WeasyPrint, created once per process.
+
+    Creating a FontConfiguration runs the font discovery of fontconfig, which WeasyPrint otherwise
+    does for every document.
+
+    Returns:
+        FontConfiguration: Shared font configuration.
+    """
+
+    from weasyprint.text.fonts import FontConfiguration
+
+    return FontConfiguration()
+
+
+def offline_url_fetcher(url: str, timeout: int = 10, ssl_context=None):
+    """
+    URL fetcher for WeasyPrint that only loads local resources (files and data URLs).
+
+    Raises:
+        ValueError: If the URL is remote. WeasyPrint logs the error and skips the resource.
+    """
+
+    if not url.startswith(LOCAL_SCHEMES):
+        raise ValueError(REMOTE_URL_ERROR.format(url))
+
+    from weasyprint import default_url_fetcher
+
+    return default_url_fetcher(url, timeout=timeout, ssl_context=ssl_context)
@@ -0,0 +1,318 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from cardtale.cards.builder import CardsBuilder
+from cardtale.cards.export import RECORD_COLUMNS
+from cardtale.cards import templating
+from cardtale.core.data import TimeSeriesData
+from cardtale.core.series import SeriesCore
+from cardtale.core.config.typing import Period
+from cardtale.analytics.operations.landmarking.config import get_models
+from cardtale.analytics.operations.landmarking.panel import PanelLandmarks
+
+PDF_NAME = '{}.pdf'
+
+
+class PanelCardsBuilder:
+    """
+    Class for building analysis cards for every series in a long-format (panel) dataset.
+
+    Each series is processed by its own CardsBuilder. The series are distributed across
+    a pool of worker processes, in chunks to amortise the communication overhead.
+
+    The panel is split once into the compact representation of each series (SeriesCore, with the
+    identifier, time, and target columns), which is what is held in memory and sent to the workers.
+    The pandas objects of a series are only built by the CardsBuilder that processes it.
+
+    Attributes:
+        df (pd.DataFrame): Panel dataset following a Nixtla-based structure.
+        freq (str): Sampling frequency of the data.
+        id_col (str): Column name for the time series identifier.
+        time_col (str): Column name for the time variable.
+        target_col (str): Column name for the target variable.
+        period (Period): Main period of the data.
+        n_jobs (int): Number of worker processes. -1 uses all available cores.
+        chunksize (int): Number of series sent to a worker at a time.
+        global_landmarks (bool): Whether landmark experiments are run once for the whole panel.
+        landmarks (dict): Landmark results of each series, by identifier (only with global_landmarks).
+        template_cache_dir (str): Directory of the on-disk bytecode cache of the report templates.
+        offline_fonts (bool): Whether the reports are rendered without remote resources (see CardsBuilder).
+        dtype (str): Type of the values of the series held in memory ('float64' or 'float32').
+        residual_engine (str): Engine used to compute the residuals for the Chow test (see CardsBuilder).
+        series (List[SeriesCore]): Compact representation of each series, in order of first appearance.
+        reports (dict): Report of each series (HTML string, or path to the PDF file), by identifier.
+    """
+
+    def __init__(self,
+                 df: pd.DataFrame,
+                 freq: str,
+                 id_col: str = 'unique_id',
+                 time_col: str = 'ds',
+                 target_col: str = 'y',
+                 period: Period = None,
+                 n_jobs: int = 1,
+                 chunksize: int = 1,
+                 global_landmarks: bool = False,
+                 template_cache_dir: Optional[str] = None,
+                 offline_fonts: bool = False,
+                 dtype: str = 'float64',
+                 residual_engine: str = 'arima'):
+        """
+        Initializes the PanelCardsBuilder with the given data and parameters.
+
+        Args:
+            df (pd.DataFrame): Panel dataset following a Nixtla-based structure.
+            freq (str): Frequency of the time series data.
+            id_col (str, optional): Column name for unique identifier. Defaults to 'unique_id'.
+            time_col (str, optional): Column name for time. Defaults to 'ds'.
+            target_col (str, optional): Column name for target variable. Defaults to 'y'.
+            period (Period, optional): Period for the time series data. Defaults to None.
+            n_jobs (int, optional): Number of worker processes. Defaults to 1 (no pool).
+            chunksize (int, optional): Number of series dispatched to a worker at a time. Defaults to 1.
+            global_landmarks (bool, optional): Whether to run the landmark experiments once for the whole
+            panel (see PanelLandmarks), instead of once for each series. Defaults to False.
+            template_cache_dir (str, optional): Directory of the on-disk bytecode cache of the report templates,
+            shared by the worker processes. Defaults to None (templates are compiled once per process).
+            offline_fonts (bool, optional): Whether to render the reports without touching the network, with
+            the fonts of the CARDTALE_FONTS_DIR directory (or the installed fonts). Defaults to False.
+            dtype (str, optional): Type of the values of the series held in memory. 'float32' halves their
+            size, with about 7 significant digits. Defaults to 'float64'.
+            residual_engine (str, optional): Engine used to compute the residuals for the Chow test: 'arima'
+            or 'ar' (faster). Defaults to 'arima'.
+        """
+
+        assert chunksize > 0, 'chunksize must be a positive integer'
+
+        self.df = df
+        self.freq = freq
+        self.id_col = id_col
+        self.time_col = time_col
+        self.target_col = target_col
+        self.period = period
+        self.n_jobs = os.cpu_count() if n_jobs == -1 else n_jobs
+        self.chunksize = chunksize
+        self.global_landmarks = global_landmarks
+        self.template_cache_dir = template_cache_dir
+        self.offline_fonts = offline_fonts
+        self.dtype = dtype
+        self.residual_engine = residual_engine
+
+        self.series = []
+        self.landmarks = {}
+        self.reports = {}
+
+    def build_cards(self, output_dir: Optional[str] = None) -> Dict[str, str]:
+        """
+        Builds the cards of every series in the panel.
+
+        Args:
+            output_dir (str, optional): Directory where a PDF is written for each series.
+            If None, the rendered HTML of each series is returned instead. Defaults to None.
+
+        Returns:
+            dict: HTML string, or path to the PDF file, of each series by identifier.
+        """
+
+        if output_dir is not None:
+            Path(output_dir).mkdir(parents=True, exist_ok=True)
+
+        if self.global_landmarks:
+            self.landmarks = self.run_global_landmarks()
+
+        jobs = ((core.name, core, self._builder_params(core.name), output_dir) for core in self.get_series())
+
+        if self.n_jobs is None or self.n_jobs > 1:
+            with ProcessPoolExecutor(max_workers=self.n_jobs,
+                                     initializer=_init_worker,
+                                     initargs=(self.template_cache_dir,)) as executor:
+                results = list(executor.map(_build_series_report, jobs, chunksize=self.chunksize))
+        else:
+            templating.preload(bytecode_dir=self.template_cache_dir)
+            results = [_build_series_report(job) for job in jobs]
+
+        self.reports = dict(results)
+
+        return self.reports
+
+    def export_results(self, path: Optional[str] = None) -> pd.DataFrame:
+        """
+        Analyses every series in the panel, without rendering the reports, and collects the results
+        (tests, strength metrics, landmark scores, change points, and summary statistics) in a single table.
+
+        Args:
+            path (str, optional): Path of a Parquet file where the results are written (requires pyarrow
+            or fastparquet). Defaults to None (the results are only returned).
+
+        Returns:
+            pd.DataFrame: Long-format results of all series, with the columns unique_id, section, metric,
+            value, and text (see CardsBuilder.to_records).
+        """
+
+        if self.global_landmarks:
+            self.landmarks = self.run_global_landmarks()
+
+        jobs = ((core.name, core, self._builder_params(core.name)) for core in self.get_series())
+
+        if self.n_jobs is None or self.n_jobs > 1:
+            with ProcessPoolExecutor(max_workers=self.n_jobs,
+                                     initializer=_init_worker,
+                                     initargs=(self.template_cache_dir,)) as executor:
+                results = list(executor.map(_export_series_results, jobs, chunksize=self.chunksize))
+        else:
+            results = [_export_series_results(job) for job in jobs]
+
+        results_df = pd.DataFrame([record for records in results for record in records], columns=RECORD_COLUMNS)
+        results_df['unique_id'] = results_df['unique_id'].astype(str)
+
+        if path is not None:
+            results_df.to_parquet(path, index=False)
+
+        return results_df
+
+    def run_global_landmarks(self) -> Dict[str, Dict]:
+        """
+        Runs the landmark experiments once for the whole panel.
+
+        The experiments only need the data and time features of each series, so the series are set up
+        without profiling them (see TimeSeriesData). The change point of each series is detected
+        by the pool of worker processes (if any).
+
+        Returns:
+            dict: Landmark results of each series, by identifier.
+        """
+
+        jobs = ((core, self._tsd_params()) for core in self.get_series())
+
+        if self.n_jobs is None or self.n_jobs > 1:
+            with ProcessPoolExecutor(max_workers=self.n_jobs) as executor:
+                change_points = list(executor.map(_detect_change_point, jobs, chunksize=self.chunksize))
+        else:
+            change_points = [_detect_change_point(job) for job in jobs]
+
+        change_points = {uid: change_point for uid, change_point in change_points if change_point is not None}
+
+        tsd_list = [TimeSeriesData(df=core, profile=False, **self._tsd_params()) for core in self.get_series()]
+
+        landmarks = PanelLandmarks(tsd_list, change_points=change_points).run()
+
+        return landmarks
+
+    def get_series(self) -> List[SeriesCore]:
+        """
+        Splits the panel into the compact representation of each series, once.
+
+        Returns:
+            List[SeriesCore]: Compact series, in order of first appearance.
+        """
+
+        if len(self.series) == 0:
+            self.series = SeriesCore.split_panel(self.df,
+                                                 id_col=self.id_col,
+                                                 time_col=self.time_col,
+                                                 target_col=self.target_col,
+                                                 dtype=self.dtype)
+
+        return self.series
+
+    def _tsd_params(self):
+        return {
+            'freq': self.freq,
+            'id_col': self.id_col,
+            'time_col': self.time_col,
+            'target_col': self.target_col,
+            'period': self.period,
+        }
+
+    def _builder_params(self, uid):
+        return {
+            'freq': self.freq,
+            'id_col': self.id_col,
+            'time_col': self.time_col,
+            'target_col': self.target_col,
+            'period': self.period,
+            'landmarks': self.landmarks.get(uid),
+            'offline_fonts': self.offline_fonts,
+            'residual_engine': self.residual_engine,
+        }
+
+
+def _init_worker(template_cache_dir: Optional[str] = None):
+    """
+    Prevents each worker process from spawning one LightGBM thread per core,
+    as parallelism is obtained across series instead. Also compiles the report templates
+    once per worker.
+
+    Args:
+        template_cache_dir (str, optional): Directory of the on-disk bytecode cache of the templates.
+    """
+
+    for model in get_models().values():
+        model.set_params(n_jobs=1)
+
+    templating.preload(bytecode_dir=template_cache_dir)
+
+
+def _detect_change_point(job):
+    """
+    Detects the first change point of a single series, for the global landmark experiments.
+
+    Args:
+        job (tuple): Compact series (SeriesCore), and TimeSeriesData parameters.
+
+    Returns:
+        tuple: Series identifier and the first change point (None if no change is detected).
+    """
+
+    core, params = job
+
+    tsd = TimeSeriesData(df=core, profile=False, **params)
+    series = tsd.get_target_series(df=tsd.df, target_col=tsd.target_col, time_col=tsd.time_col)
+
+    return tsd.name, PanelLandmarks.detect_change_point(series, period=tsd.period)
+
+
+def _build_series_report(job):
+    """
+    Builds the report of a single series.
+
+    Args:
+        job (tuple): Series identifier, compact series (SeriesCore), CardsBuilder parameters and output directory.
+
+    Returns:
+        tuple: Series identifier and the HTML string, or the path to the PDF file.
+    """
+
+    uid, core, params, output_dir = job
+
+    tcard = CardsBuilder(core, **params)
+    tcard.build_cards()
+
+    if output_dir is None:
+        return uid, tcard.cards_raw_html
+
+    path = str(Path(output_dir) / PDF_NAME.format(uid))
+    tcard.get_pdf(path=path)
+
+    return uid, path
+
+
+def _export_series_results(job):
+    """
+    Analyses a single series, without rendering its report.
+
+    Args:
+        job (tuple): Series identifier, compact series (SeriesCore), and CardsBuilder parameters.
+
+    Returns:
+        list: Long-format results of the series (see CardsBuilder.to_records).
+    """
+
+    _, core, params = job
+
+    tcard = CardsBuilder(core, **params)
+
+    return tcard.to_records()
@@ -0,0 +1,270 @@
+import html
+import re
+import textwrap
+from datetime import datetime
+from typing import List, TYPE_CHECKING
+
+from cardtale.cards.strings import gettext
+from cardtale.visuals.plot import Plot, ignore_plotnine_warnings
+from cardtale.visuals.fonts import resolve_font_family
+
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
+
+REPORT_TITLE = 'Univariate Time Series Data and Model Card'
+A4_SIZE = (8.27, 11.69)
+MARGIN = 0.8
+LINE_SPACING = 1.45
+TITLE_COLOR = '#102338'
+MUTED_COLOR = '#666666'
+
+FONT_SIZES = {
+    'title': 20,
+    'header': 16,
+    'subheader': 13,
+    'text': 10,
+    'small': 9,
+}
+
+
+class MatplotlibPdfWriter:
+    """
+    Writes the report of a CardsBuilder directly to a PDF file with matplotlib (PdfPages), without
+    the HTML layout of WeasyPrint.
+
+    The first page contains the title, metadata, and table of contents. Then, each plot of the included
+    cards is written as a page, with the section header and introduction above the first plot of
+    each card, and the caption and analysis (bullet list) below each plot. The plotnine figures are
+    drawn into the PDF as vector graphics, and the pages are cropped to their content (bbox_inches='tight').
+    A card without plots is written as a page with its section header and introduction.
+
+    The plots of each card are taken from Card.get_plots_to_build, as some cards (e.g. seasonality) only
+    select them there, so the report does not depend on render_doc_html having been called.
+
+    Attributes:
+        builder (CardsBuilder): Builder with the analysed cards.
+        font_family (str): Font family of the text.
+    """
+
+    def __init__(self, builder):
+        """
+        Initializes the MatplotlibPdfWriter.
+
+        Args:
+            builder (CardsBuilder): Builder with the analysed cards (build_cards was called).
+        """
+
+        self.builder = builder
+        self.font_family = resolve_font_family()
+
+    def write(self, path: str):
+        """
+        Writes the report.
+
+        Args:
+            path (str): Path of the PDF file.
+        """
+
+        import matplotlib.pyplot as plt
+        from matplotlib.backends.backend_pdf import PdfPages
+
+        with PdfPages(path) as pdf:
+            fig = self.title_page()
+            pdf.savefig(fig)
+            plt.close(fig)
+
+            plot_id = 1
+            for card in self.builder.cards.values():
+                if not card.show_content:
+                    continue
+
+                header = [(gettext(card.metadata['section_header_str']), 'header'),
+                          (gettext(card.metadata['section_intro_str']), 'text')]
+
+                plots = [plot for plot in card.get_plots_to_build() if plot.show_me]
+
+                if len(plots) < 1:
+                    fig = self.text_page(header)
+                    pdf.savefig(fig)
+                    plt.close(fig)
+
+                for plot in plots:
+                    for fig in self.plot_pages(plot, plot_id, header):
+                        pdf.savefig(fig, bbox_inches='tight', pad_inches=MARGIN / 2)
+                        plt.close(fig)
+
+                    header = []
+                    plot_id += 1
+
+            info = pdf.infodict()
+            info['Title'] = f'{REPORT_TITLE}: {self.builder.tsd.name}'
+
+    def title_page(self) -> 'Figure':
+        """
+        Creates the first page, with the title, metadata, and table of contents.
+
+        Returns:
+            Figure: A4 page.
+        """
+
+        import matplotlib.pyplot as plt
+
+        fig = plt.figure(figsize=A4_SIZE)
+        width = A4_SIZE[0] - 2 * MARGIN
+
+        blocks = [
+            (REPORT_TITLE, 'title'),
+            ('Generated by Cardtale - Automated Model and Data Card Generator', 'small'),
+            ('This report provides an automated, comprehensive analysis of univariate time series data. '
+             'Generated by Cardtale, it explores basic aspects and potential challenges in your data to '
+             'support informed decision-making and modeling choices.', 'text'),
+            (f'Generated: {datetime.now().strftime("%Y-%m-%d %H:%M")}', 'small'),
+            (f'Series Name: {self.builder.tsd.name}', 'small'),
+            ('Table of Contents', 'header'),
+        ]
+
+        for i, section in enumerate(self.builder.cards_included):
+            blocks.append((f'{i + 1}. {section["title"]}', 'subheader'))
+            blocks.append((section['message'], 'small'))
+
+        if len(self.builder.cards_to_omit) > 0:
+            blocks.append(('Other aspects were explored but omitted from the final report:', 'text'))
+            for section in self.builder.cards_to_omit:
+                blocks.append((f'- {section["title"]}', 'subheader'))
+                blocks.append((section['message'], 'small'))
+
+        self._add_text(fig, blocks, x=MARGIN, y=A4_SIZE[1] - MARGIN, width=width)
+
+        return fig
+
+    def text_page(self, blocks: List) -> 'Figure':
+        """
+        Creates a page with text only (e.g., the section header and introduction of a card without plots).
+
+        Args:
+            blocks (List): Text blocks, as (text, style) pairs.
+
+        Returns:
+            Figure: A4 page.
+        """
+
+        import matplotlib.pyplot as plt
+
+        fig = plt.figure(figsize=A4_SIZE)
+
+        self._add_text(fig, blocks, x=MARGIN, y=A4_SIZE[1] - MARGIN, width=A4_SIZE[0] - 2 * MARGIN)
+
+        return fig
+
+    def plot_pages(self, plot: Plot, plot_id: int, header: List) -> List['Figure']:
+        """
+        Draws the pages of a plot: one page, or two for side-by-side plots (the first with the header,
+        the last with the caption and analysis).
+
+        Args:
+            plot (Plot): Analysed plot. It is built if needed (e.g., if its images came from a render cache).
+            plot_id (int): Number of the plot, used in the caption.
+            header (List): Text blocks above the plot (section header and introduction, for the first
+            plot of a card).
+
+        Returns:
+            List[Figure]: Matplotlib figures.
+        """
+
+        if plot.plot is None or (plot.multi_plot and plot.plot['lhs'] is None):
+            plot.build()
+
+        if plot.multi_plot:
+            figs = [self._draw(plot.plot['lhs'], plot.width_s, plot.height_s),
+                    self._draw(plot.plot['rhs'], plot.width_s, plot.height_s)]
+        else:
+            figs = [self._draw(plot.plot, plot.width, plot.height)]
+
+        top_fig, bottom_fig = figs[0], figs[-1]
+
+        top_blocks = header + [(plot.plot_name, 'subheader')]
+        self._add_text(top_fig,
+                       top_blocks[::-1],
+                       x=0,
+                       y=top_fig.get_figheight(),
+                       width=top_fig.get_figwidth(),
+                       upwards=True)
+
+        bottom_blocks = [(self._caption(plot, plot_id), 'small')]
+        bottom_blocks += [(f'- {self._to_text(point)}', 'text') for point in plot.analysis]
+        self._add_text(bottom_fig, bottom_blocks, x=0, y=0, width=bottom_fig.get_figwidth())
+
+        return figs
+
+    @staticmethod
+    def _caption(plot: Plot, plot_id: int) -> str:
+        """
+        Formats the caption of a plot with its number (and plot-specific details, see Plot.format_caption),
+        without changing the image data of the plot.
+        """
+
+        img_data = plot.img_data
+
+        plot.img_data = {'caption': plot.caption}
+        plot.format_caption(plot_id)
+        caption = plot.img_data['caption']
+
+        plot.img_data = img_data
+
+        return caption
+
+    @staticmethod
+    def _draw(plot, width: float, height: float) -> 'Figure':
+        import plotnine as p9
+
+        ignore_plotnine_warnings()
+
+        return (plot + p9.theme(figure_size=(width, height))).draw()
+
+    def _add_text(self, fig: 'Figure', blocks: List, x: float, y: float, width: float, upwards: bool = False):
+        """
+        Adds blocks of wrapped text to a figure, from position (x, y) in inches, downwards
+        (or upwards, with the blocks in reverse order). The text can go beyond the figure, as pages
+        with plots are cropped to their content.
+        """
+
+        fig_w, fig_h = fig.get_size_inches()
+
+        for text, style in blocks:
+            size = FONT_SIZES[style]
+            line_height = size * LINE_SPACING / 72
+
+            # about 0.5 em per character
+            n_chars = max(int(width * 72 / (size * 0.5)), 20)
+            lines = [line for paragraph in self._to_text(text).split('\n')
+                     for line in textwrap.wrap(paragraph, n_chars) or ['']]
+
+            block_height = line_height * len(lines) + line_height / 2
+
+            if upwards:
+                y += block_height
+
+            fig.text(x / fig_w,
+                     (y - line_height / 2) / fig_h,
+                     '\n'.join(lines),
+                     fontsize=size,
+                     fontfamily=self.font_family,
+                     fontweight='bold' if style in ['title', 'header', 'subheader'] else 'normal',
+                     color=TITLE_COLOR if style in ['title', 'header'] else MUTED_COLOR if style == 'small' else 'black',
+                     linespacing=LINE_SPACING,
+                     va='top',
+                     ha='left')
+
+            if not upwards:
+                y -= block_height
+
+    @staticmethod
+    def _to_text(text: str) -> str:
+        """
+        Converts the HTML snippets of the analysis (e.g., bold text and nested lists) to plain text.
+        """
+
+        text = re.sub(r'<li>', '\n    - ', text)
+        text = re.sub(r'<[^>]+>', '', text)
+
+        return html.unescape(text).strip()
@@ -0,0 +1,137 @@
+import threading
+from typing import Dict, Iterable, Optional
+
+from jinja2 import Environment, FileSystemLoader, FileSystemBytecodeCache, Template
+
+from cardtale.cards.config import TEMPLATE_DIR, STRUCTURE_TEMPLATE, CARD_HTML
+
+REPORT_TEMPLATES = (STRUCTURE_TEMPLATE, CARD_HTML)
+
+
+class TemplateRegistry:
+    """
+    Registry of the Jinja environment and compiled templates, shared by all cards and reports of a process.
+
+    Templates are parsed and compiled once, and optionally the compiled bytecode is stored on disk,
+    so that new processes (e.g. workers of a batch) skip compilation.
+
+    Attributes:
+        env (Optional[Environment]): Jinja environment, created on first use.
+        templates (Dict[str, Template]): Compiled templates, by file name.
+        bytecode_dir (Optional[str]): Directory of the on-disk bytecode cache (None if disabled).
+    """
+
+    def __init__(self):
+        self.env: Optional[Environment] = None
+        self.templates: Dict[str, Template] = {}
+        self.bytecode_dir: Optional[str] = None
+
+        self._lock = threading.Lock()
+
+    def set_bytecode_cache(self, directory: Optional[str]):
+        """
+        Sets the directory of the on-disk bytecode cache, and resets the registry.
+
+        Args:
+            directory (Optional[str]): Directory for the compiled templates. None disables the bytecode cache.
+        """
+
+        with self._lock:
+            self.bytecode_dir = directory
+            self.env = None
+            self.templates.clear()
+
+    def get_environment(self) -> Environment:
+        """
+        Gets the Jinja environment, creating it on the first call.
+
+        Returns:
+            Environment: Jinja environment loading the templates from TEMPLATE_DIR.
+        """
+
+        if self.env is None:
+            with self._lock:
+                if self.env is None:
+                    bcc = FileSystemBytecodeCache(self.bytecode_dir) if self.bytecode_dir is not None else None
+                    self.env = Environment(loader=FileSystemLoader(str(TEMPLATE_DIR)),
+                                           bytecode_cache=bcc,
+                                           auto_reload=False)
+
+        return self.env
+
+    def get_template(self, name: str) -> Template:
+        """
+        Gets a compiled template.
+
+        Args:
+            name (str): Template file name (e.g. CARD_HTML).
+
+        Returns:
+            Template: Compiled template.
+        """
+
+        template = self.templates.get(name)
+        if template is None:
+            template = self.get_environment().get_template(name)
+            self.templates[name] = template
+
+        return template
+
+
+TEMPLATE_REGISTRY = TemplateRegistry()
+
+
+def set_bytecode_cache(directory: Optional[str]):
+    """
+    Sets the directory of the on-disk bytecode cache of the shared registry (see TemplateRegistry).
+
+    Args:
+        directory (Optional[str]): Directory for the compiled templates. None disables the bytecode cache.
+    """
+
+    TEMPLATE_REGISTRY.set_bytecode_cache(directory)
+
+
+def get_environment() -> Environment:
+    """
+    Gets the Jinja environment of the shared registry.
+
+    Returns:
+        Environment: Jinja environment loading the templates from TEMPLATE_DIR.
+    """
+
+    return TEMPLATE_REGISTRY.get_environment()
+
+
+def get_template(name: str) -> Template:
+    """
+    Gets a compiled template from the shared registry.
+
+    Args:
+        name (str): Template file name (e.g. CARD_HTML).
+
+    Returns:
+        Template: Compiled template.
+    """
+
+    return TEMPLATE_REGISTRY.get_template(name)
+
+
+def preload(names: Iterable[str] = REPORT_TEMPLATES, bytecode_dir: Optional[str] = None):
+    """
+    Compiles the templates used in the reports ahead of time.
+
+    It can be used as the initializer of worker processes, for example:
+    ProcessPoolExecutor(initializer=preload, initargs=(REPORT_TEMPLATES, cache_dir)).
+
+    Args:
+        names (Iterable[str], optional): Template file names. Defaults to REPORT_TEMPLATES.
+        bytecode_dir (Optional[str], optional): Directory of the on-disk bytecode cache. Defaults to None
+        (keeps the current setting).
+    """
+
+    if bytecode_dir is not None and bytecode_dir != TEMPLATE_REGISTRY.bytecode_dir:
+        set_bytecode_cache(bytecode_dir)
+
+    for name in names:
+        get_template(name)
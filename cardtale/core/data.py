@@ -1,3 +1,5 @@
+from typing import Dict, Union
+
 import numpy as np
 import pandas as pd
 
@@ -6,6 +8,8 @@ from cardtale.analytics.operations.tsa.decomposition import DecompositionSTL
 from cardtale.core.config.freq import AVAILABLE_FREQ
 from cardtale.core.config.typing import Period
 from cardtale.core.profile import SeriesProfile
+from cardtale.core.series import SeriesCore
+from cardtale.core.tracing import span
 from cardtale.cards.strings import join_l
 
 unq_freq_list = pd.Series([*AVAILABLE_FREQ.values()]).unique().tolist()
@@ -21,6 +25,10 @@ ESTIMATED_PERIOD = 'Seasonal period was not provided. ' \
 
 UNKNOWN_PERIOD = 'Unknown period'
 
+APPEND_COLUMNS_ERROR = 'The new observations must have the columns of the series: {}'
+APPEND_ID_ERROR = 'The new observations must belong to the same series ({})'
+APPEND_ORDER_ERROR = 'The new observations must be sorted by time, and follow the last observation of the series'
+
 
 class TimeSeriesData:
     """
@@ -28,8 +36,16 @@ class TimeSeriesData:
 
     Time series dataset following a Nixtla-based structure.
 
+    It can also be built from the compact representation of a series (SeriesCore), e.g. one of the
+    many series of a panel held in memory, in which case the frame is built on demand over its arrays.
+
+    The columns of the series are held once, as read-only arrays (see set_data), and df is a frame over
+    them. So, the stages of the analysis (tests, landmarks, plots) get views of the same buffer instead of
+    copies, and a stage that needs to change the data builds a new frame with its own columns. An in-place
+    write raises an error instead of changing the series under the other stages.
+
     Attributes:
-        df (pd.DataFrame): Series as a pd.DataFrame (index as column)
+        df (pd.DataFrame): Series as a pd.DataFrame (index as column), over read-only arrays
         period (Period): Main period of the data (e.g. 12 for monthly data)
         dt (TimeDF): Temporal information class object
         summary (SeriesSummary): Summary stats of the series
@@ -43,17 +59,19 @@ class TimeSeriesData:
     """
 
     def __init__(self,
-                 df: pd.DataFrame,
+                 df: Union[pd.DataFrame, SeriesCore],
                  freq: str,
                  id_col: str = 'unique_id',
                  time_col: str = 'ds',
                  target_col: str = 'y',
-                 period: Period = None):
+                 period: Period = None,
+                 profile: bool = True):
         """
         Initializes the TimeSeriesData class.
 
         Args:
-            df (pd.DataFrame): Time series dataset following a Nixtla-based structure.
+            df (Union[pd.DataFrame, SeriesCore]): Time series dataset following a Nixtla-based structure,
+            or its compact representation.
             freq (str): Sampling frequency of the data. Needs to be compatible with pandas.
 
             id_col (str, optional): Column name for the time series identifier.
@@ -67,6 +85,10 @@ class TimeSeriesData:
 
             period (Period, optional): Main period of the data (e.g. 12 for monthly data).
             Defaults to None.
+
+            profile (bool, optional): Whether to profile the series (summary statistics, auto-correlation,
+            and STL decomposition). Without it, only the data and its time features are set up, e.g. for the
+            landmark experiments of a panel. Defaults to True.
         """
 
         self.id_col = id_col
@@ -74,9 +96,13 @@ class TimeSeriesData:
         self.target_col = target_col
         self.is_integer_valued = False
 
+        if isinstance(df, SeriesCore):
+            df = df.to_frame(id_col=id_col, time_col=time_col, target_col=target_col)
+
         self._assert_datatypes(df, freq)
 
-        self.df = df
+        self.df = None
+        self.set_data(df)
         self.dt = TimeDF(freq)
         self.dt.setup(self.df, self.time_col, self.target_col)
         self.seas_df = None
@@ -98,29 +124,89 @@ class TimeSeriesData:
 
         self.summary = SeriesProfile(n_lags=n_lags_, freq_pretty=self.dt.freq_pretty)
 
-        self.setup()
+        if profile:
+            self.setup()
+        else:
+            self.set_tsd_name()
 
-    def setup(self):
+    def setup(self, n_new: int = 0):
         """
         Sets up the time series data by running summary statistics and STL decomposition.
-        """
 
-        if self.ts_is_integer(self.df[self.target_col]):
-            self.df[self.target_col] = self.df[self.target_col].astype(int)
-            self.is_integer_valued = True
-        else:
-            self.is_integer_valued = False
+        Args:
+            n_new (int, optional): Number of observations appended since the last setup. If positive, they
+            are added to the running profile of the series instead of profiling it again, and only the end of
+            the STL decomposition is fitted again. Defaults to 0.
+        """
 
-        s = self.get_target_series(self.df, self.target_col, self.time_col)
+        with span('tsd_setup', n=self.df.shape[0], n_new=n_new):
+            s = self.get_target_series(self.df, self.target_col, self.time_col)
 
-        self.summary.run(s, self.period, self.date_format)
+            if n_new > 0 and self.summary.accumulator is not None:
+                self.summary.update(s, n_new, self.period, self.date_format)
+                self.stl_df = DecompositionSTL.update_stl_components(self.stl_df, s, self.period, n_new)
+            else:
+                self.summary.run(s, self.period, self.date_format)
+                self.stl_df = DecompositionSTL.get_stl_components(series=s, period=self.period)
 
-        self.seas_df = pd.concat([self.df, self.dt.recurrent], axis=1)
-        self.stl_df = DecompositionSTL.get_stl_components(series=s, period=self.period)
-        self.stl_resid_str = DecompositionSTL.residuals_ljung_box(self.stl_df['Residuals'], n_lags=self.period)
+            self.seas_df = pd.concat([self.df, self.dt.recurrent], axis=1, copy=False)
+            self.stl_resid_str = DecompositionSTL.residuals_ljung_box(self.stl_df['Residuals'], n_lags=self.period)
 
         self.set_tsd_name()
 
+    def append(self, df: pd.DataFrame):
+        """
+        Appends new observations to the series, and updates the time features and summary.
+
+        The calendar features are computed for the new time steps only, and the frequency averages
+        are updated from running sums (see TimeDF.update). The new observations are added to the running
+        profile of the series, from which the auto-correlation is also updated (see SeriesProfile.update),
+        and the STL decomposition is fitted again on the end of the series only (see
+        DecompositionSTL.update_stl_components).
+
+        Args:
+            df (pd.DataFrame): New observations, with the same columns as the series, and time steps
+            after the last one.
+        """
+
+        assert all(col in df.columns for col in self.df.columns), APPEND_COLUMNS_ERROR.format([*self.df.columns])
+        assert (df[self.id_col] == self.name).all(), APPEND_ID_ERROR.format(self.name)
+
+        time_steps = df[self.time_col]
+        assert pd.api.types.is_datetime64_any_dtype(time_steps), \
+            "Column 'ds' must be of type pd.Timestamp"
+        assert time_steps.is_monotonic_increasing and time_steps.iloc[0] > self.df[self.time_col].iloc[-1], \
+            APPEND_ORDER_ERROR
+
+        new_df = df[self.df.columns].reset_index(drop=True)
+
+        self.set_data(pd.concat([self.df, new_df], ignore_index=True))
+        self.dt.update(new_df, self.time_col, self.target_col)
+
+        self.setup(n_new=new_df.shape[0])
+
+    def set_data(self, df: pd.DataFrame):
+        """
+        Sets the data of the series, with its columns as read-only arrays.
+
+        The input frame is not changed. The target is cast to int if the series is integer-valued
+        (otherwise, it keeps its type, e.g. float after appending non-integer values to an integer series).
+        The numpy columns of df are kept without copying when their type does not change, so the
+        caller should not change the input frame in place afterwards.
+
+        Args:
+            df (pd.DataFrame): Time series dataset following a Nixtla-based structure.
+        """
+
+        columns = {col: df[col] for col in df.columns}
+
+        target = columns[self.target_col]
+        self.is_integer_valued = self.ts_is_integer(target)
+        if self.is_integer_valued and not pd.api.types.is_integer_dtype(target):
+            columns[self.target_col] = target.to_numpy().astype(int)
+
+        self.df = self.read_only_frame(columns)
+
     def set_tsd_name(self):
         """
         Sets the name of the time series data.
@@ -177,6 +263,35 @@ class TimeSeriesData:
 
         return is_int
 
+    @staticmethod
+    def read_only_frame(columns: Dict[str, Union[pd.Series, np.ndarray]]) -> pd.DataFrame:
+        """
+        Builds a frame over read-only views of the given columns, without copying them.
+
+        Columns with a numpy type are marked as read-only (on a view, so the owner of the array is not
+        affected). Columns with an extension type (e.g. categorical or timezone-aware dates) are kept
+        as they are, as pandas does not expose a writeable flag for them.
+
+        Args:
+            columns (Dict[str, Union[pd.Series, np.ndarray]]): Columns by name, with the same length.
+
+        Returns:
+            pd.DataFrame: Frame with a RangeIndex over the given columns.
+        """
+
+        arrays = {}
+        for col, values in columns.items():
+            if isinstance(values, pd.Series):
+                values = values.to_numpy() if isinstance(values.dtype, np.dtype) else values.array
+
+            if isinstance(values, np.ndarray):
+                values = values.view()
+                values.flags.writeable = False
+
+            arrays[col] = values
+
+        return pd.DataFrame(arrays, copy=False)
+
     @staticmethod
     def get_target_series(df, target_col, time_col):
         """
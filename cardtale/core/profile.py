@@ -1,18 +1,23 @@
 import copy
 import warnings
 
-from typing import List
+from typing import Iterable, List, Optional
 
 import numpy as np
 import pandas as pd
-from scipy.stats import skew, kurtosis, kurtosistest, skewtest
 
 from cardtale.analytics.operations.tsa.acf import AutoCorrelation
 from cardtale.core.config.analysis import ALPHA, STATS_TO_ROUND, ROUND_N
-from cardtale.analytics.operations.tsa.log import LogTransformation
+from cardtale.core.streaming import ProfileAccumulator
 
 warnings.filterwarnings('ignore', category=RuntimeWarning)
 
+GROWTH_FLOAT_KEYS = ['upward_moves_mag', 'upward_moves_prob', 'downward_moves_mag', 'downward_moves_prob',
+                     'direction_changes_perc', 'average_ret', 'median_ret', 'growth_vol', 'kurtosis', 'skewness',
+                     'extreme_pct', 'largest_increase', 'largest_decrease']
+
+ACCUMULATOR_LAGS_ERROR = 'The accumulator must have the number of lags of the auto-correlation'
+
 
 class SeriesProfile:
     """
@@ -28,6 +33,9 @@ class SeriesProfile:
         skewness_like_normal (bool): If should reject the hypothesis
         that skewness is that of a Normal
         acf (AutoCorrelation): Auto-correlation class object
+        pacf (AutoCorrelation): Partial auto-correlation class object
+        growth (dict): Growth analysis, based on the log returns
+        accumulator (ProfileAccumulator): Running profile the stats and growth analysis are computed from
     """
 
     def __init__(self, n_lags: int, freq_pretty: str, alpha: float = ALPHA):
@@ -56,9 +64,16 @@ class SeriesProfile:
 
         self.growth = {}
 
-    def run(self, series: pd.Series, period: int, dt_format: str, ):
+        self.accumulator: Optional[ProfileAccumulator] = None
+
+    def run(self, series: pd.Series, period: int, dt_format: str):
         """
-        Runs the summary and distribution fitting for the series.
+        Runs the summary and growth analysis for the series.
+
+        The summary statistics and growth analysis are computed in a single pass over the series (see
+        ProfileAccumulator), and the auto-correlation with statsmodels. As the series is in memory, the
+        quantiles are exact, whatever its length. The running profile also keeps the sums of the
+        auto-correlation, so it can be updated with new observations (see update).
 
         Args:
             series (pd.Series): A univariate time series.
@@ -66,8 +81,72 @@ class SeriesProfile:
             dt_format (str): Date format for display.
         """
 
+        self.accumulator = ProfileAccumulator.from_chunk(series.values,
+                                                         series.index,
+                                                         n_lags=self.acf.n_lags,
+                                                         exact_size=None)
+
         self.summarise(series, period, dt_format)
-        self.growth_analysis(series)
+        self.growth_analysis()
+
+    def update(self, series: pd.Series, n_new: int, period: int, dt_format: str):
+        """
+        Updates the summary, growth analysis, and auto-correlation with new observations, which are added
+        to the running profile. So, the cost of the update depends on the number of new observations.
+
+        Args:
+            series (pd.Series): The whole time series, with the new observations at the end.
+            n_new (int): Number of new observations.
+            period (int): Time series seasonal period.
+            dt_format (str): Date format for display.
+        """
+
+        new_series = series.iloc[-n_new:]
+        self.accumulator.update(new_series.values, new_series.index)
+
+        self.run_accumulator(self.accumulator, period, dt_format)
+
+    def run_stream(self, chunks: Iterable[pd.Series], period: int, dt_format: str):
+        """
+        Runs the summary, growth analysis, and auto-correlation in a single streaming pass over
+        consecutive chunks of a series (e.g., very long series, or a memory-mapped file read by slices).
+        Only the running profile is kept in memory, not the series.
+
+        Args:
+            chunks (Iterable[pd.Series]): Consecutive chunks of a univariate time series.
+            period (int): Time series seasonal period.
+            dt_format (str): Date format for display.
+        """
+
+        accumulator = ProfileAccumulator(n_lags=self.acf.n_lags)
+        for chunk in chunks:
+            accumulator.update(chunk.values, chunk.index)
+
+        self.run_accumulator(accumulator, period, dt_format)
+
+    def run_accumulator(self, accumulator: ProfileAccumulator, period: int, dt_format: str):
+        """
+        Runs the summary, growth analysis, and auto-correlation from a running profile, e.g., merged
+        from the profiles of the partitions of a series (see ProfileAccumulator.merge).
+
+        Args:
+            accumulator (ProfileAccumulator): Profile of the series, with n_lags of the auto-correlation.
+            period (int): Time series seasonal period.
+            dt_format (str): Date format for display.
+        """
+
+        assert accumulator.n_lags == self.acf.n_lags, ACCUMULATOR_LAGS_ERROR
+
+        self.accumulator = accumulator
+
+        self.describe(dt_format)
+
+        self.acf.set_acf(accumulator.autocov.acf(), accumulator.n)
+        self.acf.significance_analysis(period=period)
+        self.pacf.set_pacf(accumulator.autocov.pacf(), accumulator.n)
+        self.pacf.significance_analysis(period=period)
+
+        self.growth_analysis()
 
     def summarise(self, series: pd.Series, period: int, dt_format: str):
         """
@@ -82,25 +161,7 @@ class SeriesProfile:
             self: Summarised time series.
         """
 
-        self.n = len(series)
-        self.dt_range = series.index[[0, -1]]
-        self.dt_range = [x.strftime(dt_format) for x in self.dt_range]
-
-        self.stats = series.describe()
-        self.stats['skew'] = skew(series.values)
-        self.stats['kurtosis'] = kurtosis(series)
-        self.stats['first_value'] = series.values[0]
-        self.stats['last_value'] = series.values[-1]
-        self.stats['nan_percentage'] = np.round(100 * series.isna().sum() / self.n, 2)
-
-        pct_c = series.pct_change()
-
-        self.stats['growth_average'] = np.round(pct_c.mean() * 100, 2)
-        self.stats['growth_median'] = np.round(pct_c.median() * 100, 2)
-
-        self.kurtosis_like_normal = kurtosistest(series).pvalue < self.alpha
-        self.skewness_like_normal = skewtest(series).pvalue < self.alpha
-        self.stats['iqr'] = self.stats['75%'] - self.stats['25%']
+        self.describe(dt_format)
 
         self.acf.calc_acf(series)
         self.acf.significance_analysis(period=period)
@@ -109,9 +170,26 @@ class SeriesProfile:
 
         # self.ns_zones = NasonPeriods.get_segments_df(series)
 
-        self.stats = self.stats.to_dict()
+    def describe(self, dt_format: str):
+        """
+        Sets the summary statistics from the running profile.
+
+        Args:
+            dt_format (str): Date format for display.
+        """
+
+        profile = self.accumulator
+
+        self.n = profile.n
+        self.dt_range = [x.strftime(dt_format) for x in [profile.first_time, profile.last_time]]
+
+        self.stats = {st: float(val) for st, val in profile.describe().items()}
+
+        self.kurtosis_like_normal = profile.moments.kurtosistest() < self.alpha
+        self.skewness_like_normal = profile.moments.skewtest() < self.alpha
+
         for st, val in self.stats.items():
-            if np.isinf(val):
+            if not np.isfinite(val):
                 continue
 
             self.stats[st] = int(val) if val == int(val) else val
@@ -119,35 +197,14 @@ class SeriesProfile:
             if st in STATS_TO_ROUND:
                 self.stats[st] = np.round(self.stats[st], ROUND_N)
 
-    def growth_analysis(self, series: pd.Series):
-
-        rets = LogTransformation.returns(series)[1:]
-
-        mean_rets = rets.mean()
-        std_rets = rets.std()
-
-        # Calculate bounds
-        upper_bound = mean_rets + 2 * std_rets
-        lower_bound = mean_rets - 2 * std_rets
-
-        # Calculate percentage of extreme values
-        extreme_pct = ((rets > upper_bound) | (rets < lower_bound)).mean() * 100
-
-        growth_flt = {
-            'upward_moves_mag': rets[rets > 0].mean(),
-            'upward_moves_prob': (rets > 0).mean() * 100,
-            'downward_moves_mag': rets[rets < 0].mean(),
-            'downward_moves_prob': (rets < 0).mean() * 100,
-            'direction_changes_perc': (rets > 0).diff().abs().mean() * 100,
-            'average_ret': mean_rets,
-            'median_ret': rets.median(),
-            'growth_vol': std_rets,
-            'kurtosis': kurtosis(rets),
-            'skewness': skew(rets),
-            'extreme_pct': extreme_pct,
-            'largest_increase': rets.max(),
-            'largest_decrease': rets.min(),
-        }
+    def growth_analysis(self):
+        """
+        Sets the growth analysis (log returns) from the running profile.
+        """
+
+        growth = self.accumulator.returns.summary()
+
+        growth_flt = {k: np.float64(growth[k]) for k in GROWTH_FLOAT_KEYS}
 
         for k in growth_flt:
             round_st = copy.deepcopy(ROUND_N)
@@ -163,11 +220,17 @@ class SeriesProfile:
                 round_st += 1
 
         growth_non_flt = {
-            'direction_changes': (rets > 0).diff().abs().sum(),
-            'kurtosis_like_normal': kurtosistest(rets).pvalue > ALPHA,
-            'skewness_like_normal': skewtest(rets).pvalue > ALPHA,
-            'largest_increase_loc': series.index[rets.argmax()].strftime(self.freq_pretty),
-            'largest_decrease_loc': series.index[rets.argmin()].strftime(self.freq_pretty),
+            'direction_changes': growth['direction_changes'],
+            'kurtosis_like_normal': growth['kurtosis_pvalue'] > ALPHA,
+            'skewness_like_normal': growth['skewness_pvalue'] > ALPHA,
+            'largest_increase_loc': self._format_time(growth['largest_increase_time']),
+            'largest_decrease_loc': self._format_time(growth['largest_decrease_time']),
         }
 
         self.growth = {**growth_flt, **growth_non_flt}
+
+    def _format_time(self, time_step) -> Optional[str]:
+        if time_step is None:
+            return None
+
+        return time_step.strftime(self.freq_pretty)
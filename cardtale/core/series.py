@@ -0,0 +1,202 @@
+from typing import Any, List, Optional
+
+import numpy as np
+import pandas as pd
+
+VALUES_DTYPES = ['float64', 'float32']
+
+UNKNOWN_DTYPE_ERROR = f'The values must be stored as one of: {VALUES_DTYPES}'
+LENGTH_ERROR = 'The values and the timestamps must have the same length'
+
+
+class SeriesCore:
+    """
+    Compact representation of a single time series: its identifier, the values as a contiguous float
+    array, and the time steps as int64 epoch timestamps (nanoseconds, UTC for timezone-aware dates).
+
+    A SeriesCore has no pandas objects and no per-instance dict (__slots__), so a large panel can be held
+    in memory (or sent to worker processes) at a small cost per series. The pandas objects used by the
+    analysis and plotting code are only built on demand, with to_frame, e.g. by TimeSeriesData, which
+    accepts a SeriesCore in place of a DataFrame.
+
+    The arrays are read-only. The series of a panel split with split_panel are views of a single
+    buffer, sorted by series.
+
+    Attributes:
+        name (Any): Identifier of the series.
+        values (np.ndarray): Values of the series (float64 or float32).
+        timestamps (np.ndarray): Time steps, as int64 nanoseconds since the epoch.
+        tz (Optional[str]): Time zone of the time steps (None for naive dates).
+    """
+
+    __slots__ = ('name', 'values', 'timestamps', 'tz')
+
+    def __init__(self, name: Any, values: np.ndarray, timestamps: np.ndarray, tz: Optional[str] = None):
+        """
+        Initializes the SeriesCore. The arrays are not copied.
+
+        Args:
+            name (Any): Identifier of the series.
+            values (np.ndarray): Values of the series, as float64 or float32.
+            timestamps (np.ndarray): Time steps, as int64 nanoseconds since the epoch.
+            tz (Optional[str], optional): Time zone of the time steps. Defaults to None (naive dates).
+        """
+
+        assert values.dtype.name in VALUES_DTYPES, UNKNOWN_DTYPE_ERROR
+        assert values.shape == timestamps.shape, LENGTH_ERROR
+
+        self.name = name
+        self.values = self._read_only(values)
+        self.timestamps = self._read_only(timestamps.astype(np.int64, copy=False))
+        self.tz = tz
+
+    def __len__(self) -> int:
+        return self.values.shape[0]
+
+    def __repr__(self) -> str:
+        return f'SeriesCore(name={self.name!r}, n={len(self)}, dtype={self.values.dtype.name})'
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Size of the values and time steps, in bytes.
+        """
+
+        return self.values.nbytes + self.timestamps.nbytes
+
+    @classmethod
+    def from_frame(cls,
+                   df: pd.DataFrame,
+                   id_col: str = 'unique_id',
+                   time_col: str = 'ds',
+                   target_col: str = 'y',
+                   dtype: str = 'float64') -> 'SeriesCore':
+        """
+        Builds the compact representation of a single series.
+
+        Args:
+            df (pd.DataFrame): Series following a Nixtla-based structure.
+            id_col (str, optional): Column name for the time series identifier. Defaults to 'unique_id'.
+            time_col (str, optional): Column name for the time variable. Defaults to 'ds'.
+            target_col (str, optional): Column name for the target variable. Defaults to 'y'.
+            dtype (str, optional): Type of the values, 'float64' or 'float32' (half the size, with about
+            7 significant digits). Defaults to 'float64'.
+
+        Returns:
+            SeriesCore: Compact series.
+        """
+
+        assert dtype in VALUES_DTYPES, UNKNOWN_DTYPE_ERROR
+
+        timestamps, tz = cls._to_epoch(df[time_col])
+
+        return cls(name=df[id_col].values[0],
+                   values=df[target_col].to_numpy(dtype=dtype),
+                   timestamps=timestamps,
+                   tz=tz)
+
+    @classmethod
+    def split_panel(cls,
+                    df: pd.DataFrame,
+                    id_col: str = 'unique_id',
+                    time_col: str = 'ds',
+                    target_col: str = 'y',
+                    dtype: str = 'float64') -> List['SeriesCore']:
+        """
+        Splits a panel into the compact representation of each series.
+
+        The values and time steps of the panel are copied once, grouped by series (in order of first
+        appearance, keeping the order of the rows within each series, as in groupby(sort=False)), and each
+        SeriesCore holds a view of its slice. Rows with a missing identifier are dropped.
+
+        Args:
+            df (pd.DataFrame): Panel dataset following a Nixtla-based structure.
+            id_col (str, optional): Column name for the time series identifier. Defaults to 'unique_id'.
+            time_col (str, optional): Column name for the time variable. Defaults to 'ds'.
+            target_col (str, optional): Column name for the target variable. Defaults to 'y'.
+            dtype (str, optional): Type of the values, 'float64' or 'float32'. Defaults to 'float64'.
+
+        Returns:
+            List[SeriesCore]: Compact series, by order of first appearance.
+        """
+
+        assert dtype in VALUES_DTYPES, UNKNOWN_DTYPE_ERROR
+
+        codes, uids = pd.factorize(df[id_col], sort=False)
+
+        order = np.argsort(codes, kind='stable')
+        order = order[codes[order] >= 0]
+
+        timestamps, tz = cls._to_epoch(df[time_col])
+        timestamps = timestamps[order]
+        values = df[target_col].to_numpy(dtype=dtype)[order]
+
+        bounds = np.cumsum(np.bincount(codes[order], minlength=len(uids)))[:-1]
+
+        return [cls(name=uid, values=values_, timestamps=timestamps_, tz=tz)
+                for uid, values_, timestamps_ in zip(uids, np.split(values, bounds), np.split(timestamps, bounds))]
+
+    def time_index(self) -> pd.DatetimeIndex:
+        """
+        Builds the time steps as a pd.DatetimeIndex (a view of the timestamps, for naive dates).
+
+        Returns:
+            pd.DatetimeIndex: Time steps.
+        """
+
+        index = pd.DatetimeIndex(self.timestamps.view('datetime64[ns]'))
+
+        if self.tz is not None:
+            index = index.tz_localize('UTC').tz_convert(self.tz)
+
+        return index
+
+    def to_series(self, name: str = 'y') -> pd.Series:
+        """
+        Builds the series as a pd.Series indexed by time, over the values array.
+
+        Args:
+            name (str, optional): Name of the series. Defaults to 'y'.
+
+        Returns:
+            pd.Series: Series.
+        """
+
+        return pd.Series(self.values, index=self.time_index(), name=name, copy=False)
+
+    def to_frame(self, id_col: str = 'unique_id', time_col: str = 'ds', target_col: str = 'y') -> pd.DataFrame:
+        """
+        Builds the series as a DataFrame following a Nixtla-based structure, over the arrays of the series.
+
+        Args:
+            id_col (str, optional): Column name for the time series identifier. Defaults to 'unique_id'.
+            time_col (str, optional): Column name for the time variable. Defaults to 'ds'.
+            target_col (str, optional): Column name for the target variable. Defaults to 'y'.
+
+        Returns:
+            pd.DataFrame: Series with the identifier, time, and target columns.
+        """
+
+        ids = np.empty(len(self), dtype=object)
+        ids.fill(self.name)
+
+        return pd.DataFrame({id_col: ids, time_col: self.time_index(), target_col: self.values}, copy=False)
+
+    @staticmethod
+    def _to_epoch(time_steps: pd.Series):
+        """
+        Converts the time steps to int64 nanoseconds since the epoch, and gets their time zone.
+        """
+
+        tz = getattr(time_steps.dt, 'tz', None)
+
+        timestamps = time_steps.to_numpy(dtype='datetime64[ns]').view(np.int64)
+
+        return timestamps, None if tz is None else str(tz)
+
+    @staticmethod
+    def _read_only(arr: np.ndarray) -> np.ndarray:
+        arr = arr.view()
+        arr.flags.writeable = False
+
+        return arr
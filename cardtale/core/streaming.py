@@ -0,0 +1,961 @@
+import copy
+import math
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from cardtale.analytics.operations.tsa.log import LogTransformation
+
+# number of values kept as they are by a QuantileSketch; up to this size, its quantiles are exact
+SKETCH_EXACT_SIZE = 10000
+# compression of a QuantileSketch beyond SKETCH_EXACT_SIZE (it keeps about SKETCH_COMPRESSION / 2 centroids)
+SKETCH_COMPRESSION = 1000
+
+MERGE_ORDER_ERROR = 'The accumulator to merge must follow this one in time'
+MERGE_LAGS_ERROR = 'The accumulators to merge must have the same number of lags'
+
+
+class MomentsAccumulator:
+    """
+    Running count, mean, and central moments (up to the 4th) of a stream of values.
+
+    Values are consumed by chunks: the moments of each chunk are computed in one vectorized pass, and
+    combined with the running moments with the pairwise update of Chan et al. (generalized to the 3rd and
+    4th moments by Pébay), the chunked form of Welford's algorithm. The same update merges the accumulators
+    of different partitions of a series. Missing values are skipped.
+
+    The estimators follow pandas (describe) and scipy.stats: sample standard deviation (ddof=1), and
+    biased skewness and (excess) kurtosis.
+
+    Attributes:
+        n (int): Number of values.
+        mean (float): Mean of the values.
+        m2 (float): Sum of the squared deviations from the mean.
+        m3 (float): Sum of the cubed deviations from the mean.
+        m4 (float): Sum of the deviations from the mean to the 4th power.
+        min (float): Minimum value.
+        max (float): Maximum value.
+    """
+
+    def __init__(self):
+        self.n = 0
+        self.mean = np.nan
+        self.m2 = 0.0
+        self.m3 = 0.0
+        self.m4 = 0.0
+        self.min = np.nan
+        self.max = np.nan
+
+    @classmethod
+    def from_values(cls, values: np.ndarray) -> 'MomentsAccumulator':
+        """
+        Computes the moments of a chunk of values.
+
+        Args:
+            values (np.ndarray): Values (float).
+
+        Returns:
+            MomentsAccumulator: Moments of the chunk.
+        """
+
+        acc = cls()
+
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return acc
+
+        acc.n = len(values)
+        acc.mean = values.mean()
+
+        dev = values - acc.mean
+        dev2 = dev ** 2
+
+        acc.m2 = dev2.sum()
+        acc.m3 = (dev2 * dev).sum()
+        acc.m4 = (dev2 ** 2).sum()
+        acc.min, acc.max = values.min(), values.max()
+
+        return acc
+
+    def update(self, values: np.ndarray) -> 'MomentsAccumulator':
+        """
+        Adds a chunk of values.
+        """
+
+        return self.merge(self.from_values(values))
+
+    def merge(self, other: 'MomentsAccumulator') -> 'MomentsAccumulator':
+        """
+        Merges the moments of another set of values (in place).
+
+        Args:
+            other (MomentsAccumulator): Moments of the other values.
+
+        Returns:
+            MomentsAccumulator: This accumulator, updated.
+        """
+
+        if other.n == 0:
+            return self
+
+        if self.n == 0:
+            self.__dict__.update(other.__dict__)
+            return self
+
+        n_a, n_b = self.n, other.n
+        n = n_a + n_b
+
+        delta = other.mean - self.mean
+        delta_n = delta / n
+
+        m2 = self.m2 + other.m2 + delta * delta_n * n_a * n_b
+        m3 = self.m3 + other.m3 \
+            + delta * delta_n ** 2 * n_a * n_b * (n_a - n_b) \
+            + 3 * delta_n * (n_a * other.m2 - n_b * self.m2)
+        m4 = self.m4 + other.m4 \
+            + delta * delta_n ** 3 * n_a * n_b * (n_a ** 2 - n_a * n_b + n_b ** 2) \
+            + 6 * delta_n ** 2 * (n_a ** 2 * other.m2 + n_b ** 2 * self.m2) \
+            + 4 * delta_n * (n_a * other.m3 - n_b * self.m3)
+
+        self.mean = self.mean + delta_n * n_b
+        self.m2, self.m3, self.m4 = m2, m3, m4
+        self.min = np.fmin(self.min, other.min)
+        self.max = np.fmax(self.max, other.max)
+        self.n = n
+
+        return self
+
+    def std(self) -> float:
+        """
+        Sample standard deviation (ddof=1).
+        """
+
+        if self.n < 2:
+            return np.nan
+
+        return np.sqrt(self.m2 / (self.n - 1))
+
+    def skewness(self) -> float:
+        """
+        Biased skewness, as scipy.stats.skew (NaN for constant values).
+        """
+
+        if self.n == 0 or self._is_constant():
+            return np.nan
+
+        return (self.m3 / self.n) / (self.m2 / self.n) ** 1.5
+
+    def kurtosis(self) -> float:
+        """
+        Biased excess (Fisher) kurtosis, as scipy.stats.kurtosis (NaN for constant values).
+        """
+
+        if self.n == 0 or self._is_constant():
+            return np.nan
+
+        return (self.m4 / self.n) / (self.m2 / self.n) ** 2 - 3.0
+
+    def skewtest(self) -> float:
+        """
+        P-value of the D'Agostino test that the skewness is that of a normal distribution, computed from
+        the moments, as scipy.stats.skewtest. NaN with fewer than 8 values.
+        """
+
+        n = self.n
+        if n < 8:
+            return np.nan
+
+        y = self.skewness() * math.sqrt(((n + 1) * (n + 3)) / (6.0 * (n - 2)))
+        beta2 = (3.0 * (n ** 2 + 27 * n - 70) * (n + 1) * (n + 3) /
+                 ((n - 2.0) * (n + 5) * (n + 7) * (n + 9)))
+        w2 = -1 + math.sqrt(2 * (beta2 - 1))
+        delta = 1 / math.sqrt(0.5 * math.log(w2))
+        alpha = math.sqrt(2.0 / (w2 - 1))
+        y = 1 if y == 0 else y
+
+        z = delta * np.log(y / alpha + np.sqrt((y / alpha) ** 2 + 1))
+
+        return self._two_sided_pvalue(z)
+
+    def kurtosistest(self) -> float:
+        """
+        P-value of the Anscombe-Glynn test that the kurtosis is that of a normal distribution, computed
+        from the moments, as scipy.stats.kurtosistest. NaN with fewer than 5 values.
+        """
+
+        n = self.n
+        if n < 5:
+            return np.nan
+
+        b2 = self.kurtosis() + 3.0
+
+        e = 3.0 * (n - 1) / (n + 1)
+        var_b2 = 24.0 * n * (n - 2) * (n - 3) / ((n + 1) * (n + 1.) * (n + 3) * (n + 5))
+        x = (b2 - e) / var_b2 ** 0.5
+        sqrt_beta1 = 6.0 * (n * n - 5 * n + 2) / ((n + 7) * (n + 9)) * \
+            ((6.0 * (n + 3) * (n + 5)) / (n * (n - 2) * (n - 3))) ** 0.5
+        a = 6.0 + 8.0 / sqrt_beta1 * (2.0 / sqrt_beta1 + (1 + 4.0 / (sqrt_beta1 ** 2)) ** 0.5)
+        term1 = 1 - 2 / (9.0 * a)
+        denom = 1 + x * (2 / (a - 4.0)) ** 0.5
+        if denom == 0 or np.isnan(denom):
+            return np.nan
+
+        term2 = np.sign(denom) * ((1 - 2.0 / a) / abs(denom)) ** (1 / 3)
+
+        z = (term1 - term2) / (2 / (9.0 * a)) ** 0.5
+
+        return self._two_sided_pvalue(z)
+
+    def _is_constant(self) -> bool:
+        # same threshold as the constant-input check of scipy.stats
+        return self.m2 / self.n <= (np.finfo(float).eps * self.mean) ** 2
+
+    @staticmethod
+    def _two_sided_pvalue(z: float) -> float:
+        if np.isnan(z):
+            return np.nan
+
+        return math.erfc(abs(z) / math.sqrt(2))
+
+
+class QuantileSketch:
+    """
+    Mergeable sketch of the distribution of a stream of values, for quantiles and ranks.
+
+    The values are kept as they are up to exact_size values (or always, if exact_size is None), and the
+    quantiles are exact (with linear interpolation, as pandas and numpy). Beyond that, the values are
+    compressed into weighted centroids, as in a merging t-digest: the centroids are small near the tails
+    (where the scale function is steep) and large in the middle, so the extreme quantiles stay accurate with
+    bounded memory. Missing values are skipped.
+
+    Attributes:
+        exact_size (Optional[int]): Number of values kept as they are (None for no limit).
+        compression (int): Compression of the centroids (about compression / 2 centroids are kept).
+        n (int): Number of values.
+        min (float): Minimum value.
+        max (float): Maximum value.
+        values (List[np.ndarray]): Chunks of values not compressed yet.
+        is_sorted (bool): Whether the values are in a single sorted chunk.
+        means (np.ndarray): Means of the centroids (None while the sketch is exact).
+        weights (np.ndarray): Weights of the centroids (None while the sketch is exact).
+    """
+
+    def __init__(self, exact_size: Optional[int] = SKETCH_EXACT_SIZE, compression: int = SKETCH_COMPRESSION):
+        self.exact_size = exact_size
+        self.compression = compression
+
+        self.n = 0
+        self.min = np.nan
+        self.max = np.nan
+
+        self.values: List[np.ndarray] = []
+        self.is_sorted = False
+        self.means: Optional[np.ndarray] = None
+        self.weights: Optional[np.ndarray] = None
+
+    @property
+    def is_exact(self) -> bool:
+        return self.means is None
+
+    def update(self, values: np.ndarray) -> 'QuantileSketch':
+        """
+        Adds a chunk of values.
+
+        Args:
+            values (np.ndarray): Values (float). They are copied, so chunks of a memory-mapped array are
+            not kept open.
+
+        Returns:
+            QuantileSketch: This sketch, updated.
+        """
+
+        values = np.array(values[~np.isnan(values)], dtype=float)
+        if len(values) == 0:
+            return self
+
+        self.n += len(values)
+        self.min = np.fmin(self.min, values.min())
+        self.max = np.fmax(self.max, values.max())
+        self.values.append(values)
+        self.is_sorted = False
+
+        self._check_size()
+
+        return self
+
+    def merge(self, other: 'QuantileSketch') -> 'QuantileSketch':
+        """
+        Merges another sketch (in place).
+        """
+
+        if other.n == 0:
+            return self
+
+        self.n += other.n
+        self.min = np.fmin(self.min, other.min)
+        self.max = np.fmax(self.max, other.max)
+        self.values.extend(other.values)
+        self.is_sorted = False
+
+        if not other.is_exact:
+            self._add_centroids(other.means, other.weights)
+
+        self._check_size()
+
+        return self
+
+    def quantile(self, q: float) -> float:
+        """
+        Gets a quantile of the values.
+
+        Args:
+            q (float): Probability, between 0 and 1.
+
+        Returns:
+            float: Quantile (exact, with linear interpolation, while the sketch is exact).
+        """
+
+        if self.n == 0:
+            return np.nan
+
+        if self.is_exact:
+            return np.quantile(self._sorted_values(), q)
+
+        means, ranks = self._centroid_ranks()
+
+        return np.interp(q * (self.n - 1), ranks, means)
+
+    def count_above(self, x: float) -> float:
+        """
+        Number of values above x (estimated from the centroids once the sketch is compressed).
+        """
+
+        if self.n == 0 or np.isnan(x) or x >= self.max:
+            return 0
+        if x < self.min:
+            return self.n
+
+        if self.is_exact:
+            values = self._sorted_values()
+            return len(values) - np.searchsorted(values, x, side='right')
+
+        means, ranks = self._centroid_ranks()
+
+        return self.n - 1 - np.interp(x, means, ranks)
+
+    def count_below(self, x: float) -> float:
+        """
+        Number of values below x (estimated from the centroids once the sketch is compressed).
+        """
+
+        if self.n == 0 or np.isnan(x) or x <= self.min:
+            return 0
+        if x > self.max:
+            return self.n
+
+        if self.is_exact:
+            return np.searchsorted(self._sorted_values(), x, side='left')
+
+        means, ranks = self._centroid_ranks()
+
+        return np.interp(x, means, ranks)
+
+    def _sorted_values(self) -> np.ndarray:
+        if not self.is_sorted:
+            self.values = [np.sort(np.concatenate(self.values))]
+            self.is_sorted = True
+
+        return self.values[0]
+
+    def _centroid_ranks(self):
+        """
+        Compresses the pending values, and gets the centroids with the (0-based) rank of their centers,
+        bounded by the minimum and maximum values.
+        """
+
+        self._compress()
+
+        ranks = np.cumsum(self.weights) - self.weights / 2 - 0.5
+
+        means = np.concatenate([[self.min], self.means, [self.max]])
+        ranks = np.concatenate([[0], ranks, [self.n - 1]])
+
+        return means, ranks
+
+    def _check_size(self):
+        n_pending = sum(len(x) for x in self.values)
+
+        if self.is_exact and (self.exact_size is None or self.n <= self.exact_size):
+            return
+
+        if n_pending > self.compression:
+            self._compress()
+
+    def _add_centroids(self, means: np.ndarray, weights: np.ndarray):
+        if self.is_exact:
+            self.means, self.weights = means, weights
+        else:
+            self.means = np.concatenate([self.means, means])
+            self.weights = np.concatenate([self.weights, weights])
+
+    def _compress(self):
+        """
+        Merges the pending values into the centroids. Neighbouring values (by order) are grouped while
+        they fit in one unit of the scale function k(q) = compression / (2 * pi) * arcsin(2q - 1).
+        """
+
+        if len(self.values) > 0:
+            values = np.concatenate(self.values)
+            self._add_centroids(values, np.ones_like(values))
+            self.values, self.is_sorted = [], False
+
+        order = np.argsort(self.means, kind='mergesort')
+        means, weights = self.means[order], self.weights[order]
+
+        q_mid = (np.cumsum(weights) - weights / 2) / weights.sum()
+        k = self.compression / (2 * np.pi) * np.arcsin(2 * q_mid - 1)
+
+        groups = np.floor(k - k[0]).astype(int)
+
+        weights_g = np.bincount(groups, weights=weights)
+        sums_g = np.bincount(groups, weights=weights * means)
+        not_empty = weights_g > 0
+
+        self.weights = weights_g[not_empty]
+        self.means = sums_g[not_empty] / self.weights
+
+
+class AutoCovarianceAccumulator:
+    """
+    Running sums for the auto-correlation of a stream of values, up to n_lags.
+
+    For each lag k, the sum of the products of the values k steps apart is updated with the products within
+    each chunk, and across the boundary with the previous chunk (its last n_lags values are kept). The sums
+    are relative to a shift (the first value), so they do not lose precision for series with a large level.
+    With the first and last n_lags values, the auto-covariances (about the mean of the whole stream) are
+    recovered exactly, so the ACF matches that of statsmodels (adjusted=False). Missing values propagate,
+    as in statsmodels with missing='none'.
+
+    Attributes:
+        n_lags (int): Number of lags.
+        n (int): Number of values.
+        shift (float): Value subtracted before computing the sums.
+        total (float): Sum of the shifted values.
+        products (np.ndarray): Sum of the products of the shifted values k steps apart, for k in 0..n_lags.
+        head (np.ndarray): First n_lags values.
+        tail (np.ndarray): Last n_lags values.
+    """
+
+    def __init__(self, n_lags: int):
+        self.n_lags = n_lags
+
+        self.n = 0
+        self.shift = 0.0
+        self.total = 0.0
+        self.products = np.zeros(n_lags + 1)
+        self.head = np.array([])
+        self.tail = np.array([])
+
+    @classmethod
+    def from_values(cls, values: np.ndarray, n_lags: int) -> 'AutoCovarianceAccumulator':
+        """
+        Computes the sums of a chunk of values.
+
+        Args:
+            values (np.ndarray): Values (float).
+            n_lags (int): Number of lags.
+
+        Returns:
+            AutoCovarianceAccumulator: Sums of the chunk.
+        """
+
+        acc = cls(n_lags)
+
+        acc.n = len(values)
+        if acc.n == 0:
+            return acc
+
+        finite = values[np.isfinite(values)]
+        acc.shift = finite[0] if len(finite) > 0 else 0.0
+
+        shifted = values - acc.shift
+
+        acc.total = shifted.sum()
+        for k in range(min(n_lags + 1, acc.n)):
+            acc.products[k] = shifted[:acc.n - k] @ shifted[k:]
+
+        acc.head = np.array(values[:n_lags], dtype=float)
+        acc.tail = np.array(values[-n_lags:], dtype=float) if n_lags > 0 else np.array([])
+
+        return acc
+
+    def update(self, values: np.ndarray) -> 'AutoCovarianceAccumulator':
+        """
+        Adds a chunk of values, which follows the previous ones.
+        """
+
+        return self.merge(self.from_values(values, self.n_lags))
+
+    def merge(self, other: 'AutoCovarianceAccumulator') -> 'AutoCovarianceAccumulator':
+        """
+        Merges the sums of the values that follow (in place).
+
+        Args:
+            other (AutoCovarianceAccumulator): Sums of the values right after the ones of this accumulator.
+
+        Returns:
+            AutoCovarianceAccumulator: This accumulator, updated.
+        """
+
+        assert other.n_lags == self.n_lags, MERGE_LAGS_ERROR
+
+        if other.n == 0:
+            return self
+
+        if self.n == 0:
+            self.__dict__.update(copy.deepcopy(other.__dict__))
+            return self
+
+        # sums of the other values, relative to the shift of this accumulator
+        delta = other.shift - self.shift
+        for k in range(min(self.n_lags + 1, other.n)):
+            edge_sums = other.edge_sum(k)
+            self.products[k] += other.products[k] + delta * edge_sums + (other.n - k) * delta ** 2
+
+        # products across the boundary
+        tail = self.tail - self.shift
+        head = other.head - self.shift
+        for k in range(1, self.n_lags + 1):
+            start, end = max(0, k - len(tail)), min(k, len(head))
+            if end > start:
+                self.products[k] += tail[len(tail) - k + start:len(tail) - k + end] @ head[start:end]
+
+        self.total += other.total + other.n * delta
+        self.head = np.concatenate([self.head, other.head])[:self.n_lags]
+        self.tail = np.concatenate([self.tail, other.tail])[-self.n_lags:]
+        self.n += other.n
+
+        return self
+
+    def edge_sum(self, k: int) -> float:
+        """
+        Sum of the shifted values without the last k, plus the sum without the first k.
+        """
+
+        if k == 0:
+            return 2 * self.total
+
+        return 2 * self.total - (self.tail[-k:] - self.shift).sum() - (self.head[:k] - self.shift).sum()
+
+    def autocovariance(self) -> np.ndarray:
+        """
+        Auto-covariances (about the mean, divided by n) for the lags 0..n_lags.
+        """
+
+        mean = self.total / self.n
+
+        acov = np.zeros(self.n_lags + 1)
+        for k in range(min(self.n_lags + 1, self.n)):
+            acov[k] = self.products[k] - mean * self.edge_sum(k) + (self.n - k) * mean ** 2
+
+        return acov / self.n
+
+    def acf(self) -> np.ndarray:
+        """
+        Auto-correlation function for the lags 0..n_lags.
+        """
+
+        acov = self.autocovariance()
+
+        return acov / acov[0]
+
+    def pacf(self) -> np.ndarray:
+        """
+        Partial auto-correlation function for the lags 0..n_lags, from the Yule-Walker equations
+        with the adjusted auto-covariances (the default method of statsmodels), solved with the
+        Durbin-Levinson recursion.
+        """
+
+        acov = self.autocovariance()
+        acov = acov * self.n / (self.n - np.arange(self.n_lags + 1))
+        r = acov / acov[0]
+
+        pacf = np.ones(self.n_lags + 1)
+        phi = np.array([])
+        for k in range(1, self.n_lags + 1):
+            phi_kk = (r[k] - phi @ r[k - 1:0:-1]) / (1 - phi @ r[1:k])
+            phi = np.concatenate([phi - phi_kk * phi[::-1], [phi_kk]])
+            pacf[k] = phi_kk
+
+        return pacf
+
+
+class ReturnsAccumulator:
+    """
+    Running statistics of the log returns of a series (see LogTransformation.returns): moments,
+    quantiles, upward and downward moves, direction changes, and the largest moves.
+
+    Attributes:
+        moments (MomentsAccumulator): Moments of the returns.
+        quantiles (QuantileSketch): Distribution of the returns.
+        up_sum (float): Sum of the positive returns.
+        up_count (int): Number of positive returns.
+        down_sum (float): Sum of the negative returns.
+        down_count (int): Number of negative returns.
+        direction_changes (int): Number of changes between positive and non-positive returns.
+        first_up (bool): Whether the first return is positive.
+        last_up (bool): Whether the last return is positive.
+        largest_increase (float): Largest return.
+        largest_increase_time (pd.Timestamp): Time step where the largest increase starts.
+        largest_decrease (float): Smallest return.
+        largest_decrease_time (pd.Timestamp): Time step where the largest decrease starts.
+    """
+
+    def __init__(self, exact_size: Optional[int] = SKETCH_EXACT_SIZE):
+        self.moments = MomentsAccumulator()
+        self.quantiles = QuantileSketch(exact_size=exact_size)
+
+        self.up_sum, self.up_count = 0.0, 0
+        self.down_sum, self.down_count = 0.0, 0
+
+        self.direction_changes = 0
+        self.first_up: Optional[bool] = None
+        self.last_up: Optional[bool] = None
+
+        self.largest_increase, self.largest_increase_time = np.nan, None
+        self.largest_decrease, self.largest_decrease_time = np.nan, None
+
+    @property
+    def n(self) -> int:
+        return self.moments.n
+
+    @classmethod
+    def from_values(cls,
+                    returns: np.ndarray,
+                    start_times: Optional[pd.Index],
+                    exact_size: Optional[int] = SKETCH_EXACT_SIZE) -> 'ReturnsAccumulator':
+        """
+        Computes the statistics of a chunk of (non-missing) returns.
+
+        Args:
+            returns (np.ndarray): Returns.
+            start_times (Optional[pd.Index]): Time step where each return starts (None if unknown).
+            exact_size (Optional[int], optional): Exact size of the quantile sketch. Defaults to SKETCH_EXACT_SIZE.
+
+        Returns:
+            ReturnsAccumulator: Statistics of the chunk.
+        """
+
+        acc = cls(exact_size=exact_size)
+        if len(returns) == 0:
+            return acc
+
+        acc.moments.update(returns)
+        acc.quantiles.update(returns)
+
+        is_up, is_down = returns > 0, returns < 0
+        acc.up_sum, acc.up_count = returns[is_up].sum(), int(is_up.sum())
+        acc.down_sum, acc.down_count = returns[is_down].sum(), int(is_down.sum())
+
+        acc.direction_changes = int(np.count_nonzero(is_up[1:] != is_up[:-1]))
+        acc.first_up, acc.last_up = bool(is_up[0]), bool(is_up[-1])
+
+        i_max, i_min = returns.argmax(), returns.argmin()
+        acc.largest_increase, acc.largest_decrease = returns[i_max], returns[i_min]
+        if start_times is not None:
+            acc.largest_increase_time, acc.largest_decrease_time = start_times[i_max], start_times[i_min]
+
+        return acc
+
+    def merge(self, other: 'ReturnsAccumulator') -> 'ReturnsAccumulator':
+        """
+        Merges the statistics of the returns that follow (in place).
+        """
+
+        if other.n == 0:
+            return self
+
+        if self.n == 0:
+            self.__dict__.update(copy.deepcopy(other.__dict__))
+            return self
+
+        self.moments.merge(other.moments)
+        self.quantiles.merge(other.quantiles)
+
+        self.up_sum += other.up_sum
+        self.up_count += other.up_count
+        self.down_sum += other.down_sum
+        self.down_count += other.down_count
+
+        self.direction_changes += other.direction_changes + int(self.last_up != other.first_up)
+        self.last_up = other.last_up
+
+        # ties are kept at their first occurrence, as np.argmax
+        if other.largest_increase > self.largest_increase:
+            self.largest_increase, self.largest_increase_time = other.largest_increase, other.largest_increase_time
+        if other.largest_decrease < self.largest_decrease:
+            self.largest_decrease, self.largest_decrease_time = other.largest_decrease, other.largest_decrease_time
+
+        return self
+
+    def summary(self) -> Dict:
+        """
+        Growth statistics, with the keys of SeriesProfile.growth (not rounded).
+        """
+
+        n = self.n
+
+        mean, std = self.moments.mean, self.moments.std()
+        upper_bound, lower_bound = mean + 2 * std, mean - 2 * std
+
+        if n > 0:
+            n_extreme = self.quantiles.count_above(upper_bound) + self.quantiles.count_below(lower_bound)
+            up_prob, down_prob = self.up_count / n * 100, self.down_count / n * 100
+            extreme_pct = n_extreme / n * 100
+        else:
+            up_prob, down_prob, extreme_pct = np.nan, np.nan, np.nan
+
+        return {
+            'upward_moves_mag': self.up_sum / self.up_count if self.up_count > 0 else np.nan,
+            'upward_moves_prob': up_prob,
+            'downward_moves_mag': self.down_sum / self.down_count if self.down_count > 0 else np.nan,
+            'downward_moves_prob': down_prob,
+            'direction_changes_perc': self.direction_changes / (n - 1) * 100 if n > 1 else np.nan,
+            'average_ret': mean,
+            'median_ret': self.quantiles.quantile(0.5),
+            'growth_vol': std,
+            'kurtosis': self.moments.kurtosis(),
+            'skewness': self.moments.skewness(),
+            'extreme_pct': extreme_pct,
+            'largest_increase': self.largest_increase,
+            'largest_decrease': self.largest_decrease,
+            'direction_changes': self.direction_changes,
+            'kurtosis_pvalue': self.moments.kurtosistest(),
+            'skewness_pvalue': self.moments.skewtest(),
+            'largest_increase_time': self.largest_increase_time,
+            'largest_decrease_time': self.largest_decrease_time,
+        }
+
+
+class ProfileAccumulator:
+    """
+    Single-pass profile of a time series, consumed by chunks (e.g., slices of a memory-mapped array, or the
+    new observations appended to a series), and mergeable across consecutive partitions of the series.
+
+    Each chunk is read once: it updates the moments and the quantile sketch of the values, the percentage
+    changes and the log returns (with the last valid value carried over from the previous chunk), and,
+    optionally, the sums of the auto-correlation. Missing values are skipped, except for the auto-correlation.
+
+    Attributes:
+        n_lags (int): Number of lags of the auto-correlation (0 to skip it).
+        exact_size (Optional[int]): Number of values kept as they are by the quantile sketches (None for no limit).
+        n (int): Number of observations, including missing values.
+        n_missing (int): Number of missing values.
+        first_value (float): First observation.
+        last_value (float): Last observation.
+        first_time (pd.Timestamp): Time step of the first observation.
+        last_time (pd.Timestamp): Time step of the last observation.
+        first_valid (Tuple): First non-missing observation and its time step.
+        last_valid (Tuple): Last non-missing observation and its time step.
+        moments (MomentsAccumulator): Moments of the observations.
+        quantiles (QuantileSketch): Distribution of the observations.
+        change_sum (float): Sum of the percentage changes.
+        change_count (int): Number of percentage changes.
+        change_quantiles (QuantileSketch): Distribution of the percentage changes.
+        returns (ReturnsAccumulator): Statistics of the log returns.
+        autocov (Optional[AutoCovarianceAccumulator]): Sums of the auto-correlation (None if n_lags is 0).
+    """
+
+    def __init__(self, n_lags: int = 0, exact_size: Optional[int] = SKETCH_EXACT_SIZE):
+        """
+        Initializes an empty ProfileAccumulator.
+
+        Args:
+            n_lags (int, optional): Number of lags of the auto-correlation (0 to skip it). Defaults to 0.
+            exact_size (Optional[int], optional): Number of values kept as they are by the quantile sketches
+            (the quantiles are exact up to this size; None for no limit). Defaults to SKETCH_EXACT_SIZE.
+        """
+
+        self.n_lags = n_lags
+        self.exact_size = exact_size
+
+        self.n = 0
+        self.n_missing = 0
+        self.first_value, self.last_value = np.nan, np.nan
+        self.first_time, self.last_time = None, None
+        self.first_valid, self.last_valid = None, None
+
+        self.moments = MomentsAccumulator()
+        self.quantiles = QuantileSketch(exact_size=exact_size)
+
+        self.change_sum, self.change_count = 0.0, 0
+        self.change_quantiles = QuantileSketch(exact_size=exact_size)
+
+        self.returns = ReturnsAccumulator(exact_size=exact_size)
+        self.autocov = AutoCovarianceAccumulator(n_lags) if n_lags > 0 else None
+
+    @classmethod
+    def from_chunk(cls,
+                   values: np.ndarray,
+                   index: Optional[pd.Index] = None,
+                   n_lags: int = 0,
+                   exact_size: Optional[int] = SKETCH_EXACT_SIZE) -> 'ProfileAccumulator':
+        """
+        Profiles a chunk of a series.
+
+        Args:
+            values (np.ndarray): Observations.
+            index (Optional[pd.Index], optional): Time steps of the observations. Defaults to None (unknown).
+            n_lags (int, optional): Number of lags of the auto-correlation. Defaults to 0.
+            exact_size (Optional[int], optional): Number of values kept as they are by the quantile sketches
+            (None for no limit). Defaults to SKETCH_EXACT_SIZE.
+
+        Returns:
+            ProfileAccumulator: Profile of the chunk.
+        """
+
+        acc = cls(n_lags=n_lags, exact_size=exact_size)
+
+        values = np.asarray(values, dtype=float)
+        acc.n = len(values)
+        if acc.n == 0:
+            return acc
+
+        is_valid = ~np.isnan(values)
+        valid = values[is_valid]
+        valid_times = index[is_valid] if index is not None else None
+
+        acc.n_missing = acc.n - len(valid)
+        acc.first_value, acc.last_value = values[0], values[-1]
+        if index is not None:
+            acc.first_time, acc.last_time = index[0], index[-1]
+
+        if len(valid) > 0:
+            acc.first_valid = (valid[0], valid_times[0] if index is not None else None)
+            acc.last_valid = (valid[-1], valid_times[-1] if index is not None else None)
+
+        acc.moments.update(valid)
+        acc.quantiles.update(valid)
+
+        acc.add_changes(valid[:-1], valid[1:], valid_times[:-1] if index is not None else None)
+
+        if acc.autocov is not None:
+            acc.autocov.update(values)
+
+        return acc
+
+    def update(self, values: np.ndarray, index: Optional[pd.Index] = None) -> 'ProfileAccumulator':
+        """
+        Adds a chunk of observations, which follows the previous ones.
+
+        Args:
+            values (np.ndarray): Observations.
+            index (Optional[pd.Index], optional): Time steps of the observations. Defaults to None.
+
+        Returns:
+            ProfileAccumulator: This accumulator, updated.
+        """
+
+        return self.merge(self.from_chunk(values, index, n_lags=self.n_lags, exact_size=self.exact_size))
+
+    def merge(self, other: 'ProfileAccumulator') -> 'ProfileAccumulator':
+        """
+        Merges the profile of the observations that follow (in place), e.g., of the next partition of a series.
+
+        Args:
+            other (ProfileAccumulator): Profile of the observations right after the ones of this accumulator.
+
+        Returns:
+            ProfileAccumulator: This accumulator, updated.
+        """
+
+        assert other.n_lags == self.n_lags, MERGE_LAGS_ERROR
+
+        if other.n == 0:
+            return self
+
+        if self.n == 0:
+            self.__dict__.update(copy.deepcopy(other.__dict__))
+            return self
+
+        if self.last_time is not None and other.first_time is not None:
+            assert other.first_time > self.last_time, MERGE_ORDER_ERROR
+
+        if self.last_valid is not None and other.first_valid is not None:
+            # change between the last valid observation of this accumulator and the first one of the other
+            self.add_changes(np.array([self.last_valid[0]]),
+                             np.array([other.first_valid[0]]),
+                             pd.Index([self.last_valid[1]]) if self.last_valid[1] is not None else None)
+
+        self.moments.merge(other.moments)
+        self.quantiles.merge(other.quantiles)
+        self.change_sum += other.change_sum
+        self.change_count += other.change_count
+        self.change_quantiles.merge(other.change_quantiles)
+        self.returns.merge(other.returns)
+
+        if self.autocov is not None:
+            self.autocov.merge(other.autocov)
+
+        self.n += other.n
+        self.n_missing += other.n_missing
+        self.last_value, self.last_time = other.last_value, other.last_time
+        self.first_valid = self.first_valid or other.first_valid
+        self.last_valid = other.last_valid or self.last_valid
+
+        return self
+
+    def add_changes(self, previous: np.ndarray, current: np.ndarray, start_times: Optional[pd.Index]):
+        """
+        Adds the percentage changes and log returns between consecutive valid observations.
+
+        Args:
+            previous (np.ndarray): Observations before each change.
+            current (np.ndarray): Observations after each change.
+            start_times (Optional[pd.Index]): Time steps of the observations before each change.
+        """
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            changes = current / previous - 1
+
+        # 0/0 is skipped, as in pd.Series.pct_change().mean()
+        changes = changes[~np.isnan(changes)]
+
+        self.change_sum += changes.sum()
+        self.change_count += len(changes)
+        self.change_quantiles.update(changes)
+
+        returns = LogTransformation.transform(current) - LogTransformation.transform(previous)
+
+        self.returns.merge(ReturnsAccumulator.from_values(returns, start_times, exact_size=self.exact_size))
+
+    def describe(self) -> Dict:
+        """
+        Summary statistics, with the keys of SeriesProfile.stats (not rounded).
+        """
+
+        q25, median, q75 = [self.quantiles.quantile(q) for q in [0.25, 0.5, 0.75]]
+
+        change_avg = self.change_sum / self.change_count if self.change_count > 0 else np.nan
+
+        stats = {
+            'count': self.moments.n,
+            'mean': self.moments.mean,
+            'std': self.moments.std(),
+            'min': self.moments.min,
+            '25%': q25,
+            '50%': median,
+            '75%': q75,
+            'max': self.moments.max,
+            'skew': self.moments.skewness(),
+            'kurtosis': self.moments.kurtosis(),
+            'first_value': self.first_value,
+            'last_value': self.last_value,
+            'nan_percentage': np.round(100 * self.n_missing / self.n, 2),
+            'growth_average': np.round(change_avg * 100, 2),
+            'growth_median': np.round(self.change_quantiles.quantile(0.5) * 100, 2),
+            'iqr': q75 - q25,
+        }
+
+        return stats
@@ -1,5 +1,7 @@
-import re
-from typing import Tuple
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
@@ -7,14 +9,137 @@ import pandas as pd
 from cardtale.core.config.freq import (FREQ_TAB,
                                        FREQUENCIES,
                                        FREQ_INT_DF,
+                                       MONTH_LIST,
                                        SEASONS)
 from cardtale.core.utils.splits import DataSplit
 
 DFTuple = Tuple[pd.DataFrame, pd.DataFrame]
+CalendarTuple = Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]
 
 N_MONTHS = 12
 SEASON_LEN = 3
-CATEGORICAL_COLUMNS = ['Month', 'Weekday', 'Quarter']
+CATEGORICAL_COLUMNS = ['Season', 'Month', 'Weekday', 'Quarter']
+
+WEEKDAY_LIST = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+# sequential periods, by name of frequency: column name and pandas period alias
+SEQUENCE_PERIODS = {
+    'Hourly': ('Hour', 'h'),
+    'Daily': ('Day', 'D'),
+    'Weekly': ('Week', 'W'),
+    'Monthly': ('Month', 'M'),
+    'Quarterly': ('Quarter', 'Q'),
+    'Yearly': ('Year', 'Y'),
+}
+
+# frequency at which each calendar feature changes. A feature is only computed if its frequency
+# is the sampling frequency or one above it (e.g., Weekday or Hour are not computed for monthly data)
+CALENDAR_RESOLUTION = {
+    'Season': 'Quarterly',
+    'Year': 'Yearly',
+    'Quarter': 'Quarterly',
+    'Month Number': 'Monthly',
+    'Month': 'Monthly',
+    'Week': 'Weekly',
+    'Weekday': 'Daily',
+    'Day': 'Daily',
+    'Hour': 'Hourly',
+}
+
+CALENDAR_CACHE_SIZE = 64
+
+
+class CalendarCache:
+    """
+    LRU cache of the time features of a datetime index.
+
+    The time features only depend on the time steps and the sampling frequency, so they are keyed by a
+    fingerprint of the index (a hash of its timestamps). Series of a panel that share the same time steps
+    get the same sequence and calendar frames, which are computed once.
+
+    Attributes:
+        maxsize (int): Maximum number of indices kept. The least recently used is evicted first.
+        results (OrderedDict): Time features by key, from least to most recently used.
+        hits (int): Number of lookups that found cached features.
+        misses (int): Number of lookups that required computing the features.
+    """
+
+    def __init__(self, maxsize: int = CALENDAR_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.results = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+
+    def get(self, index: pd.DatetimeIndex, freq: str) -> CalendarTuple:
+        """
+        Gets the time features of an index, computing them if not cached.
+
+        Args:
+            index (pd.DatetimeIndex): Datetime index.
+            freq (str): Sampling frequency.
+
+        Returns:
+            CalendarTuple: Sequence, calendar, and recurrent frames (see TimeDF.get_calendar and
+            TimeDF.format_recurrent). They are shared with other callers, so they should not be modified.
+        """
+
+        key = self.get_key(index, freq)
+
+        with self._lock:
+            if key in self.results:
+                self.hits += 1
+                self.results.move_to_end(key)
+                return self.results[key]
+
+            self.misses += 1
+
+        sequence_df, calendar_df = TimeDF.get_calendar(index, freq)
+        features = sequence_df, calendar_df, TimeDF.format_recurrent(calendar_df)
+
+        with self._lock:
+            self.results[key] = features
+            if len(self.results) > self.maxsize:
+                self.results.popitem(last=False)
+
+        return features
+
+    def info(self) -> Dict[str, int]:
+        """
+        Summarises the usage of the cache.
+
+        Returns:
+            dict: Number of hits, misses, and cached indices.
+        """
+
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self.results)}
+
+    def clear(self):
+        """
+        Removes all cached time features.
+        """
+
+        with self._lock:
+            self.results.clear()
+
+    @staticmethod
+    def get_key(index: pd.DatetimeIndex, freq: str) -> str:
+        """
+        Computes the fingerprint of an index.
+
+        Args:
+            index (pd.DatetimeIndex): Datetime index.
+            freq (str): Sampling frequency.
+
+        Returns:
+            str: Index key.
+        """
+
+        key = hashlib.sha1(index.asi8.tobytes())
+        key.update(repr((str(index.dtype), len(index), freq)).encode())
+
+        return key.hexdigest()
 
 
 class TimeDF:
@@ -29,6 +154,9 @@ class TimeDF:
         formats (pd.DataFrame): Frequency formats.
         sequence (pd.DataFrame): Sequential time features.
         recurrent (pd.DataFrame): Recurrent time features.
+        calendar (pd.DataFrame): All recurrent time features, before selecting the informative ones.
+        group_stats (dict): Sum and count of the target in each sequential period (e.g. each quarter),
+        by frequency. Used to compute the frequency averages, and updated when observations are appended.
         freq_long (str): Name of the frequency.
     """
 
@@ -47,6 +175,8 @@ class TimeDF:
         self.formats = None
         self.sequence = None
         self.recurrent = None
+        self.calendar = None
+        self.group_stats = {}
 
     def setup(self, df: pd.DataFrame, time_col: str, target_col: str):
         """
@@ -61,12 +191,72 @@ class TimeDF:
 
         idx = df[[time_col]].set_index(time_col).index
 
-        self.sequence, self.recurrent = self.get_freq_set(idx)
+        self.sequence, self.calendar, recurrent = CALENDAR_CACHE.get(idx, self.freq_short)
+        self.group_stats = {}
 
         s = pd.Series(data=df[target_col].values, index=df[time_col], name=target_col)
-        freq_avg = self.get_freq_averages(s)
+        self.update_group_stats(self.sequence, s)
+
+        self.set_recurrent(recurrent)
+
+    def update(self, df: pd.DataFrame, time_col: str, target_col: str):
+        """
+        Extends the time features with new observations, which follow the last one.
 
-        self.recurrent = pd.concat([self.recurrent, freq_avg], axis=1)
+        The calendar features are only computed for the new time steps, and the frequency averages
+        are obtained from the running sums and counts of each period (see group_stats).
+
+        Args:
+            df (pd.DataFrame): New observations.
+            time_col (str): Column name denoting the temporal variable.
+            target_col (str): Column name denoting the numeric target variable.
+        """
+
+        idx = df[[time_col]].set_index(time_col).index
+
+        sequence, calendar, _ = CALENDAR_CACHE.get(idx, self.freq_short)
+
+        self.sequence = pd.concat([self.sequence, sequence], ignore_index=True)
+        self.calendar = pd.concat([self.calendar, calendar], ignore_index=True)
+
+        s = pd.Series(data=df[target_col].values, index=df[time_col], name=target_col)
+        self.update_group_stats(sequence, s)
+
+        self.set_recurrent()
+
+    def set_recurrent(self, recurrent: Optional[pd.DataFrame] = None):
+        """
+        Sets the recurrent time features: the informative calendar features (see format_recurrent),
+        and the frequency averages.
+
+        Args:
+            recurrent (pd.DataFrame, optional): Informative calendar features, if already selected
+            (e.g., from the calendar cache). Defaults to None.
+        """
+
+        if recurrent is None:
+            recurrent = self.format_recurrent(self.calendar)
+
+        freq_avg = self.get_freq_averages()
+
+        self.recurrent = pd.concat([recurrent, freq_avg], axis=1)
+
+    def update_group_stats(self, sequence: pd.DataFrame, series: pd.Series):
+        """
+        Adds the sum and count of the target in each sequential period (e.g. each quarter) of new observations.
+
+        Args:
+            sequence (pd.DataFrame): Sequential time features of the observations.
+            series (pd.Series): Target values of the observations.
+        """
+
+        for freq_ in self.get_averaged_freqs():
+            stats = series.groupby(sequence[freq_].values).agg(['sum', 'count'])
+
+            if freq_ in self.group_stats:
+                stats = self.group_stats[freq_].add(stats, fill_value=0)
+
+            self.group_stats[freq_] = stats
 
     def set_formats(self):
         """
@@ -83,78 +273,150 @@ class TimeDF:
         self.freq_long = 'Day' if self.freq_longly == 'Daily' else self.freq_longly[:-2]
         self.freq_pretty = self.formats['format_pretty'][self.freq_short]
 
-    def get_freq_averages(self, series: pd.Series):
+    def get_averaged_freqs(self) -> List[str]:
         """
-        Computes the average for each sequential period (e.g., Quarter averages).
-
-        Args:
-            series (pd.Series): Univariate time series with a pd.DateTimeIndex index.
+        Gets the frequencies above the sampling frequency (e.g. Quarter and Year, for monthly data),
+        for which the averages are computed.
 
         Returns:
-            pd.DataFrame: DataFrame with frequency averages.
+            List[str]: Names of the sequential periods.
         """
+
         freqs = self.formats['name'].values[1:].tolist()
-        freqs = [re.sub('ly$', '', x) for x in freqs]
+        freqs = [SEQUENCE_PERIODS[x][0] for x in dict.fromkeys(freqs)]
+
+        return freqs
+
+    def get_freq_averages(self):
+        """
+        Computes the average for each sequential period (e.g., Quarter averages), from the sums
+        and counts in group_stats.
 
-        avg_df = pd.DataFrame(index=series.index)
+        Returns:
+            pd.DataFrame: DataFrame with frequency averages.
+        """
 
-        df = self.sequence.copy()
-        df[series.name] = series.values
+        avg_df = pd.DataFrame(index=self.sequence.index)
 
-        for freq_ in freqs:
-            df_grouped = df.groupby([freq_])[series.name]
-            avg_df[f'{freq_} Average'] = df_grouped.transform(lambda x: x.mean()).values
+        for freq_ in self.get_averaged_freqs():
+            stats = self.group_stats[freq_]
+            avg_df[f'{freq_} Average'] = self.sequence[freq_].map(stats['sum'] / stats['count']).values
 
         avg_df.reset_index(drop=True, inplace=True)
 
         return avg_df
 
     @classmethod
-    def get_freq_set(cls, index: pd.DatetimeIndex) -> DFTuple:
+    def get_freq_set(cls, index: pd.DatetimeIndex, freq: str) -> DFTuple:
         """
         Gets the forward and recurrent frequency sets.
 
         Args:
             index (pd.DatetimeIndex): Datetime index.
+            freq (str): Sampling frequency.
 
         Returns:
             DFTuple: Tuple containing forward and recurrent DataFrames.
         """
 
+        forward_df, _, recurrent_df = CALENDAR_CACHE.get(index, freq)
+
+        return forward_df, recurrent_df
+
+    @classmethod
+    def get_calendar(cls, index: pd.DatetimeIndex, freq: str) -> DFTuple:
+        """
+        Gets the forward frequency set and the recurrent (calendar) features of each time step.
+
+        Only the features at the sampling frequency or above it are computed (see CALENDAR_RESOLUTION
+        and SEQUENCE_PERIODS). The periods of the forward set are integer ordinals, and the calendar
+        labels (e.g. Month or Quarter) are categoricals built from integer codes, with the categories
+        in order of appearance.
+
+        Args:
+            index (pd.DatetimeIndex): Datetime index.
+            freq (str): Sampling frequency.
+
+        Returns:
+            DFTuple: Tuple containing forward and calendar DataFrames.
+        """
+
         assert isinstance(index, pd.DatetimeIndex)
 
-        forward_freq = {
-            'Year': index.to_period('Y'),
-            'Quarter': index.to_period('Q'),
-            'Month': index.to_period('M'),
-            'Week': index.to_period('W'),
-            'Day': index.to_period('D'),
-            'Hour': index.to_period('h'),
+        valid_freqs = cls.get_freqs(freq)['name'].tolist()
+
+        # the sequential periods for the frequency averages (see get_averaged_freqs)
+        forward_freq = {}
+        for name, (col, period_alias) in SEQUENCE_PERIODS.items():
+            if name in valid_freqs[1:]:
+                forward_freq[col] = index.to_period(period_alias).asi8
+
+        features = {
+            'Season': lambda: cls.get_seasons(index),
+            'Year': lambda: index.year,
+            'Quarter': lambda: cls.to_categorical(index.quarter - 1, [f'Q{i}' for i in range(1, 5)]),
+            'Month Number': lambda: index.month,
+            'Month': lambda: cls.to_categorical(index.month - 1, [x[:3] for x in MONTH_LIST]),
+            'Week': lambda: index.isocalendar().week.values,
+            'Weekday': lambda: cls.to_categorical(index.dayofweek, WEEKDAY_LIST),
+            'Day': lambda: index.day,
+            'Hour': lambda: index.hour,
         }
 
-        recurrent_freq = {
-            'Season': cls.get_seasons(index),
-            'Year': index.year,
-            'Quarter': [f'Q{i}' for i in index.quarter],
-            'Month Number': index.month,
-            'Month': [x[:3] for x in index.month_name()],
-            'Week': index.isocalendar().week.values,
-            'Weekday': index.day_name(),
-            'Day': index.day,
-            'Hour': index.hour,
-        }
+        recurrent_freq = {col: get_feature() for col, get_feature in features.items()
+                          if CALENDAR_RESOLUTION[col] in valid_freqs}
+
+        forward_df = pd.DataFrame(forward_freq, index=pd.RangeIndex(len(index)))
+        calendar_df = pd.DataFrame(recurrent_freq, index=pd.RangeIndex(len(index)))
+
+        return forward_df, calendar_df
+
+    @staticmethod
+    def to_categorical(codes: np.ndarray, labels: List[str]) -> pd.Categorical:
+        """
+        Builds a categorical from integer codes, with the categories in order of appearance.
+
+        Args:
+            codes (np.ndarray): Codes, as positions in labels.
+            labels (List[str]): Labels of all the possible codes.
 
-        forward_df = pd.DataFrame(forward_freq)
-        recurrent_df = pd.DataFrame(recurrent_freq)
+        Returns:
+            pd.Categorical: Categorical variable.
+        """
+
+        codes = np.asarray(codes)
+
+        observed = pd.unique(codes)
 
+        position = np.zeros(len(labels), dtype=np.int8)
+        position[observed] = np.arange(len(observed))
+
+        return pd.Categorical.from_codes(position[codes], categories=np.asarray(labels, dtype=object)[observed])
+
+    @staticmethod
+    def format_recurrent(calendar_df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Selects the informative calendar features (with more than one value), and converts the
+        categorical ones that are not yet (e.g. after appending new time steps), with the categories
+        in order of appearance.
+
+        Args:
+            calendar_df (pd.DataFrame): Calendar features (see get_calendar).
+
+        Returns:
+            pd.DataFrame: Recurrent time features.
+        """
+
+        recurrent_df = calendar_df.copy()
         for col in CATEGORICAL_COLUMNS:
-            recurrent_df[col] = DataSplit.df_var_to_categorical(recurrent_df, col)
+            if col in recurrent_df and not isinstance(recurrent_df[col].dtype, pd.CategoricalDtype):
+                recurrent_df[col] = DataSplit.df_var_to_categorical(recurrent_df, col)
 
         n_unq = recurrent_df.nunique()
 
         recurrent_df = recurrent_df[n_unq[n_unq > 1].index.tolist()]
 
-        return forward_df, recurrent_df
+        return recurrent_df
 
     @staticmethod
     def get_freqs(frequency: str):
@@ -201,14 +463,12 @@ class TimeDF:
             index (pd.DatetimeIndex): Datetime index.
 
         Returns:
-            pd.Series: Series with season information.
+            pd.Categorical: Season of each time step.
         """
 
-        season_ = index.month % N_MONTHS // SEASON_LEN + 1
-        season_.name = 'season'
+        season_ = index.month % N_MONTHS // SEASON_LEN
 
-        season_df = pd.DataFrame(season_).replace({'season': SEASONS})
+        return TimeDF.to_categorical(season_, [*SEASONS.values()])
 
-        season_f = season_df['season']
 
-        return season_f
+CALENDAR_CACHE = CalendarCache()
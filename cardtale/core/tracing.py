@@ -0,0 +1,335 @@
+import contextlib
+import cProfile
+import io
+import json
+import pstats
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
+
+import pandas as pd
+
+SPAN_COLUMNS = ['name', 'parent', 'depth', 'start', 'duration', 'thread', 'attributes', 'profile']
+PROFILE_N_LINES = 25
+
+# tracer and span of the current context (thread or task). They are copied to the threads of
+# the stage scheduler, so the spans of concurrent stages get the right parent
+CURRENT_TRACER: ContextVar[Optional['Tracer']] = ContextVar('cardtale_tracer', default=None)
+CURRENT_SPAN: ContextVar[Optional['Span']] = ContextVar('cardtale_span', default=None)
+
+NULL_SPAN = contextlib.nullcontext()
+
+
+class Span:
+    """
+    Timing of a step of the report pipeline (e.g. a testing stage, a landmark configuration, or a plot).
+
+    Attributes:
+        name (str): Name of the step.
+        parent (Optional[str]): Name of the enclosing span, if any.
+        depth (int): Number of enclosing spans.
+        start (float): Start time, in seconds since the epoch.
+        duration (float): Elapsed (wall-clock) time, in seconds.
+        thread (str): Name of the thread that ran the step.
+        attributes (dict): Details of the step (e.g. the landmark configuration).
+        profile (Optional[str]): cProfile statistics of the step (top functions by cumulative time), if profiled.
+    """
+
+    def __init__(self, name: str, parent: Optional['Span'], attributes: Dict[str, Any]):
+        self.name = name
+        self.parent = None if parent is None else parent.name
+        self.depth = 0 if parent is None else parent.depth + 1
+        self.start = time.time()
+        self.duration = 0.0
+        self.thread = threading.current_thread().name
+        self.attributes = attributes
+        self.profile = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {col: getattr(self, col) for col in SPAN_COLUMNS}
+
+
+class Tracer:
+    """
+    Collects the spans of the report pipeline: the setup of the series, each testing stage, each landmark
+    configuration, each plot (build and save), the Jinja render, and the PDF write.
+
+    A tracer is activated for a context (see activate, or CardsBuilder, which activates its tracer in each
+    call). Instrumented code opens spans with the module-level span function, which returns a shared no-op
+    context manager when no tracer is active, so tracing costs a context variable lookup when disabled.
+
+    Each finished span is kept (see records and summary) and passed to the sinks, e.g. a callback
+    or a JsonLinesSink. Optionally, the spans can be profiled with cProfile. Only one profiler can be active
+    at a time, so a span is not profiled if it runs within (or concurrently with) another profiled span.
+
+    Attributes:
+        sinks (List[Callable]): Functions called with the dict of each finished span.
+        profile (Union[bool, List[str]]): Whether to profile every span (True), or the names of the
+        spans to profile.
+        spans (List[Span]): Finished spans, in order of completion.
+    """
+
+    def __init__(self,
+                 sinks: Optional[Iterable[Callable[[Dict[str, Any]], Any]]] = None,
+                 profile: Union[bool, Iterable[str]] = False):
+        """
+        Initializes the Tracer.
+
+        Args:
+            sinks (Optional[Iterable[Callable]], optional): Functions called with the dict of each finished
+            span (see Span.to_dict). Defaults to None (spans are only kept by the tracer).
+            profile (Union[bool, Iterable[str]], optional): Whether to capture a cProfile of every span, or
+            the names of the spans to profile (e.g. ['trend_landmarks']). Defaults to False.
+        """
+
+        self.sinks = [] if sinks is None else list(sinks)
+        self.profile = profile if isinstance(profile, bool) else list(profile)
+        self.spans: List[Span] = []
+
+        self._lock = threading.Lock()
+        self._profiling = False
+
+    def __getstate__(self):
+        # sinks (e.g. callbacks or open files) are specific to the process that created the tracer
+        state = self.__dict__.copy()
+        state['sinks'] = []
+        del state['_lock']
+
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def activate(self, root: bool = False):
+        """
+        Activates the tracer in the current context, so that the instrumented code records its spans.
+
+        Args:
+            root (bool, optional): Whether the spans start at the top level, regardless of the open spans
+            of the context (e.g. in a worker process forked from a traced context). Defaults to False.
+        """
+
+        token = CURRENT_TRACER.set(self)
+        span_token = CURRENT_SPAN.set(None) if root else None
+        try:
+            yield self
+        finally:
+            if span_token is not None:
+                CURRENT_SPAN.reset(span_token)
+            CURRENT_TRACER.reset(token)
+
+    @contextlib.contextmanager
+    def span(self, name: str, **attributes):
+        """
+        Times a step, as a child of the current span.
+
+        Args:
+            name (str): Name of the step.
+            **attributes: Details of the step.
+        """
+
+        record = Span(name, parent=CURRENT_SPAN.get(), attributes=attributes)
+        token = CURRENT_SPAN.set(record)
+
+        profiler = self._start_profiler(name)
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record.duration = time.perf_counter() - start
+            CURRENT_SPAN.reset(token)
+
+            if profiler is not None:
+                record.profile = self._stop_profiler(profiler)
+
+            self.add([record])
+
+    def add(self, spans: List[Span], parent: Optional[Span] = None):
+        """
+        Adds finished spans (e.g. recorded by a tracer in a worker process) and passes them to the sinks.
+
+        Args:
+            spans (List[Span]): Finished spans.
+            parent (Optional[Span], optional): Span the given spans are nested in, e.g. the span that
+            dispatched them to the worker processes. Defaults to None (spans are added as they are).
+        """
+
+        if parent is not None:
+            for record in spans:
+                record.parent = parent.name if record.parent is None else record.parent
+                record.depth += parent.depth + 1
+
+        with self._lock:
+            self.spans.extend(spans)
+
+        for record in spans:
+            for sink in self.sinks:
+                sink(record.to_dict())
+
+    def records(self) -> List[Dict[str, Any]]:
+        """
+        Gets the finished spans as dicts, with the keys in SPAN_COLUMNS.
+
+        Returns:
+            List[Dict[str, Any]]: Finished spans, in order of completion.
+        """
+
+        return [record.to_dict() for record in self.spans]
+
+    def summary(self) -> pd.DataFrame:
+        """
+        Aggregates the duration of the spans by name.
+
+        Returns:
+            pd.DataFrame: Number of spans, and their total, mean, and maximum duration (in seconds), by name,
+            sorted by total duration. The share of each name in the total duration of the top-level spans
+            is also given (for nested names, it overlaps with the share of their parent).
+        """
+
+        spans_df = pd.DataFrame(self.records(), columns=SPAN_COLUMNS)
+
+        summary_df = spans_df.groupby('name', sort=False)['duration'].agg(['count', 'sum', 'mean', 'max'])
+        summary_df = summary_df.rename(columns={'sum': 'total'}).sort_values('total', ascending=False)
+
+        top_level_total = spans_df.loc[spans_df['depth'] == 0, 'duration'].sum()
+        summary_df['share'] = summary_df['total'] / top_level_total if top_level_total > 0 else float('nan')
+
+        return summary_df
+
+    def clear(self):
+        """
+        Removes the finished spans.
+        """
+
+        with self._lock:
+            self.spans = []
+
+    def _start_profiler(self, name: str) -> Optional[cProfile.Profile]:
+        if self.profile is False or (self.profile is not True and name not in self.profile):
+            return None
+
+        with self._lock:
+            if self._profiling:
+                return None
+            self._profiling = True
+
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # another profiler (e.g. of the user) is active
+            self._profiling = False
+            return None
+
+        return profiler
+
+    def _stop_profiler(self, profiler: cProfile.Profile) -> str:
+        profiler.disable()
+        self._profiling = False
+
+        stream = io.StringIO()
+        pstats.Stats(profiler, stream=stream).sort_stats('cumulative').print_stats(PROFILE_N_LINES)
+
+        return stream.getvalue()
+
+
+class JsonLinesSink:
+    """
+    Sink of a Tracer that appends each finished span to a JSON lines file (one object per line).
+
+    The file is opened for each span, so the sink can be shared by the tracers of several processes
+    (e.g. one per series of a panel).
+
+    Attributes:
+        path (str): Path of the file.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initializes the JsonLinesSink.
+
+        Args:
+            path (str): Path of the file. Spans are appended to it.
+        """
+
+        self.path = path
+        self._lock = threading.Lock()
+
+    def __call__(self, record: Dict[str, Any]):
+        line = json.dumps(record, default=str)
+
+        with self._lock:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line + '\n')
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_lock']
+
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+
+def current_tracer() -> Optional[Tracer]:
+    """
+    Gets the tracer active in the current context.
+
+    Returns:
+        Optional[Tracer]: Active tracer, or None if tracing is disabled.
+    """
+
+    return CURRENT_TRACER.get()
+
+
+def current_span() -> Optional[Span]:
+    """
+    Gets the innermost open span of the current context.
+
+    Returns:
+        Optional[Span]: Open span, or None.
+    """
+
+    return CURRENT_SPAN.get()
+
+
+def span(name: str, **attributes):
+    """
+    Times a step with the active tracer. If no tracer is active, a shared no-op context manager is returned.
+
+    Args:
+        name (str): Name of the step.
+        **attributes: Details of the step.
+
+    Returns:
+        ContextManager: Context manager that times the step.
+    """
+
+    tracer = CURRENT_TRACER.get()
+    if tracer is None:
+        return NULL_SPAN
+
+    return tracer.span(name, **attributes)
+
+
+def tracing(tracer: Optional[Tracer], root: bool = False):
+    """
+    Activates a tracer in the current context, if given.
+
+    Args:
+        tracer (Optional[Tracer]): Tracer, or None (no-op).
+        root (bool, optional): Whether the spans start at the top level (see Tracer.activate). Defaults to False.
+
+    Returns:
+        ContextManager: Context manager that activates the tracer.
+    """
+
+    if tracer is None:
+        return NULL_SPAN
+
+    return tracer.activate(root=root)
@@ -1,7 +1,6 @@
 from typing import List, Union, Optional
 
 import pandas as pd
-from sklearn.model_selection import train_test_split
 
 MAX_PARTITION_SIZE = 0.5
 GQ_DEFAULT_NAMES = ['First', 'Last']
@@ -85,7 +84,7 @@ class DataSplit:
         if partition_names is None:
             partition_names = CHANGE_DEFAULT_NAMES
 
-        before, after = train_test_split(data, train_size=cp_index, shuffle=False)
+        before, after = data.iloc[:cp_index], data.iloc[cp_index:]
 
         if return_data:
             return before, after
@@ -1,8 +1,8 @@
 import pandas as pd
 
-import plotnine as p9
 from numerize import numerize
-from cardtale.visuals.config import THEME, THEME_PALETTE, FONT_FAMILY
+from cardtale.visuals.config import THEME, THEME_PALETTE
+from cardtale.visuals.fonts import resolve_font_family
 
 
 class Boxplot:
@@ -34,10 +34,12 @@ class Boxplot:
             plotnine.ggplot: The generated boxplot.
         """
 
+        import plotnine as p9
+
         aes_ = {'x': 1, 'y': y_axis_col}
 
         plot = p9.ggplot(data, p9.aes(**aes_)) + \
-               p9.theme_minimal(base_family=FONT_FAMILY, base_size=12) + \
+               p9.theme_minimal(base_family=resolve_font_family(), base_size=12) + \
                p9.theme(plot_margin=0.015,
                         axis_text=p9.element_text(size=12),
                         axis_text_y=p9.element_blank(),
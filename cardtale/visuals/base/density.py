@@ -1,8 +1,8 @@
 import pandas as pd
-import plotnine as p9
 from numerize import numerize
 
-from cardtale.visuals.config import THEME, THEME_PALETTE, FONT_FAMILY
+from cardtale.visuals.config import THEME, THEME_PALETTE
+from cardtale.visuals.fonts import resolve_font_family
 
 
 class PlotDensity:
@@ -36,6 +36,8 @@ class PlotDensity:
             plotnine.ggplot: The generated density plot.
         """
 
+        import plotnine as p9
+
         colors = [THEME_PALETTE[THEME]['hard'],
                   THEME_PALETTE[THEME]['hard_alt']]
 
@@ -51,7 +53,7 @@ class PlotDensity:
 
         plot = p9.ggplot(data) + \
                p9.aes(**aes_) + \
-               p9.theme_minimal(base_family=FONT_FAMILY, base_size=12) + \
+               p9.theme_minimal(base_family=resolve_font_family(), base_size=12) + \
                p9.theme(plot_margin=.0175,
                         axis_text=p9.element_text(size=12),
                         strip_text=p9.element_text(size=12),
@@ -1,13 +1,15 @@
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, TYPE_CHECKING
 
 import pandas as pd
-import plotnine as p9
-from plotnine.geoms.geom_hline import geom_hline
 from numerize import numerize
 
-from cardtale.visuals.config import THEME, THEME_PALETTE, FONT_FAMILY
+from cardtale.visuals.config import THEME, THEME_PALETTE
+from cardtale.visuals.fonts import resolve_font_family
 
-OptHLines = Optional[List[geom_hline]]
+if TYPE_CHECKING:
+    from plotnine.geoms.geom_hline import geom_hline
+
+OptHLines = Optional[List['geom_hline']]
 
 
 class LinePlot:
@@ -58,12 +60,14 @@ class LinePlot:
             plotnine.ggplot: The generated line plot.
         """
 
+        import plotnine as p9
+
         aes_ = {'x': x_axis_col, 'y': y_axis_col, 'group': 1}
 
         plot = \
             p9.ggplot(data) + \
             p9.aes(**aes_) + \
-            p9.theme_minimal(base_family=FONT_FAMILY, base_size=12) + \
+            p9.theme_minimal(base_family=resolve_font_family(), base_size=12) + \
             p9.theme(plot_margin=.0125,
                      axis_text=p9.element_text(size=12),
                      legend_title=p9.element_blank(),
@@ -76,10 +80,10 @@ class LinePlot:
 
         if hlines is not None:
             for y_inter in hlines:
-                plot += geom_hline(yintercept=y_inter,
-                                   linetype='dashed',
-                                   color=hline_color,
-                                   size=1.1)
+                plot += p9.geom_hline(yintercept=y_inter,
+                                      linetype='dashed',
+                                      color=hline_color,
+                                      size=1.1)
 
         if ribbons is not None:
             ribbon_aes = {'ymin': ribbons['Low'], 'ymax': ribbons['High']}
@@ -120,6 +124,8 @@ class LinePlot:
             plotnine.ggplot: The generated line plot.
         """
 
+        import plotnine as p9
+
         # cp_idx_0 = np.where(data[x_axis_col] == change_points[0])[0][0]
 
         aes_ = {'x': x_axis_col, 'y': y_axis_col, 'group': 1}
@@ -127,7 +133,7 @@ class LinePlot:
         plot = \
             p9.ggplot(data) + \
             p9.aes(**aes_) + \
-            p9.theme_minimal(base_family=FONT_FAMILY, base_size=12) + \
+            p9.theme_minimal(base_family=resolve_font_family(), base_size=12) + \
             p9.theme(plot_margin=.0125,
                      axis_text=p9.element_text(size=11),
                      legend_title=p9.element_blank(),
@@ -186,13 +192,15 @@ class LinePlot:
             plotnine.ggplot: The generated line plot.
         """
 
+        import plotnine as p9
+
         aes1_ = {'x': x_axis_col, 'y': y_axis_col_main}
         aes2_ = {'x': x_axis_col, 'y': y_axis_col_supp}
 
         plot = \
             p9.ggplot(data) + \
             p9.aes(**aes1_) + \
-            p9.theme_minimal(base_family=FONT_FAMILY, base_size=12) + \
+            p9.theme_minimal(base_family=resolve_font_family(), base_size=12) + \
             p9.theme(plot_margin=.0125,
                      axis_text_y=p9.element_text(size=11),
                      axis_text_x=p9.element_text(size=10),
@@ -234,6 +242,8 @@ class LinePlot:
             plotnine.ggplot: The generated grid line plot.
         """
 
+        import plotnine as p9
+
         melted_data = pd.melt(data, x_axis_col)
 
         if category_list is not None:
@@ -246,7 +256,7 @@ class LinePlot:
             p9.ggplot(melted_data) + \
             p9.aes(**aes_) + \
             p9.facet_grid(**facet_) + \
-            p9.theme_minimal(base_family=FONT_FAMILY, base_size=12) + \
+            p9.theme_minimal(base_family=resolve_font_family(), base_size=12) + \
             p9.theme(plot_margin=.0125,
                      axis_text=p9.element_text(size=11),
                      legend_title=p9.element_blank(),
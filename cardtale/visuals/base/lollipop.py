@@ -1,8 +1,7 @@
 import pandas as pd
-import plotnine as p9
-from plotnine.geoms.geom_hline import geom_hline
 
-from cardtale.visuals.config import THEME, THEME_PALETTE, FONT_FAMILY
+from cardtale.visuals.config import THEME, THEME_PALETTE
+from cardtale.visuals.fonts import resolve_font_family
 
 
 class Lollipop:
@@ -38,29 +37,31 @@ class Lollipop:
             plotnine.ggplot: The generated lollipop plot.
         """
 
+        import plotnine as p9
+
         aes_ = {'x': x_axis_col, 'y': y_axis_col}
         aes_s = {'x': x_axis_col, 'xend': x_axis_col, 'y': 0, 'yend': y_axis_col}
 
         plot = p9.ggplot(data=data, mapping=p9.aes(**aes_))
 
         if h_threshold != 0:
-            plot += geom_hline(yintercept=h_threshold,
-                               linetype='dashed',
-                               color=THEME_PALETTE[THEME]['mid'],
-                               size=.8)
-            plot += geom_hline(yintercept=-h_threshold,
-                               linetype='dashed',
-                               color=THEME_PALETTE[THEME]['mid'],
-                               size=.8)
+            plot += p9.geom_hline(yintercept=h_threshold,
+                                  linetype='dashed',
+                                  color=THEME_PALETTE[THEME]['mid'],
+                                  size=.8)
+            plot += p9.geom_hline(yintercept=-h_threshold,
+                                  linetype='dashed',
+                                  color=THEME_PALETTE[THEME]['mid'],
+                                  size=.8)
 
-        plot += geom_hline(yintercept=0, linetype='solid', color='black', size=1)
+        plot += p9.geom_hline(yintercept=0, linetype='solid', color='black', size=1)
 
         plot = \
             plot + p9.geom_segment(p9.aes(**aes_s),
                                    size=1.5,
                                    color=THEME_PALETTE[THEME]['soft']) + \
             p9.geom_point(size=4, color=THEME_PALETTE[THEME]['hard']) + \
-            p9.theme_minimal(base_family=FONT_FAMILY, base_size=12) + \
+            p9.theme_minimal(base_family=resolve_font_family(), base_size=12) + \
             p9.theme(plot_margin=.0125,
                      axis_text_y=p9.element_text(size=12),
                      axis_text_x=p9.element_text(size=10),
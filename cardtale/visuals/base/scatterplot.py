@@ -1,10 +1,9 @@
 import pandas as pd
 
-import plotnine as p9
-from scipy.stats import linregress
 from numerize import numerize
 
-from cardtale.visuals.config import THEME, THEME_PALETTE, FONT_FAMILY
+from cardtale.visuals.config import THEME, THEME_PALETTE
+from cardtale.visuals.fonts import resolve_font_family
 
 
 class Scatterplot:
@@ -42,17 +41,20 @@ class Scatterplot:
             plotnine.ggplot: The generated scatter plot.
         """
 
+        import plotnine as p9
 
         aes_ = {'x': x_axis_col, 'y': y_axis_col}
 
         plot = p9.ggplot(data) + \
                p9.aes(**aes_) + \
-               p9.theme_minimal(base_family=FONT_FAMILY, base_size=12) + \
+               p9.theme_minimal(base_family=resolve_font_family(), base_size=12) + \
                p9.theme(plot_margin=.0125,
                         axis_text_y=p9.element_text(size=10),
                         axis_text_x=p9.element_text(size=10))
 
         if add_slope_abline:
+            from scipy.stats import linregress
+
             lm = linregress(data[x_axis_col], data[y_axis_col])
             plot += \
                 p9.geom_abline(intercept=lm.intercept,
@@ -1,9 +1,9 @@
 import pandas as pd
-import plotnine as p9
 from numerize import numerize
 
 from cardtale.visuals.base.summary import SummaryStatPlot
-from cardtale.visuals.config import THEME, THEME_PALETTE, FONT_FAMILY
+from cardtale.visuals.config import THEME, THEME_PALETTE
+from cardtale.visuals.fonts import resolve_font_family
 
 
 class SeasonalPlot:
@@ -41,6 +41,7 @@ class SeasonalPlot:
             plotnine.ggplot: The generated line plot.
         """
 
+        import plotnine as p9
 
         aes_ = {'x': x_axis_col, 'y': y_axis_col, 'group': group_col, 'color': group_col}
         aes_t = {'label': group_col}
@@ -48,7 +49,7 @@ class SeasonalPlot:
         plot = \
             p9.ggplot(data) + \
             p9.aes(**aes_) + \
-            p9.theme_minimal(base_family=FONT_FAMILY, base_size=12) + \
+            p9.theme_minimal(base_family=resolve_font_family(), base_size=12) + \
             p9.theme(plot_margin=.0125,
                      axis_text=p9.element_text(size=10),
                      legend_title=p9.element_blank()) + \
@@ -100,6 +101,7 @@ class SeasonalPlot:
             plotnine.ggplot: The generated sub-series plot.
         """
 
+        import plotnine as p9
 
         stat_by_group, _ = SummaryStatPlot.calc_summary_by_group(data, y_axis_col, group_col, 'mean')
         stat_by_group = stat_by_group.reset_index()
@@ -110,7 +112,7 @@ class SeasonalPlot:
         plot = \
             p9.ggplot(data) + \
             p9.aes(**aes_) + \
-            p9.theme_minimal(base_family=FONT_FAMILY, base_size=12) + \
+            p9.theme_minimal(base_family=resolve_font_family(), base_size=12) + \
             p9.theme(plot_margin=.0125,
                      axis_text_x=p9.element_text(size=8, angle=90),
                      legend_title=p9.element_blank(),
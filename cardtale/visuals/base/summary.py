@@ -1,9 +1,9 @@
 import pandas as pd
 
-import plotnine as p9
 from numerize import numerize
 
-from cardtale.visuals.config import THEME, THEME_PALETTE, FONT_FAMILY
+from cardtale.visuals.config import THEME, THEME_PALETTE
+from cardtale.visuals.fonts import resolve_font_family
 from cardtale.core.utils.splits import DataSplit
 
 
@@ -72,6 +72,8 @@ class SummaryStatPlot:
             plotnine.ggplot: The generated summary plot.
         """
 
+        import plotnine as p9
+
         group_stat, overall_stat = cls.calc_summary_by_group(data=data,
                                                         y_col=y_col,
                                                         group_col=group_col,
@@ -85,7 +87,7 @@ class SummaryStatPlot:
         plot = \
             p9.ggplot(group_stat_df) + \
             p9.aes(**aes_) + \
-            p9.theme_minimal(base_family=FONT_FAMILY, base_size=12) + \
+            p9.theme_minimal(base_family=resolve_font_family(), base_size=12) + \
             p9.theme(plot_margin=.0125,
                      axis_text=p9.element_text(size=10),
                      legend_title=p9.element_blank(),
@@ -1,8 +1,8 @@
 import pandas as pd
-import plotnine as p9
 from numerize import numerize
 
-from cardtale.visuals.config import THEME, THEME_PALETTE, FONT_FAMILY
+from cardtale.visuals.config import THEME, THEME_PALETTE
+from cardtale.visuals.fonts import resolve_font_family
 
 
 class PartialViolinPlot:
@@ -60,6 +60,8 @@ class PartialViolinPlot:
             plotnine.ggplot: The generated partial violin plot.
         """
 
+        import plotnine as p9
+
         x = p9.stage(x_axis_col, after_scale='x+cls.SHIFT*cls.alt_sign(x)')
 
         aes_ = {'x': x_axis_col, 'y': y_axis_col, 'fill': x_axis_col}
@@ -68,7 +70,7 @@ class PartialViolinPlot:
 
         plot = \
             p9.ggplot(data=data, mapping=p9.aes(**aes_)) + \
-            p9.theme_minimal(base_family=FONT_FAMILY, base_size=12) + \
+            p9.theme_minimal(base_family=resolve_font_family(), base_size=12) + \
             p9.theme(plot_margin=.0125,
                      axis_text=p9.element_text(size=12),
                      legend_title=p9.element_blank(),
@@ -119,10 +121,12 @@ class PartialViolinPlot:
             plotnine.ggplot: The generated boxplot.
         """
 
+        import plotnine as p9
+
         aes_ = {'x': 1, 'y': y_axis_col}
 
         plot = p9.ggplot(data, p9.aes(**aes_)) + \
-               p9.theme_minimal(base_family=FONT_FAMILY, base_size=12) + \
+               p9.theme_minimal(base_family=resolve_font_family(), base_size=12) + \
                p9.theme(plot_margin=0.05,
                         axis_text=p9.element_text(size=12),
                         axis_text_y=p9.element_blank(),
@@ -0,0 +1,203 @@
+import hashlib
+import json
+import os
+import threading
+from importlib.metadata import version
+from typing import Dict, Optional
+
+import pandas as pd
+
+from cardtale.visuals.config import THEME, THEME_PALETTE
+from cardtale.visuals.fonts import resolve_font_family
+from cardtale.visuals.plot import Plot, PLOT_ENCODINGS
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'cardtale', 'plots')
+DEFAULT_MAX_SIZE_MB = 256
+CACHE_FILE_EXT = '.json'
+
+
+class RenderCache:
+    """
+    Disk-backed cache of encoded plot images, shared across report rebuilds (and processes).
+
+    Each entry is content-addressed: the key is a hash of the plot class, its name, the inputs that
+    determine the image (Plot.cache_inputs, e.g., tsd.stl_df or the ACF data), its size, the image
+    format, and the theme. So, re-rendering a series whose data did not change (or the same report
+    after changing the locale) does not build and encode the plots again.
+
+    Entries are stored as one file per plot in cache_dir. The total size of the cache is bounded:
+    when it exceeds max_size_mb, the least recently used entries (by file modification time, which is
+    updated on every hit) are evicted.
+
+    Attributes:
+        cache_dir (str): Directory where the entries are stored.
+        max_size (int): Maximum size of the cache, in bytes.
+        hits (int): Number of lookups found in the cache.
+        misses (int): Number of lookups not found in the cache.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_size_mb: float = DEFAULT_MAX_SIZE_MB):
+        """
+        Initializes the RenderCache, creating the cache directory if needed.
+
+        Args:
+            cache_dir (str, optional): Directory where the entries are stored. Defaults to DEFAULT_CACHE_DIR.
+            max_size_mb (float, optional): Maximum size of the cache, in megabytes. Defaults to DEFAULT_MAX_SIZE_MB.
+        """
+
+        self.cache_dir = cache_dir
+        self.max_size = int(max_size_mb * 1024 ** 2)
+
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def get(self, key: str) -> Optional[Dict[str, str]]:
+        """
+        Gets the encoded images of a plot.
+
+        Args:
+            key (str): Cache key of the plot (see get_key).
+
+        Returns:
+            Optional[Dict[str, str]]: Encoded images by template key, or None if the plot is not cached.
+        """
+
+        path = self._path(key)
+
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                img_codes = json.load(f)
+            os.utime(path)
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+
+        return img_codes
+
+    def put(self, key: str, img_codes: Dict[str, str]):
+        """
+        Stores the encoded images of a plot, and evicts the least recently used entries if the cache
+        exceeds its maximum size.
+
+        Args:
+            key (str): Cache key of the plot (see get_key).
+            img_codes (Dict[str, str]): Encoded images by template key.
+        """
+
+        path = self._path(key)
+        tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+
+        # written to a temporary file first, so that concurrent readers never see partial entries
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(img_codes, f)
+        os.replace(tmp_path, path)
+
+        self.evict()
+
+    def evict(self):
+        """
+        Removes the least recently used entries until the cache fits its maximum size.
+        """
+
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith(CACHE_FILE_EXT):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total_size = sum(size for _, size, _ in entries)
+
+        for _, size, path in sorted(entries):
+            if total_size <= self.max_size:
+                break
+
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+
+            total_size -= size
+
+    def clear(self):
+        """
+        Removes all the entries of the cache.
+        """
+
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith(CACHE_FILE_EXT):
+                os.remove(entry.path)
+
+        self.hits, self.misses = 0, 0
+
+    def info(self) -> Dict[str, int]:
+        """
+        Gets the statistics of the cache.
+
+        Returns:
+            Dict[str, int]: Number of hits, misses, entries, and total size (in bytes).
+        """
+
+        sizes = [entry.stat().st_size for entry in os.scandir(self.cache_dir)
+                 if entry.name.endswith(CACHE_FILE_EXT)]
+
+        return {'hits': self.hits, 'misses': self.misses, 'entries': len(sizes), 'size': sum(sizes)}
+
+    @staticmethod
+    def get_key(plot: Plot, plot_format: str = 'png') -> str:
+        """
+        Creates the cache key of a plot.
+
+        Args:
+            plot (Plot): Analysed plot.
+            plot_format (str, optional): Image format. Defaults to 'png'.
+
+        Returns:
+            str: Hexadecimal digest identifying the image of the plot.
+        """
+
+        if not plot.VECTOR_FORMAT:
+            plot_format = 'png'
+
+        key = hashlib.sha1()
+
+        header = [type(plot).__module__,
+                  type(plot).__qualname__,
+                  plot.name,
+                  plot.multi_plot,
+                  plot.width, plot.height, plot.width_s, plot.height_s,
+                  plot_format, PLOT_ENCODINGS[plot_format],
+                  THEME, THEME_PALETTE[THEME], resolve_font_family(),
+                  version('plotnine')]
+
+        key.update(repr(header).encode())
+
+        for obj in plot.cache_inputs():
+            RenderCache._update_key(key, obj)
+
+        return key.hexdigest()
+
+    @staticmethod
+    def _update_key(key, obj):
+        """
+        Adds an input of a plot to the hash. Pandas objects are hashed by values, index, and column names.
+        """
+
+        if isinstance(obj, (pd.DataFrame, pd.Series, pd.Index)):
+            names = obj.columns if isinstance(obj, pd.DataFrame) else [obj.name]
+            key.update(repr((type(obj).__name__, list(names), obj.shape)).encode())
+            key.update(pd.util.hash_pandas_object(obj).values.tobytes())
+        else:
+            key.update(repr(obj).encode())
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + CACHE_FILE_EXT)
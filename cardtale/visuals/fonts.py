@@ -0,0 +1,58 @@
+import functools
+from pathlib import Path
+from typing import List
+
+from cardtale.visuals.config import FONT_FAMILY
+
+FONT_EXTENSIONS = ('.ttf', '.otf')
+
+
+@functools.lru_cache(maxsize=None)
+def resolve_font_family(family: str = FONT_FAMILY) -> str:
+    """
+    Resolves the font family used in the plots to the name of a font that is installed.
+
+    Matplotlib looks up the family of every text element of every plot, and falls back (with a
+    warning) to its default font if the family is not installed. The lookup is done once per process,
+    and the plots use the name of the font that matplotlib actually picks, so the images do not change.
+
+    Args:
+        family (str, optional): Requested font family. Defaults to FONT_FAMILY.
+
+    Returns:
+        str: Name of the font family found by matplotlib.
+    """
+
+    from matplotlib import font_manager
+
+    font_path = font_manager.findfont(font_manager.FontProperties(family=family))
+
+    return font_manager.get_font(font_path).family_name
+
+
+def register_fonts(font_dir: str) -> List[str]:
+    """
+    Adds the fonts of a directory (e.g., fonts bundled for offline rendering) to matplotlib.
+    Fonts that were already added are skipped.
+
+    Args:
+        font_dir (str): Directory with font files (ttf or otf).
+
+    Returns:
+        List[str]: Paths of the registered font files.
+    """
+
+    from matplotlib import font_manager
+
+    font_paths = sorted(str(p) for p in Path(font_dir).iterdir() if p.suffix.lower() in FONT_EXTENSIONS)
+
+    registered = {font.fname for font in font_manager.fontManager.ttflist}
+    new_paths = [path for path in font_paths if path not in registered]
+
+    for path in new_paths:
+        font_manager.fontManager.addfont(path)
+
+    if len(new_paths) > 0:
+        resolve_font_family.cache_clear()
+
+    return font_paths
@@ -1,15 +1,43 @@
 import warnings
 import io
 import base64
-from typing import Union, List
-
-from plotnine.exceptions import PlotnineWarning
+from urllib.parse import quote
+from typing import Dict, List, Optional, Union
 
 from cardtale.core.data import TimeSeriesData
 
 NameOptList = Union[List[str], str]
 
-warnings.filterwarnings('ignore', category=PlotnineWarning)
+PLOT_FORMATS = {
+    'png': 'image/png',
+    'svg': 'image/svg+xml',
+}
+# parameter of the data URIs of the images in the report. svg is text, so it is embedded as (url-quoted)
+# utf-8, which avoids the size overhead of base64 (about a third)
+PLOT_ENCODINGS = {
+    'png': 'base64',
+    'svg': 'charset=utf-8',
+}
+UNKNOWN_FORMAT_ERROR = f'Unknown plot format. Must be one of {[*PLOT_FORMATS]}'
+IMG_CODE_KEYS = ('src', 'src_lhs', 'src_rhs')
+
+# text is kept as text (not paths) in svg, which makes files much smaller;
+# the hash salt makes the svg ids deterministic
+SVG_RC_PARAMS = {'svg.fonttype': 'none', 'svg.hashsalt': 'cardtale'}
+# characters of the svg kept as they are in its data URI (besides letters, digits, and '_.-~'). The others
+# (e.g. '"', '&', '%', '#', and line breaks) are percent-encoded, so the URI fits a double-quoted attribute
+SVG_URI_SAFE = " !$'()*+,/:;<=>?@[]^`{|}"
+
+
+def ignore_plotnine_warnings():
+    """
+    Silences the warnings of plotnine (e.g., about removed rows with missing values) when drawing plots.
+    The filter is set on the first draw, so importing cardtale does not import plotnine.
+    """
+
+    from plotnine.exceptions import PlotnineWarning
+
+    warnings.filterwarnings('ignore', category=PlotnineWarning)
 
 
 class Plot:
@@ -21,6 +49,8 @@ class Plot:
         HEIGHT_SMALL (float): Default height for small plots.
         WIDTH (float): Default width for plots.
         WIDTH_SMALL (float): Default width for small plots.
+        VECTOR_FORMAT (bool): Whether the plot can be saved in a vector format. Plots with many
+        graphical elements are much larger as svg than as png, so these are always saved as png.
         tsd (TimeSeriesData): Time series data for the plot.
         plot (Any): The plot object.
         name (NameOptList): Name(s) of the plot.
@@ -41,6 +71,7 @@ class Plot:
     HEIGHT_SMALL = 5
     WIDTH = 12
     WIDTH_SMALL = 6
+    VECTOR_FORMAT = True
 
     def __init__(self, tsd: TimeSeriesData, name: NameOptList, multi_plot: bool):
         """
@@ -71,6 +102,15 @@ class Plot:
         else:
             self.plot = None
 
+    def __getstate__(self):
+        # plotnine objects hold lambdas (e.g. axis labels) and cannot be pickled, so plots are
+        # pickled unbuilt and without the encoded images, which are created again when rendering
+        state = self.__dict__.copy()
+        state['plot'] = {'lhs': None, 'rhs': None} if self.multi_plot else None
+        state['img_data'] = {k: v for k, v in self.img_data.items() if k not in IMG_CODE_KEYS}
+
+        return state
+
     def build(self, *args, **kwargs):
         """
         Creates the plot.
@@ -90,42 +130,86 @@ class Plot:
         """
         raise NotImplementedError
 
-    def save(self):
+    def save(self, plot_format: str = 'png', img_codes: Optional[Dict[str, str]] = None):
         """
-        Saves the plot as an image and encodes it in base64.
+        Saves the plot as an image and encodes it (see get_encode).
+
+        Args:
+            plot_format (str, optional): Image format, 'png' (raster) or 'svg' (vector). Defaults to 'png'.
+            If the plot does not support vector formats (VECTOR_FORMAT), it is saved as png.
+            img_codes (Optional[Dict[str, str]], optional): Encoded images of the plot (e.g., from a
+            render cache). If given, the plot is not encoded again. Defaults to None.
         """
 
-        if not self.multi_plot:
+        if not self.VECTOR_FORMAT:
+            plot_format = 'png'
 
-            img_code = self.get_encode(self.plot,
+        if img_codes is None:
+            img_codes = self.encode(plot_format)
+
+        self.img_data = {
+            **img_codes,
+            'mime': PLOT_FORMATS[plot_format],
+            'encoding': PLOT_ENCODINGS[plot_format],
+            'caption': self.caption,
+            'plot_name': self.plot_name,
+            'analysis': self.analysis,
+            'side_by_side': self.multi_plot,
+        }
+
+    def encode(self, plot_format: str = 'png') -> Dict[str, str]:
+        """
+        Encodes the (built) plot, or the pair of plots of a multi-plot.
+
+        Args:
+            plot_format (str, optional): Image format, 'png' or 'svg'. Defaults to 'png'.
+
+        Returns:
+            Dict[str, str]: Encoded images, by template key ('src', or 'src_lhs' and 'src_rhs').
+        """
+
+        if not self.multi_plot:
+            return {
+                'src': self.get_encode(self.plot,
                                        height=self.height,
-                                       width=self.width)
-
-            self.img_data = {
-                'src': img_code,
-                'caption': self.caption,
-                'plot_name': self.plot_name,
-                'analysis': self.analysis,
-                'side_by_side': False,
-            }
-        else:
-            img_code_lhs = self.get_encode(self.plot['lhs'],
-                                           height=self.height_s,
-                                           width=self.width_s)
-
-            img_code_rhs = self.get_encode(self.plot['rhs'],
-                                           height=self.height_s,
-                                           width=self.width_s)
-
-            self.img_data = {
-                'src_lhs': img_code_lhs,
-                'src_rhs': img_code_rhs,
-                'caption': self.caption,
-                'plot_name': self.plot_name,
-                'analysis': self.analysis,
-                'side_by_side': True,
+                                       width=self.width,
+                                       plot_format=plot_format),
             }
 
+        return {
+            'src_lhs': self.get_encode(self.plot['lhs'],
+                                       height=self.height_s,
+                                       width=self.width_s,
+                                       plot_format=plot_format),
+            'src_rhs': self.get_encode(self.plot['rhs'],
+                                       height=self.height_s,
+                                       width=self.width_s,
+                                       plot_format=plot_format),
+        }
+
+    def get_img_codes(self) -> Dict[str, str]:
+        """
+        Gets the encoded images of a saved plot.
+
+        Returns:
+            Dict[str, str]: Encoded images, by template key.
+        """
+
+        return {k: v for k, v in self.img_data.items() if k in IMG_CODE_KEYS}
+
+    def cache_inputs(self) -> List:
+        """
+        Gets the inputs that determine the image of the plot, used to identify it in a render cache.
+
+        Subclasses whose image depends on other data (e.g., the STL components or test results)
+        should override this method.
+
+        Returns:
+            List: Data frames, series, and scalars passed to the plotting functions.
+        """
+
+        return [self.tsd.df, self.tsd.time_col, self.tsd.target_col]
+
     def format_caption(self, plot_id: int):
         """
         Formats the caption with the respective number.
@@ -136,22 +220,35 @@ class Plot:
         self.img_data['caption'] = self.img_data['caption'].format(plot_id)
 
     @staticmethod
-    def get_encode(plot, height, width):
+    def get_encode(plot, height, width, plot_format: str = 'png'):
         """
-        Encodes the plot as a base64 string.
+        Encodes the plot for a data URI: as a base64 string (png), or as url-quoted text (svg).
 
         Args:
             plot (Any): The plot object.
             height (float): Height of the plot.
             width (float): Width of the plot.
+            plot_format (str, optional): Image format, 'png' or 'svg'. Defaults to 'png'.
 
         Returns:
-            str: Base64 encoded string of the plot image.
+            str: Encoded plot image (see PLOT_ENCODINGS).
         """
 
+        assert plot_format in PLOT_FORMATS, UNKNOWN_FORMAT_ERROR
+
+        import matplotlib as mpl
+
+        ignore_plotnine_warnings()
+
         img_buffer = io.BytesIO()
 
-        plot.save(img_buffer, height=height, width=width, format='png')
+        rc_params = SVG_RC_PARAMS if plot_format == 'svg' else {}
+        with mpl.rc_context(rc_params):
+            plot.save(img_buffer, height=height, width=width, format=plot_format)
         img_buffer.seek(0)
+
+        if plot_format == 'svg':
+            return quote(img_buffer.getvalue().decode('utf-8'), safe=SVG_URI_SAFE)
+
         decode_str = base64.b64encode(img_buffer.getvalue()).decode()
         return decode_str
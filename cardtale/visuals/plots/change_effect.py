@@ -7,7 +7,7 @@ from cardtale.visuals.plot import Plot
 from cardtale.core.data import TimeSeriesData
 from cardtale.analytics.testing.base import TestingComponents
 from cardtale.visuals.base.density import PlotDensity
-from cardtale.cards.strings import gettext
+from cardtale.cards.strings import gettext, join_l
 from cardtale.core.config.analysis import ALPHA
 from cardtale.visuals.config import PLOT_NAMES
 
@@ -35,7 +35,10 @@ class ChangeEffectPlots(Plot):
 
         super().__init__(tsd=tsd, multi_plot=False, name=name)
 
-        self.caption = gettext('change_beforeafter_caption')
+        if tests.change.residual_engine == 'ar':
+            self.caption = gettext('change_beforeafter_caption_ar')
+        else:
+            self.caption = gettext('change_beforeafter_caption')
         self.plot_name = PLOT_NAMES['change_effect']
 
         self.tests = tests
@@ -57,6 +60,13 @@ class ChangeEffectPlots(Plot):
 
             self.plot = parts_dens
 
+    def cache_inputs(self):
+        """
+        Gets the inputs that determine the image of the plot.
+        """
+
+        return [self.tests.change.resid_df]
+
     def analyse(self, *args, **kwargs):
         """
         Analyzes the change in distribution.
@@ -74,9 +84,10 @@ class ChangeEffectPlots(Plot):
 
         # there's at least one change point
         plt_deq1 = self.deq_chow_test()
-        plt_deq2 = self.deq_accuracy_step_intervention()
+        plt_deq2 = self.deq_chow_test_all_points()
+        plt_deq3 = self.deq_accuracy_step_intervention()
 
-        self.analysis = [plt_deq1, plt_deq2]
+        self.analysis = [plt_deq1, plt_deq2, plt_deq3]
         self.analysis = [x for x in self.analysis if x is not None]
 
     def deq_chow_test(self) -> Optional[str]:
@@ -85,25 +96,55 @@ class ChangeEffectPlots(Plot):
 
         Approach:
             - PELT testing
-            - Chow test on residuals of ARIMA model
+            - Chow test on residuals of ARIMA model (or of its AR approximation)
         """
 
         chow_rejects = self.tests.change.chow_p_value < ALPHA
 
-        expr = gettext('change_effect_chow')
+        if self.tests.change.residual_engine == 'ar':
+            p, d = self.tests.change.model_order
+            expr = gettext('change_effect_chow_ar')
+            model_desc = {'order': p, 'data': 'differenced series' if d > 0 else 'series'}
+        else:
+            expr = gettext('change_effect_chow')
+            model_desc = {'order': self.tests.change.model_order}
 
         if chow_rejects:
             conc_ = 'indicating a structural change in the underlying process'
             expr_fmt = expr.format(test_result='rejects',
-                                   order=self.tests.change.arima_ord,
                                    param_conclusion='are significantly different',
-                                   process_conclusion=conc_)
+                                   process_conclusion=conc_,
+                                   **model_desc)
         else:
             conc_ = 'suggesting the underlying process structure remained similar despite the level shift'
             expr_fmt = expr.format(test_result='fails to reject',
-                                   order=self.tests.change.arima_ord,
                                    param_conclusion='remain stable',
-                                   process_conclusion=conc_)
+                                   process_conclusion=conc_,
+                                   **model_desc)
+
+        return expr_fmt
+
+    def deq_chow_test_all_points(self) -> Optional[str]:
+        """
+        DEQ (Data Exploratory Question): Did the distribution change at each change point?
+
+        Approach:
+            - PELT testing
+            - Chow test on residuals of ARIMA model (or of its AR approximation), at every change point
+        """
+
+        cp, cp_idx = self.tests.change.get_change_points()
+        p_values = self.tests.change.chow_p_values
+
+        if len(cp) < 2 or len(p_values) != len(cp):
+            return None
+
+        p_values_str = [f'{time_step.strftime(self.tsd.date_format)} ({p_value:.3f})'
+                        for time_step, p_value in zip(cp_idx, p_values)]
+
+        expr_fmt = gettext('change_effect_chow_all').format(n_cp=len(cp),
+                                                             n_rejects=sum(p < ALPHA for p in p_values),
+                                                             p_values=join_l(p_values_str))
 
         return expr_fmt
 
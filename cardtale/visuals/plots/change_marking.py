@@ -4,7 +4,7 @@ from cardtale.visuals.plot import Plot
 from cardtale.core.data import TimeSeriesData
 from cardtale.analytics.testing.base import TestingComponents
 from cardtale.visuals.base.line_plots import LinePlot
-from cardtale.cards.strings import gettext
+from cardtale.cards.strings import gettext, join_l
 from cardtale.visuals.config import PLOT_NAMES
 
 
@@ -49,6 +49,13 @@ class ChangesMarksPlot(Plot):
                                            y_axis_col=self.tsd.target_col,
                                            change_points=cp_idx)
 
+    def cache_inputs(self):
+        """
+        Gets the inputs that determine the image of the plot.
+        """
+
+        return [self.tsd.df, self.tsd.time_col, self.tsd.target_col, self.tests.change.get_change_points()[1]]
+
     def analyse(self, *args, **kwargs):
         """
         Analyzes the change marking.
@@ -122,4 +129,14 @@ class ChangesMarksPlot(Plot):
 
         expr_fmt = gettext('change_line_analysis').format(prefix, cp_time, cp_dir)
 
+        level_increases = self.tests.change.level_increases
+        if 1 < n_cp == len(level_increases):
+            others = [f'{time_step.strftime(self.tsd.date_format)} '
+                      f'({"an increasing" if increased else "a decreasing"} level)'
+                      for time_step, increased in zip(cp_idx[1:], level_increases[1:])]
+
+            others_str = 'change_line_analysis_other' if n_cp == 2 else 'change_line_analysis_others'
+
+            expr_fmt += ' ' + gettext(others_str).format(join_l(others))
+
         return expr_fmt
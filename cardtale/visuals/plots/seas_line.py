@@ -25,6 +25,9 @@ class SeasonalLinePlot(Plot):
         tests (TestingComponents): Testing components for seasonality.
     """
 
+    # each line is drawn as one segment per observation (gradient colors)
+    VECTOR_FORMAT = False
+
     def __init__(self,
                  tsd: TimeSeriesData,
                  tests: TestingComponents,
@@ -76,6 +79,13 @@ class SeasonalLinePlot(Plot):
                                        add_labels=self.add_labels,
                                        add_smooth=True)
 
+    def cache_inputs(self):
+        """
+        Gets the inputs that determine the image of the plot.
+        """
+
+        return [self.tsd.seas_df, self.x_axis_col, self.tsd.target_col, self.group_col, self.add_labels]
+
     def analyse(self, *args, **kwargs):
         """
         Analyzes the seasonal line plot.
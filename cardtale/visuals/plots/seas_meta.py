@@ -33,23 +33,30 @@ class SeasonalMetaPlots:
 
         self.plots = {}
 
-    def make_plots(self):
+    def make_plots(self, build: bool = True):
         """
         Generates the seasonal plots based on the frequency of the time series data.
 
+        Args:
+            build (bool, optional): Whether to build and save the plots. If False, the plots are only
+            analysed, to be built afterwards (e.g. by PlotRenderer). Defaults to True.
+
         Returns:
             dict: Dictionary containing the generated plots.
         """
 
         self.plots = self._frequency_plots()[self.tsd.dt.freq_longly.lower()]
 
-        self.make_all()
+        self.make_all(build=build)
 
         return self.plots
 
-    def make_all(self):
+    def make_all(self, build: bool = True):
         """
         Analyzes, builds, and saves all the generated plots.
+
+        Args:
+            build (bool, optional): Whether to build and save the plots. Defaults to True.
         """
 
         for k in self.plots:
@@ -58,6 +65,9 @@ class SeasonalMetaPlots:
         self.plots = {k: self.plots[k] for k in self.plots
                       if self.plots[k].show_me}
 
+        if not build:
+            return
+
         for k in self.plots:
             self.plots[k].build()
             self.plots[k].save()
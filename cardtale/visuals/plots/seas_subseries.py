@@ -76,6 +76,13 @@ class SeasonalSubSeriesPlot(Plot):
                                             x_axis_col=self.tsd.time_col,
                                             y_axis_col=self.y_axis_col)
 
+    def cache_inputs(self):
+        """
+        Gets the inputs that determine the image of the plot.
+        """
+
+        return [self.tsd.seas_df, self.x_axis_col, self.tsd.time_col, self.y_axis_col]
+
     def analyse(self, *args, **kwargs):
         """
         Analyzes the seasonal subseries plot.
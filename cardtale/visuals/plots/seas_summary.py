@@ -76,6 +76,13 @@ class SeasonalSummaryPlots(Plot):
 
         self.plot = {'lhs': mean_plot, 'rhs': std_plot}
 
+    def cache_inputs(self):
+        """
+        Gets the inputs that determine the image of the plot.
+        """
+
+        return [self.tsd.seas_df, self.x_axis_col, self.tsd.target_col]
+
     def analyse(self, *args, **kwargs):
         """
         Analyzes the seasonal summary plot.
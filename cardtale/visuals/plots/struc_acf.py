@@ -45,6 +45,13 @@ class SeriesACFPlot(Plot):
                                         y_axis_col='ACF',
                                         h_threshold=self.tsd.summary.acf.significance_thr)
 
+    def cache_inputs(self):
+        """
+        Gets the inputs that determine the image of the plot.
+        """
+
+        return [self.tsd.summary.acf.acf_df, self.tsd.summary.acf.significance_thr]
+
     def analyse(self, *args, **kwargs):
         """
         Analyzes the ACF plot.
@@ -50,6 +50,13 @@ class SeriesComponentsPlot(Plot):
                                                category_list=['Trend', 'Seasonal', 'Residuals'],
                                                scales='free')
 
+    def cache_inputs(self):
+        """
+        Gets the inputs that determine the image of the plot.
+        """
+
+        return [self.tsd.stl_df, self.tsd.time_col]
+
     def analyse(self, *args, **kwargs):
         """
         Analyzes the components plot.
@@ -48,6 +48,13 @@ class SeriesPACFPlot(Plot):
                                         y_axis_col='ACF',
                                         h_threshold=self.tsd.summary.pacf.significance_thr)
 
+    def cache_inputs(self):
+        """
+        Gets the inputs that determine the image of the plot.
+        """
+
+        return [self.tsd.summary.pacf.acf_df, self.tsd.summary.pacf.significance_thr]
+
     def analyse(self, *args, **kwargs):
         """
         Analyzes the PACF plot.
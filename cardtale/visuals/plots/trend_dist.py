@@ -2,7 +2,6 @@ from typing import List, Optional
 
 import numpy as np
 import pandas as pd
-from mlforecast import MLForecast
 
 from cardtale.visuals.plot import Plot
 from cardtale.visuals.base.histogram import PlotHistogram
@@ -49,6 +48,8 @@ class TrendDistPlots(Plot):
         Creates the trend distribution plots.
         """
 
+        from mlforecast import MLForecast
+
         s = self.tsd.get_target_series(df=self.tsd.df,
                                        time_col=self.tsd.time_col,
                                        target_col=self.tsd.target_col)
@@ -77,6 +78,13 @@ class TrendDistPlots(Plot):
 
         self.plot = {'lhs': trend_dhist, 'rhs': trend_lagplot}
 
+    def cache_inputs(self):
+        """
+        Gets the inputs that determine the image of the plot.
+        """
+
+        return [self.tsd.df, self.tsd.time_col, self.tsd.target_col, self.tsd.dt.freq_short]
+
     def analyse(self, *args, **kwargs):
         """
         Analyzes the trend distribution plots.
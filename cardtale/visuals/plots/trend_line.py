@@ -44,14 +44,20 @@ class TrendLinePlot(Plot):
         Creates the trend line plot.
         """
 
-        df_ = self.tsd.df.copy()
-        df_['Trend'] = self.tsd.stl_df['Trend']
+        df_ = pd.concat([self.tsd.df, self.tsd.stl_df['Trend']], axis=1, copy=False)
 
         self.plot = LinePlot.univariate_w_support(data=df_,
                                                   x_axis_col=self.tsd.time_col,
                                                   y_axis_col_main='Trend',
                                                   y_axis_col_supp=self.tsd.target_col)
 
+    def cache_inputs(self):
+        """
+        Gets the inputs that determine the image of the plot.
+        """
+
+        return [self.tsd.df, self.tsd.time_col, self.tsd.target_col, self.tsd.stl_df['Trend']]
+
     def analyse(self, *args, **kwargs):
         """
         Analyzes the trend line plot.
@@ -64,6 +64,13 @@ class VarianceDistPlots(Plot):
 
         self.plot = plot_part_residuals
 
+    def cache_inputs(self):
+        """
+        Gets the inputs that determine the image of the plot.
+        """
+
+        return [self.tests.variance.residuals]
+
     def analyse(self, *args, **kwargs):
         """
         Analyzes the variance distribution plots.
@@ -0,0 +1,105 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Dict, List, Optional, Tuple
+
+from cardtale.core.tracing import Tracer, current_span, current_tracer, span, tracing
+from cardtale.visuals.plot import Plot
+from cardtale.visuals.cache import RenderCache
+
+
+class PlotRenderer:
+    """
+    Class for building and encoding plots, optionally across a pool of worker processes.
+
+    Plots are independent once analysed, so they can be built and encoded in any order. Plotnine
+    objects cannot be pickled, so the (unbuilt) Plot objects are sent to the workers, which return
+    the encoded image data. The plots are split into one chunk per worker, so that the data shared
+    by the plots of a chunk (time series and test results) is only sent once.
+
+    If a render cache is given, plots found in it are not built, and the others are added to it.
+
+    If a tracer is active, the build and save of each plot are timed. The spans recorded in the worker
+    processes are sent back with the images, and added to the tracer of the caller.
+    """
+
+    @staticmethod
+    def render(plots: List[Plot],
+               n_jobs: int = 1,
+               plot_format: str = 'png',
+               cache: Optional[RenderCache] = None):
+        """
+        Builds and saves a list of plots. The image data is stored in each plot (img_data attribute).
+
+        Args:
+            plots (List[Plot]): Analysed plots.
+            n_jobs (int, optional): Number of worker processes. -1 uses all available cores.
+            Defaults to 1 (no pool).
+            plot_format (str, optional): Image format, 'png' or 'svg'. Defaults to 'png'.
+            cache (Optional[RenderCache], optional): Cache of encoded images. Defaults to None (no cache).
+        """
+
+        if cache is not None:
+            keys = {id(plot): cache.get_key(plot, plot_format) for plot in plots}
+
+            missing = []
+            for plot in plots:
+                img_codes = cache.get(keys[id(plot)])
+                if img_codes is None:
+                    missing.append(plot)
+                else:
+                    plot.save(plot_format=plot_format, img_codes=img_codes)
+
+            PlotRenderer.render(missing, n_jobs=n_jobs, plot_format=plot_format)
+
+            for plot in missing:
+                cache.put(keys[id(plot)], plot.get_img_codes())
+
+            return
+
+        n_jobs = os.cpu_count() if n_jobs == -1 else n_jobs
+        n_chunks = min(n_jobs, len(plots))
+
+        if n_chunks <= 1:
+            _render_chunk(plots, plot_format)
+            return
+
+        chunks = [plots[i::n_chunks] for i in range(n_chunks)]
+
+        tracer = current_tracer()
+
+        with ProcessPoolExecutor(max_workers=n_chunks) as executor:
+            results = list(executor.map(_render_chunk, chunks, repeat(plot_format), repeat(tracer is not None)))
+
+        for chunk, (chunk_img_data, chunk_spans) in zip(chunks, results):
+            for plot, img_data in zip(chunk, chunk_img_data):
+                plot.img_data = img_data
+
+            if tracer is not None:
+                tracer.add(chunk_spans, parent=current_span())
+
+
+def _render_chunk(plots: List[Plot], plot_format: str = 'png', trace: bool = False) -> Tuple[List[Dict], List]:
+    """
+    Builds and saves a chunk of plots.
+
+    Args:
+        plots (List[Plot]): Analysed plots.
+        plot_format (str, optional): Image format, 'png' or 'svg'. Defaults to 'png'.
+        trace (bool, optional): Whether to time the plots with a new tracer (in a worker process, where the
+        tracer of the caller is not available). Defaults to False (the active tracer, if any, is used).
+
+    Returns:
+        Tuple[List[Dict], List]: Image data of each plot, and the spans recorded by the new tracer.
+    """
+
+    tracer = Tracer() if trace else None
+
+    with tracing(tracer, root=True):
+        for plot in plots:
+            with span('plot_build', plot=type(plot).__name__):
+                plot.build()
+            with span('plot_save', plot=type(plot).__name__, plot_format=plot_format):
+                plot.save(plot_format=plot_format)
+
+    return [plot.img_data for plot in plots], [] if tracer is None else tracer.spans